@@ -0,0 +1,156 @@
+"""Throughput and latency of the API under a mixed read/write workload.
+
+    cd app && python -m benchmarks.api_load [--menus 10 --submenus 10 --dishes 20]
+        [--duration 30 --concurrency 8 --write-ratio 0.05 --seed 1]
+        [--url http://127.0.0.1:8000 | --uvicorn --workers 2] [--fake-redis] [--warm-cache]
+        [--output results.json]
+
+Without --url or --uvicorn, requests go in-process to the ASGI app. PostgreSQL
+must be reachable with the DB_* settings (``make db`` starts a container);
+Redis too, unless --fake-redis serves it in-process from fakeredis. Compare two
+JSON results with ``python -m benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import config
+import httpx
+import redis
+from benchmarks.seed import SeededData, clear, seed
+from benchmarks.workload import run_workload
+from config import REDIS_PORT, REDIS_SERVER
+from database.db import session_factory
+from repositories import RedisCacheRepository
+
+# settings that change the results, stored with every run
+REPORTED_SETTINGS: tuple[str, ...] = (
+    'ASYNC_MODE', 'WORKERS', 'DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'REDIS_MAX_CONNECTIONS', 'CACHE_CODEC',
+    'CACHE_LOCAL_MAX_SIZE', 'CACHE_LOCAL_TTL', 'CACHE_SLIDING_TTL', 'CACHE_WRITE_THROUGH', 'PAGE_SIZE',
+)
+
+
+def start_fake_redis() -> None:
+    """Serves Redis from fakeredis on REDIS_SERVER:REDIS_PORT in a daemon thread."""
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        sys.exit('--fake-redis needs the fakeredis package')
+
+    server: TcpFakeServer = TcpFakeServer((REDIS_SERVER or '127.0.0.1', REDIS_PORT), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    process: subprocess.Popen = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--workers', str(workers), '--log-level',
+         'warning'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    deadline: float = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/metrics').raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit(f'uvicorn did not start on port {port}')
+
+
+def make_client(url: str | None, concurrency: int) -> httpx.AsyncClient:
+    limits: httpx.Limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30)
+
+    from main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://benchmark', timeout=30)
+
+
+def run(args: argparse.Namespace) -> dict:
+    cache_repository: RedisCacheRepository = RedisCacheRepository(redis.Redis(host=REDIS_SERVER, port=REDIS_PORT))
+    with session_factory() as session:
+        clear(session, cache_repository)
+        data: SeededData = seed(session, cache_repository, args.menus, args.submenus, args.dishes)
+        if args.warm_cache:
+            from commands.warm_cache import warm_cache
+            warm_cache(session, cache_repository)
+
+    server: subprocess.Popen | None = start_uvicorn(args.port, args.workers) if args.uvicorn else None
+    url: str | None = f'http://127.0.0.1:{args.port}' if args.uvicorn else args.url
+
+    async def drive() -> dict:
+        async with make_client(url, args.concurrency) as client:
+            return await run_workload(
+                client, data, args.concurrency, args.duration, args.warmup, args.write_ratio, args.seed
+            )
+
+    try:
+        report: dict = asyncio.run(drive())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if not args.keep_data:
+            with session_factory() as session:
+                clear(session, cache_repository)
+
+    return {
+        'meta': {
+            'started': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'target': url or 'in-process',
+            'arguments': {name: value for name, value in vars(args).items() if name != 'output'},
+            'settings': {name: getattr(config, name) for name in REPORTED_SETTINGS},
+        },
+        **report,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f'{"route":<18}{"requests":>10}{"errors":>8}{"rps":>10}{"mean ms":>10}'
+          f'{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"max ms":>10}')
+    for route, stats in [*result['routes'].items(), ('total', result['total'])]:
+        print(
+            f'{route:<18}{stats["requests"]:>10}{stats["errors"]:>8}{stats["rps"]:>10.1f}{stats["mean_ms"]:>10.2f}'
+            f'{stats["p50_ms"]:>10.2f}{stats["p95_ms"]:>10.2f}{stats["p99_ms"]:>10.2f}{stats["max_ms"]:>10.2f}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--menus', type=int, default=10, help='seeded menus')
+    parser.add_argument('--submenus', type=int, default=10, help='seeded submenus per menu')
+    parser.add_argument('--dishes', type=int, default=20, help='seeded dishes per submenu')
+    parser.add_argument('--duration', type=float, default=30, help='recorded seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='unrecorded seconds before the recorded ones')
+    parser.add_argument('--concurrency', type=int, default=8, help='requests in flight')
+    parser.add_argument('--write-ratio', type=float, default=0.05, help='share of write requests')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the request sequence')
+    parser.add_argument('--url', help='base URL of a running server instead of the in-process app')
+    parser.add_argument('--uvicorn', action='store_true', help='start uvicorn on --port for the run')
+    parser.add_argument('--port', type=int, default=8765, help='port of --uvicorn')
+    parser.add_argument('--workers', type=int, default=1, help='workers of --uvicorn')
+    parser.add_argument('--fake-redis', action='store_true', help='serve Redis from fakeredis in-process')
+    parser.add_argument('--warm-cache', action='store_true', help='warm the cache after seeding')
+    parser.add_argument('--keep-data', action='store_true', help='keep the seeded rows after the run')
+    parser.add_argument('--output', help='write the result as JSON to this file')
+    args = parser.parse_args()
+
+    if args.fake_redis:
+        start_fake_redis()
+    result: dict = run(args)
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2, default=str)
+        print(f'result written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
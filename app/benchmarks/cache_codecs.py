@@ -0,0 +1,93 @@
+"""Encode/decode time and payload size of the cache codecs.
+
+    cd app && python -m benchmarks.cache_codecs [--number 20000]
+
+``pickle x2`` is the former layout: the services pickled the dump and the
+cache repository pickled the result once more.
+"""
+import argparse
+import pickle
+import timeit
+import uuid
+from typing import Callable
+
+from pydantic import BaseModel
+from repositories.redis_repository.codecs import CODECS, VersionedCodec, get_codec
+from schemas.dish_schemas import DishScheme
+from schemas.menu_schemas import MenuWithDetailsScheme
+from schemas.submenu_schemas import SubmenuWithDishCountScheme
+
+SAMPLES: list[tuple[type[BaseModel], dict]] = [
+    (
+        MenuWithDetailsScheme,
+        MenuWithDetailsScheme(
+            id=uuid.uuid4(),
+            title='Summer menu',
+            description='Seasonal dishes served from June to August',
+            submenus_count=12,
+            dishes_count=148
+        ).model_dump()
+    ),
+    (
+        SubmenuWithDishCountScheme,
+        SubmenuWithDishCountScheme(
+            id=uuid.uuid4(),
+            title='Cold starters',
+            description='Salads, carpaccio and tartare',
+            dishes_count=17
+        ).model_dump() | {'menu_id': str(uuid.uuid4())}
+    ),
+    (
+        DishScheme,
+        DishScheme(
+            id=uuid.uuid4(),
+            title='Beef tartare',
+            description='Hand-cut beef, capers, shallots and quail egg',
+            price='14.50'
+        ).model_dump() | {'menu_id': str(uuid.uuid4()), 'submenu_id': str(uuid.uuid4())}
+    ),
+]
+
+
+def available_codecs() -> dict[str, VersionedCodec]:
+    codecs: dict[str, VersionedCodec] = {}
+    for name in CODECS:
+        try:
+            codecs[name] = get_codec(name)
+        except RuntimeError as e:
+            print(f'skipping {name}: {e}')
+    return codecs
+
+
+def measure(function: Callable, number: int) -> float:
+    """Best of three runs, in microseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000, help='calls per measurement')
+    args = parser.parse_args()
+
+    codecs: dict[str, VersionedCodec] = available_codecs()
+    print(f'{"scheme":<28}{"codec":<10}{"bytes":>7}{"encode us":>11}{"decode us":>11}{"+ validate us":>15}')
+    for scheme, value in SAMPLES:
+        entry: bytes = pickle.dumps(pickle.dumps(value))
+        print(
+            f'{scheme.__name__:<28}{"pickle x2":<10}{len(entry):>7}'
+            f'{measure(lambda: pickle.dumps(pickle.dumps(value)), args.number):>11.2f}'
+            f'{measure(lambda: pickle.loads(pickle.loads(entry)), args.number):>11.2f}'
+            f'{measure(lambda: scheme(**pickle.loads(pickle.loads(entry))), args.number):>15.2f}'
+        )
+        for name, codec in codecs.items():
+            entry = codec.dumps(value)
+            print(
+                f'{"":<28}{name:<10}{len(entry):>7}'
+                f'{measure(lambda: codec.dumps(value), args.number):>11.2f}'
+                f'{measure(lambda: codec.loads(entry), args.number):>11.2f}'
+                f'{measure(lambda: scheme(**codec.loads(entry)), args.number):>15.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
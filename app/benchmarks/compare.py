@@ -0,0 +1,71 @@
+"""Differences between two api_load results, flagging regressions.
+
+    cd app && python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+
+A route regressed when a latency percentile grew or its requests per second
+dropped by more than the threshold. Routes with fewer than --min-requests
+requests in either run are shown but never flagged, since their percentiles
+are mostly noise. The exit status is 1 when any route
+regressed, so the comparison can gate a CI job.
+"""
+import argparse
+import json
+import sys
+
+# (field, True when a higher value is better)
+COMPARED_FIELDS: tuple[tuple[str, bool], ...] = (
+    ('rps', True),
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('p99_ms', False),
+)
+
+
+def relative_change(baseline: float, candidate: float) -> float:
+    if not baseline:
+        return 0.0
+    return (candidate - baseline) / baseline
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, min_requests: int = 0) -> list[dict]:
+    """One row per route present in both results, with the relative change of every compared field."""
+    rows: list[dict] = []
+    routes: dict[str, tuple[dict, dict]] = {
+        route: (stats, candidate['routes'][route])
+        for route, stats in baseline['routes'].items()
+        if route in candidate['routes']
+    }
+    routes['total'] = (baseline['total'], candidate['total'])
+    for route, (baseline_stats, candidate_stats) in routes.items():
+        changes: dict[str, float] = {
+            field: relative_change(baseline_stats[field], candidate_stats[field]) for field, _ in COMPARED_FIELDS
+        }
+        regressions: list[str] = [
+            field for field, higher_is_better in COMPARED_FIELDS
+            if (-changes[field] if higher_is_better else changes[field]) > threshold
+        ] if min(baseline_stats['requests'], candidate_stats['requests']) >= min_requests else []
+        rows.append({'route': route, 'changes': changes, 'regressions': regressions})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline', help='JSON result of the reference run')
+    parser.add_argument('candidate', help='JSON result of the run to check')
+    parser.add_argument('--threshold', type=float, default=0.1, help='tolerated relative change')
+    parser.add_argument('--min-requests', type=int, default=100, help='requests a route needs to be flagged')
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        rows: list[dict] = compare(json.load(baseline_file), json.load(candidate_file), args.threshold, args.min_requests)
+
+    print(f'{"route":<18}' + ''.join(f'{field:>10}' for field, _ in COMPARED_FIELDS) + '  regressed')
+    for row in rows:
+        changes: str = ''.join(f'{row["changes"][field]:>+10.1%}' for field, _ in COMPARED_FIELDS)
+        print(f'{row["route"]:<18}{changes}  {", ".join(row["regressions"])}')
+    if any(row['regressions'] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
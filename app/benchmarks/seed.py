@@ -0,0 +1,93 @@
+"""Benchmark data: menus, submenus and dishes titled ``bench ...``.
+
+The rows are bulk inserted with their counters set, and removed again by
+title, so the benchmark can run next to other data in the same database.
+"""
+import uuid
+from typing import NamedTuple
+
+from database.models import Dish, Menu, Submenu
+from repositories import RedisCacheRepository
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm.session import Session
+
+TITLE_PREFIX: str = 'bench '
+
+
+class SeededData(NamedTuple):
+    menu_ids: list[uuid.UUID]
+    # (menu_id, submenu_id)
+    submenu_paths: list[tuple[uuid.UUID, uuid.UUID]]
+    # (menu_id, submenu_id, dish_id)
+    dish_paths: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID]]
+
+
+def seed(
+        session: Session,
+        cache_repository: RedisCacheRepository,
+        menus: int,
+        submenus_per_menu: int,
+        dishes_per_submenu: int
+) -> SeededData:
+    menu_rows: list[dict] = []
+    submenu_rows: list[dict] = []
+    dish_rows: list[dict] = []
+    for menu_number in range(menus):
+        menu_id: uuid.UUID = uuid.uuid4()
+        menu_rows.append({
+            'id': menu_id,
+            'title': f'{TITLE_PREFIX}menu {menu_number}',
+            'description': f'description of bench menu {menu_number}',
+            'submenus_count': submenus_per_menu,
+            'dishes_count': submenus_per_menu * dishes_per_submenu,
+        })
+        for submenu_number in range(submenus_per_menu):
+            submenu_id: uuid.UUID = uuid.uuid4()
+            submenu_rows.append({
+                'id': submenu_id,
+                'menu_id': menu_id,
+                'title': f'{TITLE_PREFIX}submenu {menu_number}.{submenu_number}',
+                'description': f'description of bench submenu {menu_number}.{submenu_number}',
+                'dishes_count': dishes_per_submenu,
+            })
+            for dish_number in range(dishes_per_submenu):
+                dish_rows.append({
+                    'id': uuid.uuid4(),
+                    'submenu_id': submenu_id,
+                    'title': f'{TITLE_PREFIX}dish {menu_number}.{submenu_number}.{dish_number}',
+                    'description': f'description of bench dish {menu_number}.{submenu_number}.{dish_number}',
+                    'price': f'{10 + dish_number % 90}.50',
+                })
+
+    for model, rows in ((Menu, menu_rows), (Submenu, submenu_rows), (Dish, dish_rows)):
+        if rows:
+            session.execute(insert(model), rows)
+    session.commit()
+    # the rows were inserted behind the services, so the cached lists of menus are outdated
+    cache_repository.invalidate(['menu_tree'], generations=('menu_tree', 'menus'))
+
+    menu_ids: dict[uuid.UUID, uuid.UUID] = {row['id']: row['menu_id'] for row in submenu_rows}
+    return SeededData(
+        menu_ids=[row['id'] for row in menu_rows],
+        submenu_paths=[(row['menu_id'], row['id']) for row in submenu_rows],
+        dish_paths=[(menu_ids[row['submenu_id']], row['submenu_id'], row['id']) for row in dish_rows]
+    )
+
+
+def clear(session: Session, cache_repository: RedisCacheRepository) -> int:
+    """Deletes the benchmark menus, their submenus and dishes cascading, and their cache entries."""
+    menu_ids: list[uuid.UUID] = list(
+        session.scalars(select(Menu.id).where(Menu.title.startswith(TITLE_PREFIX)))
+    )
+    if not menu_ids:
+        return 0
+
+    session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+    session.commit()
+    menu_keys: list[str] = [f'menu_{menu_id}' for menu_id in menu_ids]
+    cache_repository.invalidate(
+        [*menu_keys, 'menu_tree'],
+        tags=tuple(menu_keys),
+        generations=('menu_tree', 'menus', *menu_keys)
+    )
+    return len(menu_ids)
@@ -0,0 +1,195 @@
+"""Mixed read/write workload over the API routes, and the latency statistics of a run.
+
+The operations follow the Postman scenario. Every request picks a route
+by weight from a seeded random generator, so runs with the same seed issue
+the same sequence of requests per worker.
+"""
+import asyncio
+import math
+import random
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import httpx
+from benchmarks.seed import TITLE_PREFIX, SeededData
+
+API_PREFIX: str = '/api/v1'
+
+# relative weights of the read routes, by route name
+READ_WEIGHTS: dict[str, int] = {
+    'read_menus': 10,
+    'read_menu': 20,
+    'read_submenus': 10,
+    'read_submenu': 20,
+    'read_dishes': 15,
+    'read_dish': 20,
+    'read_menu_tree': 5,
+}
+# relative weights of the write routes; dishes are only deleted after this run created them
+WRITE_WEIGHTS: dict[str, int] = {
+    'update_dish': 50,
+    'create_dish': 30,
+    'delete_dish': 20,
+}
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+def percentile(sorted_values: list[float], rank: int) -> float:
+    """Nearest-rank percentile of ascending values."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(rank / 100 * len(sorted_values)) - 1, 0)]
+
+
+class LatencyRecorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        """Requests, errors, requests per second and latency percentiles in milliseconds per route."""
+        routes: dict[str, dict] = {
+            route: self._summary(latencies, self.errors.get(route, 0), elapsed)
+            for route, latencies in sorted(self.latencies.items())
+        }
+        all_latencies: list[float] = [seconds for latencies in self.latencies.values() for seconds in latencies]
+        return {
+            'routes': routes,
+            'total': self._summary(all_latencies, sum(self.errors.values()), elapsed),
+        }
+
+    @staticmethod
+    def _summary(latencies: list[float], errors: int, elapsed: float) -> dict:
+        ordered: list[float] = sorted(latencies)
+        return {
+            'requests': len(ordered),
+            'errors': errors,
+            'rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            **{f'p{rank}_ms': round(percentile(ordered, rank) * 1000, 3) for rank in PERCENTILES},
+            'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+class Workload:
+    """Issues the requests of one benchmark worker."""
+
+    def __init__(self, client: httpx.AsyncClient, data: SeededData, write_ratio: float, seed: int) -> None:
+        self._client = client
+        self._data = data
+        self._write_ratio = write_ratio
+        self._random = random.Random(seed)
+        self._seed = seed
+        self._created_dishes: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = []
+        self._writes: int = 0
+
+    def next_route(self) -> str:
+        weights: dict[str, int] = WRITE_WEIGHTS if self._random.random() < self._write_ratio else READ_WEIGHTS
+        route: str = self._random.choices(list(weights), weights=list(weights.values()))[0]
+        if route == 'delete_dish' and not self._created_dishes:
+            return 'create_dish'
+        return route
+
+    async def run(self, recorder: LatencyRecorder | None, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            route: str = self.next_route()
+            request: Callable[[], Awaitable[httpx.Response]] = getattr(self, f'_{route}')
+            started: float = time.perf_counter()
+            try:
+                response: httpx.Response = await request()
+                ok: bool = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if recorder is not None:
+                recorder.record(route, time.perf_counter() - started, ok)
+
+    def _menu(self) -> uuid.UUID:
+        return self._random.choice(self._data.menu_ids)
+
+    def _submenu(self) -> tuple[uuid.UUID, uuid.UUID]:
+        return self._random.choice(self._data.submenu_paths)
+
+    def _dish(self) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID]:
+        return self._random.choice(self._data.dish_paths)
+
+    def _dish_data(self) -> dict:
+        self._writes += 1
+        return {
+            'title': f'{TITLE_PREFIX}written dish {self._seed}.{self._writes}.{self._random.getrandbits(32)}',
+            'description': 'written by the benchmark',
+            'price': f'{self._random.randint(1, 99)}.00',
+        }
+
+    async def _read_menus(self) -> httpx.Response:
+        return await self._client.get(f'{API_PREFIX}/menus/')
+
+    async def _read_menu(self) -> httpx.Response:
+        return await self._client.get(f'{API_PREFIX}/menus/{self._menu()}')
+
+    async def _read_menu_tree(self) -> httpx.Response:
+        return await self._client.get(f'{API_PREFIX}/menus/tree')
+
+    async def _read_submenus(self) -> httpx.Response:
+        return await self._client.get(f'{API_PREFIX}/menus/{self._menu()}/submenus')
+
+    async def _read_submenu(self) -> httpx.Response:
+        menu_id, submenu_id = self._submenu()
+        return await self._client.get(f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}')
+
+    async def _read_dishes(self) -> httpx.Response:
+        menu_id, submenu_id = self._submenu()
+        return await self._client.get(f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}/dishes')
+
+    async def _read_dish(self) -> httpx.Response:
+        menu_id, submenu_id, dish_id = self._dish()
+        return await self._client.get(f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}')
+
+    async def _update_dish(self) -> httpx.Response:
+        menu_id, submenu_id, dish_id = self._dish()
+        return await self._client.patch(
+            f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}',
+            json=self._dish_data()
+        )
+
+    async def _create_dish(self) -> httpx.Response:
+        menu_id, submenu_id = self._submenu()
+        response: httpx.Response = await self._client.post(
+            f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}/dishes',
+            json=self._dish_data()
+        )
+        if response.status_code == 201:
+            self._created_dishes.append((menu_id, submenu_id, uuid.UUID(response.json()['id'])))
+        return response
+
+    async def _delete_dish(self) -> httpx.Response:
+        menu_id, submenu_id, dish_id = self._created_dishes.pop(self._random.randrange(len(self._created_dishes)))
+        return await self._client.delete(f'{API_PREFIX}/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}')
+
+
+async def run_workload(
+        client: httpx.AsyncClient,
+        data: SeededData,
+        concurrency: int,
+        duration: float,
+        warmup: float,
+        write_ratio: float,
+        seed: int
+) -> dict:
+    """Runs ``concurrency`` workers for ``warmup`` unrecorded seconds, then for ``duration`` recorded ones."""
+    workloads: list[Workload] = [
+        Workload(client, data, write_ratio, seed + worker) for worker in range(concurrency)
+    ]
+    if warmup > 0:
+        deadline: float = time.perf_counter() + warmup
+        await asyncio.gather(*(workload.run(None, deadline) for workload in workloads))
+
+    recorder: LatencyRecorder = LatencyRecorder()
+    started: float = time.perf_counter()
+    await asyncio.gather(*(workload.run(recorder, started + duration) for workload in workloads))
+    return recorder.report(time.perf_counter() - started)
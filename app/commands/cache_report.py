@@ -0,0 +1,56 @@
+import redis
+from dependencies.redis import get_redis_pool
+from repositories.redis_repository.tags import GENERATION_PREFIX, TAG_PREFIX
+
+PREFIXES: tuple[str, ...] = ('menu_', 'submenu_', 'dish_', 'list:', TAG_PREFIX, GENERATION_PREFIX)
+
+
+def cache_report(redis_client: redis.Redis, prefixes: tuple[str, ...] = PREFIXES, batch_size: int = 500) -> dict:
+    """Counts keys, their memory (MEMORY USAGE) and keys without a TTL per key prefix."""
+    report: dict = {}
+    for prefix in prefixes:
+        prefix_report: dict = {'keys': 0, 'memory': 0, 'without_ttl': 0}
+        batch: list[bytes] = []
+        for key in redis_client.scan_iter(match=f'{prefix}*', count=batch_size):
+            batch.append(key)
+            if len(batch) == batch_size:
+                _add_batch(redis_client, batch, prefix_report)
+                batch = []
+        if batch:
+            _add_batch(redis_client, batch, prefix_report)
+        report[prefix] = prefix_report
+    return report
+
+
+def _add_batch(redis_client: redis.Redis, keys: list[bytes], prefix_report: dict) -> None:
+    with redis_client.pipeline(transaction=False) as pipeline:
+        for key in keys:
+            pipeline.memory_usage(key)
+            pipeline.ttl(key)
+        replies: list = pipeline.execute()
+
+    for memory, ttl in zip(replies[::2], replies[1::2]):
+        # keys deleted between SCAN and MEMORY USAGE report None and TTL -2
+        if memory is None or ttl == -2:
+            continue
+        prefix_report['keys'] += 1
+        prefix_report['memory'] += memory
+        prefix_report['without_ttl'] += ttl == -1
+
+
+if __name__ == '__main__':
+    client: redis.Redis = redis.Redis(connection_pool=get_redis_pool())
+    try:
+        memory_info: dict = client.info('memory')
+        print(
+            f'used_memory: {memory_info.get("used_memory_human")}, '
+            f'maxmemory: {memory_info.get("maxmemory_human")}, '
+            f'maxmemory_policy: {memory_info.get("maxmemory_policy")}'
+        )
+    except redis.ResponseError as e:
+        # INFO is often renamed or disabled on managed Redis
+        print(f'memory info unavailable: {e}')
+    print(f'{"prefix":<10}{"keys":>10}{"memory":>14}{"avg":>10}{"no ttl":>10}')
+    for key_prefix, stats in cache_report(client).items():
+        average: int = stats['memory'] // stats['keys'] if stats['keys'] else 0
+        print(f'{key_prefix:<10}{stats["keys"]:>10}{stats["memory"]:>14}{average:>10}{stats["without_ttl"]:>10}')
@@ -0,0 +1,15 @@
+import sys
+import time
+
+from config import PROFILING_SECRET
+from dependencies.profiling import sign_profile_token
+
+# seconds a token stays valid unless given as the first argument
+PROFILE_TOKEN_TTL: int = 600
+
+
+if __name__ == '__main__':
+    if not PROFILING_SECRET:
+        sys.exit('PROFILING_SECRET is not set')
+    ttl: int = int(sys.argv[1]) if len(sys.argv) > 1 else PROFILE_TOKEN_TTL
+    print(sign_profile_token(int(time.time()) + ttl, PROFILING_SECRET))
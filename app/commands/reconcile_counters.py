@@ -0,0 +1,45 @@
+from database.db import session_factory
+from database.models import Dish, Menu, Submenu
+from sqlalchemy import func, select, update
+from sqlalchemy.orm.session import Session
+
+
+def reconcile_counters(session: Session) -> tuple[int, int]:
+    """Recompute submenus_count and dishes_count, return the number of fixed submenus and menus."""
+    dishes_count = (
+        select(func.count(Dish.id))
+        .where(Dish.submenu_id == Submenu.id)
+        .scalar_subquery()
+    )
+    fixed_submenus = session.execute(
+        update(Submenu)
+        .where(Submenu.dishes_count != dishes_count)
+        .values(dishes_count=dishes_count)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    submenus_count = (
+        select(func.count(Submenu.id))
+        .where(Submenu.menu_id == Menu.id)
+        .scalar_subquery()
+    )
+    menu_dishes_count = (
+        select(func.coalesce(func.sum(Submenu.dishes_count), 0))
+        .where(Submenu.menu_id == Menu.id)
+        .scalar_subquery()
+    )
+    fixed_menus = session.execute(
+        update(Menu)
+        .where((Menu.submenus_count != submenus_count) | (Menu.dishes_count != menu_dishes_count))
+        .values(submenus_count=submenus_count, dishes_count=menu_dishes_count)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    session.commit()
+    return fixed_submenus, fixed_menus
+
+
+if __name__ == '__main__':
+    with session_factory() as db_session:
+        submenus, menus = reconcile_counters(db_session)
+    print(f'counters fixed: {submenus} submenus, {menus} menus')
@@ -0,0 +1,43 @@
+from commands.reconcile_counters import reconcile_counters
+from database.db import engine
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+# columns added after the first release; create_all never alters a table that already exists
+COLUMNS: tuple[tuple[str, str, str], ...] = (
+    ('menus', 'submenus_count', 'integer NOT NULL DEFAULT 0'),
+    ('menus', 'dishes_count', 'integer NOT NULL DEFAULT 0'),
+    ('submenus', 'dishes_count', 'integer NOT NULL DEFAULT 0'),
+)
+# workers starting together upgrade one at a time
+SCHEMA_LOCK_ID: int = 0x5C4E3A
+
+
+def upgrade_schema(connection: Connection) -> list[str]:
+    """Adds the columns missing from tables created by an older release and returns them.
+
+    Every statement is idempotent. Counters added here are backfilled with
+    reconcile_counters in the same transaction.
+    """
+    connection.execute(text('SELECT pg_advisory_xact_lock(:lock_id)'), {'lock_id': SCHEMA_LOCK_ID})
+    existing_columns: set[tuple[str, str]] = {
+        (table, column) for table, column in connection.execute(text(
+            'SELECT table_name, column_name FROM information_schema.columns WHERE table_schema = current_schema()'
+        ))
+    }
+    added_columns: list[str] = []
+    for table, column, definition in COLUMNS:
+        if (table, column) not in existing_columns:
+            connection.execute(text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {definition}'))
+            added_columns.append(f'{table}.{column}')
+
+    if added_columns:
+        with Session(bind=connection) as session:
+            reconcile_counters(session)
+    return added_columns
+
+
+if __name__ == '__main__':
+    with engine.begin() as db_connection:
+        columns = upgrade_schema(db_connection)
+    print(f'columns added: {", ".join(columns) or "none"}')
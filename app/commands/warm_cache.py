@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from typing import Callable, Iterator
+
+import redis
+from config import CACHE_WARMUP_BATCH_SIZE, CACHE_WARMUP_LOCK_TIMEOUT
+from database.db import session_factory
+from database.models import Dish, Menu, Submenu
+from dependencies.redis import get_redis_pool
+from repositories import RedisCacheRepository
+from services.dish_service import DishService
+from services.menu_service import MenuService
+from services.submenu_service import SubmenuService
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm.session import Session
+
+WARM_UP_LOCK: str = 'lock:warm_up'
+
+CacheEntry = tuple[str, object, tuple[str, ...]]
+
+# progress of the last warm-up started by this worker
+warm_up_status: dict = {'state': 'idle'}
+_running: threading.Lock = threading.Lock()
+
+
+def _menu_entry(row: Row) -> CacheEntry:
+    menu: Menu = row[0]
+    return f'menu_{menu.id}', MenuService._to_scheme(menu).model_dump(), ()
+
+
+def _submenu_entry(row: Row) -> CacheEntry:
+    submenu: Submenu = row[0]
+    return (
+        f'submenu_{submenu.id}',
+        SubmenuService._to_scheme(submenu).model_dump() | {'menu_id': str(submenu.menu_id)},
+        (f'menu_{submenu.menu_id}',)
+    )
+
+
+def _dish_entry(row: Row) -> CacheEntry:
+    dish: Dish = row[0]
+    return (
+        f'dish_{dish.id}',
+        DishService._to_scheme(dish).model_dump() | {'menu_id': str(row.menu_id), 'submenu_id': str(dish.submenu_id)},
+        (f'menu_{row.menu_id}', f'submenu_{dish.submenu_id}')
+    )
+
+
+WARMERS: tuple[tuple[str, Select, Callable[[Row], CacheEntry]], ...] = (
+    ('menus', select(Menu), _menu_entry),
+    ('submenus', select(Submenu), _submenu_entry),
+    ('dishes', select(Dish, Submenu.menu_id).join(Submenu, Dish.submenu_id == Submenu.id), _dish_entry),
+)
+
+
+def _batches(session: Session, query: Select, batch_size: int) -> Iterator[list[Row]]:
+    """Walks the rows of ``query`` by primary key, so every batch is an index range scan."""
+    model = query.column_descriptions[0]['entity']
+    last_id = None
+    while True:
+        batch_query: Select = query.order_by(model.id).limit(batch_size)
+        if last_id is not None:
+            batch_query = batch_query.where(model.id > last_id)
+        rows: list[Row] = session.execute(batch_query).all()
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0].id
+
+
+def warm_cache(
+        session: Session,
+        cache_repository: RedisCacheRepository,
+        batch_size: int = CACHE_WARMUP_BATCH_SIZE,
+        progress: Callable[[dict], None] | None = None
+) -> dict:
+    """Writes the detail entries of every menu, submenu and dish, one query and one pipeline per batch.
+
+    Entries match the ones the services cache on a miss, tags included. A
+    write landing between the read and the pipeline of a batch can leave a
+    stale entry behind, as on any cache miss, until the entry expires.
+    """
+    started: float = time.perf_counter()
+    report: dict = {name: 0 for name, _, _ in WARMERS} | {'batches': 0}
+    for name, query, to_entry in WARMERS:
+        for rows in _batches(session, query, batch_size):
+            cache_repository.set_tagged([to_entry(row) for row in rows])
+            # the rows are not needed once written, so the session stays small
+            session.expunge_all()
+            report[name] += len(rows)
+            report['batches'] += 1
+            if progress is not None:
+                progress(report | {'seconds': round(time.perf_counter() - started, 3)})
+    return report | {'seconds': round(time.perf_counter() - started, 3)}
+
+
+def _run_warm_up(redis_client: redis.Redis) -> None:
+    try:
+        with session_factory() as session:
+            report: dict = warm_cache(session, RedisCacheRepository(redis_client), progress=warm_up_status.update)
+        warm_up_status.update(report, state='done')
+        print(f'cache warm-up: {report}')
+    except Exception as e:
+        print(e)
+        warm_up_status.update(state='failed', error=str(e))
+    finally:
+        try:
+            redis_client.delete(WARM_UP_LOCK)
+        except redis.RedisError as e:
+            # the lock then expires after CACHE_WARMUP_LOCK_TIMEOUT
+            print(e)
+        _running.release()
+
+
+def start_warm_up() -> bool:
+    """Warms the cache in a daemon thread unless a warm-up is already running in any worker."""
+    if not _running.acquire(blocking=False):
+        return False
+
+    redis_client: redis.Redis = redis.Redis(connection_pool=get_redis_pool())
+    try:
+        locked: bool = bool(redis_client.set(WARM_UP_LOCK, os.getpid(), nx=True, ex=CACHE_WARMUP_LOCK_TIMEOUT))
+    except redis.RedisError as e:
+        print(e)
+        locked = False
+    if not locked:
+        _running.release()
+        return False
+
+    warm_up_status.clear()
+    warm_up_status.update(state='running', pid=os.getpid())
+    threading.Thread(target=_run_warm_up, args=(redis_client,), daemon=True).start()
+    return True
+
+
+if __name__ == '__main__':
+    with session_factory() as db_session:
+        result: dict = warm_cache(
+            db_session,
+            RedisCacheRepository(redis.Redis(connection_pool=get_redis_pool())),
+            progress=lambda current: print(f'\r{current}', end='', flush=True)
+        )
+    print(f'\rcache warmed: {result["menus"]} menus, {result["submenus"]} submenus, '
+          f'{result["dishes"]} dishes in {result["seconds"]} s')
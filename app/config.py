@@ -11,8 +11,98 @@ DB_PORT: str | None = os.getenv('DB_PORT')
 DB_NAME: str | None = os.getenv('DB_NAME')
 
 PORT: int = int(os.getenv('PORT', 8000))
+WORKERS: int = int(os.getenv('WORKERS', 3))
 
 POSTGRES_URL: str = f'postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+POSTGRES_ASYNC_URL: str = f'postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+# asyncpg + redis.asyncio request path; 'false' runs psycopg2 / sync redis on the threadpool
+ASYNC_MODE: bool = os.getenv('ASYNC_MODE', 'true').lower() == 'true'
+
+# per-worker connection pool; a deployment opens up to
+# WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections to Postgres
+DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
 
 REDIS_SERVER: str | None = os.getenv('REDIS_SERVER')
 REDIS_PORT: int = int(os.getenv('REDIS_PORT', 6379))
+
+# one bounded pool per worker process; callers wait up to REDIS_POOL_TIMEOUT for a free connection
+REDIS_MAX_CONNECTIONS: int = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+REDIS_POOL_TIMEOUT: float = float(os.getenv('REDIS_POOL_TIMEOUT', 5))
+REDIS_SOCKET_TIMEOUT: float = float(os.getenv('REDIS_SOCKET_TIMEOUT', 2))
+REDIS_SOCKET_CONNECT_TIMEOUT: float = float(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 2))
+REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
+
+# keyset pagination of the list endpoints (?limit=&cursor=)
+PAGE_SIZE: int = int(os.getenv('PAGE_SIZE', 100))
+MAX_PAGE_SIZE: int = int(os.getenv('MAX_PAGE_SIZE', 1000))
+
+# encoding of cache entries: orjson, msgpack (needs the msgpack package) or pickle;
+# bump CACHE_SCHEMA_VERSION whenever a cached scheme changes so old entries turn into misses
+CACHE_CODEC: str = os.getenv('CACHE_CODEC', 'orjson')
+CACHE_SCHEMA_VERSION: int = int(os.getenv('CACHE_SCHEMA_VERSION', 1))
+
+# seconds before a cache entry expires, per entity type (0 disables expiry);
+# each TTL is spread by +-CACHE_TTL_JITTER so entries written together do not expire together
+CACHE_TTL_MENU: int = int(os.getenv('CACHE_TTL_MENU', 3600))
+CACHE_TTL_SUBMENU: int = int(os.getenv('CACHE_TTL_SUBMENU', 3600))
+CACHE_TTL_DISH: int = int(os.getenv('CACHE_TTL_DISH', 3600))
+CACHE_TTL_TREE: int = int(os.getenv('CACHE_TTL_TREE', 600))
+CACHE_TTL_LIST: int = int(os.getenv('CACHE_TTL_LIST', 300))
+CACHE_TTL_DEFAULT: int = int(os.getenv('CACHE_TTL_DEFAULT', 3600))
+CACHE_TTL_JITTER: float = float(os.getenv('CACHE_TTL_JITTER', 0.1))
+# renew the TTL on every cache hit (GETEX) instead of expiring entries at a fixed time after the write
+CACHE_SLIDING_TTL: bool = os.getenv('CACHE_SLIDING_TTL', 'false').lower() == 'true'
+
+# in-process LRU tier in front of Redis, per worker (0 disables it); CACHE_LOCAL_TTL bounds how long
+# an entry can stay stale if an invalidation message from another worker is lost
+CACHE_LOCAL_MAX_SIZE: int = int(os.getenv('CACHE_LOCAL_MAX_SIZE', 1000))
+CACHE_LOCAL_TTL: float = float(os.getenv('CACHE_LOCAL_TTL', 5))
+# pub/sub channel on which deleted cache keys are broadcast to the local tiers of all workers
+CACHE_INVALIDATION_CHANNEL: str = os.getenv('CACHE_INVALIDATION_CHANNEL', 'cache_invalidation')
+
+# single-flight rebuild of missed cache keys: one request holds lock:{key} for at most CACHE_LOCK_TIMEOUT
+# seconds while the others poll the key every CACHE_LOCK_POLL_INTERVAL, for up to CACHE_LOCK_MAX_WAIT
+CACHE_LOCK_TIMEOUT: float = float(os.getenv('CACHE_LOCK_TIMEOUT', 5))
+CACHE_LOCK_POLL_INTERVAL: float = float(os.getenv('CACHE_LOCK_POLL_INTERVAL', 0.02))
+CACHE_LOCK_MAX_WAIT: float = float(os.getenv('CACHE_LOCK_MAX_WAIT', 1))
+
+# Cache-Control sent with the ETag of every GET response; no-cache makes clients revalidate each time
+# and get a 304 while nothing changed, an empty value omits the header
+HTTP_CACHE_CONTROL: str = os.getenv('HTTP_CACHE_CONTROL', 'no-cache')
+
+# bulk load of every menu, submenu and dish entry into Redis, CACHE_WARMUP_BATCH_SIZE rows per query and pipeline;
+# runs in the background when a worker starts, one worker at a time for at most CACHE_WARMUP_LOCK_TIMEOUT seconds
+CACHE_WARMUP_ON_STARTUP: bool = os.getenv('CACHE_WARMUP_ON_STARTUP', 'true').lower() == 'true'
+CACHE_WARMUP_BATCH_SIZE: int = int(os.getenv('CACHE_WARMUP_BATCH_SIZE', 500))
+CACHE_WARMUP_LOCK_TIMEOUT: int = int(os.getenv('CACHE_WARMUP_LOCK_TIMEOUT', 300))
+
+# creates and updates store the written entries and adjust the counters of the cached parents
+# instead of deleting them, so reads after a write do not miss
+CACHE_WRITE_THROUGH: bool = os.getenv('CACHE_WRITE_THROUGH', 'false').lower() == 'true'
+
+# directory shared by the uvicorn workers for their Prometheus metrics, so /metrics sums all of them;
+# unset, every worker serves only its own. prometheus_client reads it too, so it must be set in the environment
+PROMETHEUS_MULTIPROC_DIR: str | None = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+# X-DB-Queries and X-DB-Time (milliseconds) response headers and an app.queries log line per request;
+# DB_QUERY_DEBUG also logs every statement of the request and the ones repeated within it
+DB_QUERY_STATS: bool = os.getenv('DB_QUERY_STATS', 'true').lower() == 'true'
+DB_QUERY_DEBUG: bool = os.getenv('DB_QUERY_DEBUG', 'false').lower() == 'true'
+
+# on-demand cProfile of single requests: requests carrying an X-Profile-Token signed with PROFILING_SECRET
+# (see commands.profile_token), or armed through POST /api/v1/internal/profiling, are profiled and saved
+# to PROFILING_DIR, which keeps the newest PROFILING_MAX_FILES profiles
+PROFILING_SECRET: str | None = os.getenv('PROFILING_SECRET')
+PROFILING_DIR: str = os.getenv('PROFILING_DIR', '/tmp/profiles')
+PROFILING_MAX_FILES: int = int(os.getenv('PROFILING_MAX_FILES', 50))
+
+# SQL statements running for DB_SLOW_QUERY_THRESHOLD seconds or longer (0 disables) are logged by the
+# app.slow_queries logger; a DB_SLOW_QUERY_EXPLAIN_RATE share of the slow SELECTs is run again
+# under EXPLAIN (ANALYZE, BUFFERS) to log their plan
+DB_SLOW_QUERY_THRESHOLD: float = float(os.getenv('DB_SLOW_QUERY_THRESHOLD', 0.2))
+DB_SLOW_QUERY_EXPLAIN_RATE: float = float(os.getenv('DB_SLOW_QUERY_EXPLAIN_RATE', 0.1))
@@ -1,14 +1,59 @@
-from typing import Generator
+import os
+from typing import AsyncGenerator, Generator
 
-from config import POSTGRES_URL
+# registers the listeners timing every SQL statement
+import database.query_metrics  # noqa: F401
+from config import (
+    ASYNC_MODE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    POSTGRES_ASYNC_URL,
+    POSTGRES_URL,
+    WORKERS,
+)
+from database.pool_stats import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    get_pool_statistics,
+)
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from sqlalchemy.orm.session import Session
 
-engine: Engine = create_engine(POSTGRES_URL)
+pool_settings: dict = {
+    'pool_size': DB_POOL_SIZE,
+    'max_overflow': DB_MAX_OVERFLOW,
+    'pool_timeout': DB_POOL_TIMEOUT,
+    'pool_recycle': DB_POOL_RECYCLE,
+    'pool_pre_ping': DB_POOL_PRE_PING,
+}
+
+engine: Engine = create_engine(POSTGRES_URL, poolclass=TimedQueuePool, **pool_settings)
 session_factory: sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine: AsyncEngine = create_async_engine(
+    POSTGRES_ASYNC_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **pool_settings
+)
+async_session_factory: async_sessionmaker = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+DBSession = AsyncSession | Session
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,3 +62,26 @@ class Base(DeclarativeBase):
 def get_session() -> Generator[Session, None, None]:
     with session_factory() as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as session:
+        yield session
+
+
+get_db_session = get_async_session if ASYNC_MODE else get_session
+
+
+def get_db_pool_statistics() -> dict:
+    active_engine: Engine = async_engine.sync_engine if ASYNC_MODE else engine
+    connections_per_worker: int = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    return {
+        'pid': os.getpid(),
+        'async_mode': ASYNC_MODE,
+        'pool': get_pool_statistics(active_engine.pool),
+        'max_connections': {
+            'per_worker': connections_per_worker,
+            'workers': WORKERS,
+            'total': connections_per_worker * WORKERS,
+        },
+    }
@@ -2,8 +2,17 @@ import datetime
 import uuid
 
 from database.db import Base
-from sqlalchemy import ForeignKey, text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Connection,
+    ForeignKey,
+    Index,
+    Update,
+    event,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, relationship
 from typing_extensions import Annotated
 
 intpk = Annotated[
@@ -23,22 +32,27 @@ updated_at = Annotated[
     mapped_column(server_default=text("TIMEZONE('utc', NOW())"),
                   onupdate=datetime.datetime.utcnow)
 ]
+counter = Annotated[int, mapped_column(default=0, server_default=text('0'))]
 
 
 class Menu(Base):
     __tablename__ = 'menus'
+    __table_args__ = (Index('ix_menus_created_at_id', 'created_at', 'id'),)
 
     id: Mapped[intpk]
     title: Mapped[title_uc]
     description: Mapped[str]
     created_at: Mapped[created_at]
     updated_at: Mapped[updated_at]
+    submenus_count: Mapped[counter]
+    dishes_count: Mapped[counter]
 
-    submenus: Mapped[list['Submenu']] = relationship(back_populates='menu')
+    submenus: Mapped[list['Submenu']] = relationship(back_populates='menu', passive_deletes=True)
 
 
 class Submenu(Base):
     __tablename__ = 'submenus'
+    __table_args__ = (Index('ix_submenus_menu_id_created_at_id', 'menu_id', 'created_at', 'id'),)
 
     id: Mapped[intpk]
     title: Mapped[title_uc]
@@ -51,12 +65,14 @@ class Submenu(Base):
         nullable=False
     )
     menu: Mapped['Menu'] = relationship('Menu', back_populates='submenus')
+    dishes_count: Mapped[counter]
 
-    dishes: Mapped[list['Dish']] = relationship(back_populates='submenu')
+    dishes: Mapped[list['Dish']] = relationship(back_populates='submenu', passive_deletes=True)
 
 
 class Dish(Base):
     __tablename__ = 'dishes'
+    __table_args__ = (Index('ix_dishes_submenu_id_created_at_id', 'submenu_id', 'created_at', 'id'),)
 
     id: Mapped[intpk]
     title: Mapped[title_uc]
@@ -70,3 +86,57 @@ class Dish(Base):
         nullable=False
     )
     submenu: Mapped['Submenu'] = relationship(back_populates='dishes')
+
+
+# submenus_count and dishes_count are kept in the same transaction as the row
+# that changes them; ORM bulk inserts skip mapper events and execute the same
+# statements themselves. commands/reconcile_counters.py recomputes them from scratch
+
+def submenus_count_update(menu_id: uuid.UUID, delta: int) -> Update:
+    return (
+        update(Menu)
+        .where(Menu.id == menu_id)
+        .values(submenus_count=Menu.submenus_count + delta)
+    )
+
+
+def dishes_count_updates(submenu_id: uuid.UUID, delta: int) -> tuple[Update, Update]:
+    return (
+        update(Submenu)
+        .where(Submenu.id == submenu_id)
+        .values(dishes_count=Submenu.dishes_count + delta),
+        update(Menu)
+        .where(Menu.id == select(Submenu.menu_id).where(Submenu.id == submenu_id).scalar_subquery())
+        .values(dishes_count=Menu.dishes_count + delta)
+    )
+
+
+@event.listens_for(Submenu, 'after_insert')
+def increment_submenus_count(mapper: Mapper, connection: Connection, submenu: Submenu) -> None:
+    connection.execute(submenus_count_update(submenu.menu_id, 1))
+
+
+@event.listens_for(Submenu, 'before_delete')
+def decrement_submenus_count(mapper: Mapper, connection: Connection, submenu: Submenu) -> None:
+    # dishes removed by the database cascade never reach after_delete of Dish
+    remaining_dishes = select(Submenu.dishes_count).where(Submenu.id == submenu.id).scalar_subquery()
+    connection.execute(
+        update(Menu)
+        .where(Menu.id == submenu.menu_id)
+        .values(
+            submenus_count=Menu.submenus_count - 1,
+            dishes_count=Menu.dishes_count - remaining_dishes
+        )
+    )
+
+
+@event.listens_for(Dish, 'after_insert')
+def increment_dishes_count(mapper: Mapper, connection: Connection, dish: Dish) -> None:
+    for statement in dishes_count_updates(dish.submenu_id, 1):
+        connection.execute(statement)
+
+
+@event.listens_for(Dish, 'after_delete')
+def decrement_dishes_count(mapper: Mapper, connection: Connection, dish: Dish) -> None:
+    for statement in dishes_count_updates(dish.submenu_id, -1):
+        connection.execute(statement)
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+WAIT_TIME_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolStatistics:
+    """Histogram of the time spent acquiring a connection from a pool."""
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_TIME_BUCKETS) -> None:
+        self._buckets = buckets
+        self._bucket_counts: list[int] = [0] * len(buckets)
+        self._count: int = 0
+        self._sum: float = 0.0
+        self._max: float = 0.0
+        self._timeouts: int = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += seconds
+            self._max = max(self._max, seconds)
+            for index, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    self._bucket_counts[index] += 1
+                    break
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def wait_time(self) -> dict:
+        with self._lock:
+            cumulative: int = 0
+            buckets: dict[str, int] = {}
+            for bound, bucket_count in zip(self._buckets, self._bucket_counts):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            buckets['+Inf'] = self._count
+            return {
+                'buckets': buckets,
+                'count': self._count,
+                'sum': round(self._sum, 6),
+                'max': round(self._max, 6),
+                'timeouts': self._timeouts,
+            }
+
+
+class TimedPoolMixin:
+    """Records checkout wait time of a QueuePool into ``statistics``."""
+
+    statistics: PoolStatistics
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.statistics = PoolStatistics()
+
+    def connect(self):
+        started: float = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.statistics.observe_timeout()
+            raise
+        finally:
+            self.statistics.observe(time.perf_counter() - started)
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.statistics = self.statistics
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_statistics(pool: Pool) -> dict:
+    pool_statistics: dict = {
+        'pool_class': type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        pool_statistics.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+        })
+    if isinstance(pool, TimedPoolMixin):
+        pool_statistics['wait_time'] = pool.statistics.wait_time()
+    return pool_statistics
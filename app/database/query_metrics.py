@@ -0,0 +1,82 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from config import DB_SLOW_QUERY_THRESHOLD
+from database.slow_queries import log_slow_query
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Duration of SQL statements by the ORM repository method that ran them',
+    ['repository', 'method'],
+    buckets=DURATION_BUCKETS
+)
+DB_REPOSITORY_DURATION = Histogram(
+    'db_repository_call_duration_seconds',
+    'Duration of ORM repository method calls, commits included',
+    ['repository', 'method'],
+    buckets=DURATION_BUCKETS
+)
+
+# (repository, method) of the repository call running in this task or thread;
+# statements run outside of the repositories, e.g. by the commands, are labelled 'other'
+repository_method: ContextVar[tuple[str, str]] = ContextVar('repository_method', default=('other', 'other'))
+
+
+class QueryStatistics:
+    """Number and duration of the SQL statements run while handling one request.
+
+    The statements themselves are kept only when ``capture`` is set, since
+    their text is far larger than the counters.
+    """
+
+    def __init__(self, capture: bool = False) -> None:
+        self.queries: int = 0
+        self.seconds: float = 0.0
+        self.statements: list[tuple[str, float]] | None = [] if capture else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.seconds += seconds
+        if self.statements is not None:
+            self.statements.append((statement, seconds))
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Statements run more than once, the most frequent first; usually a sign of N+1 queries."""
+        counts: Counter[str] = Counter(statement for statement, _ in self.statements or ())
+        return [(statement, count) for statement, count in counts.most_common() if count > 1]
+
+
+# statistics of the request handled in this task; the threads of sync endpoints and repositories
+# get a copy of the context, so they record into the same object
+query_statistics: ContextVar[QueryStatistics | None] = ContextVar('query_statistics', default=None)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _end_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds: float = time.perf_counter() - conn.info['query_started'].pop()
+    DB_QUERY_DURATION.labels(*repository_method.get()).observe(seconds)
+    if DB_SLOW_QUERY_THRESHOLD and seconds >= DB_SLOW_QUERY_THRESHOLD:
+        log_slow_query(conn, statement, parameters, executemany, seconds, repository_method.get())
+    statistics: QueryStatistics | None = query_statistics.get()
+    if statistics is not None:
+        statistics.record(statement, seconds)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _fail_query(exception_context) -> None:
+    # failed statements skip after_cursor_execute
+    if exception_context.connection is not None and exception_context.connection.info.get('query_started'):
+        exception_context.connection.info['query_started'].pop()
@@ -0,0 +1,93 @@
+import datetime
+import decimal
+import logging
+import random
+import uuid
+from contextvars import ContextVar
+
+from config import DB_SLOW_QUERY_EXPLAIN_RATE
+from prometheus_client import Counter
+
+logger = logging.getLogger('app.slow_queries')
+
+DB_SLOW_QUERIES = Counter(
+    'db_slow_queries_total',
+    'SQL statements slower than DB_SLOW_QUERY_THRESHOLD by the ORM repository method that ran them',
+    ['repository', 'method']
+)
+
+# bind parameters of these types are logged as they are; they identify rows but carry no user text
+LOGGED_PARAMETER_TYPES: tuple[type, ...] = (
+    bool, int, float, decimal.Decimal, uuid.UUID, datetime.datetime, datetime.date, type(None)
+)
+
+# ASGI scope of the request handled in this task, set by the RequestMetricsMiddleware;
+# the router adds the matched route to it
+request_scope: ContextVar[dict | None] = ContextVar('request_scope', default=None)
+
+
+def redact(parameters: object) -> object:
+    """Bind parameters with every string or other value of a type not in LOGGED_PARAMETER_TYPES replaced by its type."""
+    if isinstance(parameters, dict):
+        return {name: redact(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    if isinstance(parameters, LOGGED_PARAMETER_TYPES):
+        return parameters
+    if isinstance(parameters, (str, bytes)):
+        return f'<{type(parameters).__name__} of {len(parameters)}>'
+    return f'<{type(parameters).__name__}>'
+
+
+def request_origin() -> str:
+    scope: dict | None = request_scope.get()
+    if scope is None:
+        return 'no request'
+    route = scope.get('route')
+    return f'{scope["method"]} {getattr(route, "name", scope["path"])}'
+
+
+def log_slow_query(
+        conn,
+        statement: str,
+        parameters: object,
+        executemany: bool,
+        seconds: float,
+        repository_method: tuple[str, str]
+) -> None:
+    """Logs a slow statement and, for a sampled share of the SELECTs, its EXPLAIN (ANALYZE, BUFFERS) plan."""
+    DB_SLOW_QUERIES.labels(*repository_method).inc()
+    logger.warning(
+        'slow query %.3fs in %s (%s): %s parameters=%s',
+        seconds, '.'.join(repository_method), request_origin(), ' '.join(statement.split()), redact(parameters)
+    )
+    if executemany or statement.lstrip()[:6].upper() != 'SELECT' or random.random() >= DB_SLOW_QUERY_EXPLAIN_RATE:
+        return
+
+    plan: str | None = explain(conn, statement, parameters)
+    if plan is not None:
+        logger.warning('plan of the slow query in %s:\n%s', '.'.join(repository_method), plan)
+
+
+def explain(conn, statement: str, parameters: object) -> str | None:
+    """Runs the statement again under EXPLAIN ANALYZE on the same connection, in a savepoint.
+
+    The statement is a SELECT, so running it twice changes nothing, and the
+    savepoint keeps a failing EXPLAIN from aborting the transaction of the
+    request. The raw DBAPI cursor bypasses the SQLAlchemy events, so the
+    EXPLAIN is neither timed nor explained itself.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute('SAVEPOINT explain_slow_query')
+        try:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+            plan: str = '\n'.join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT explain_slow_query')
+            logger.warning('EXPLAIN of the slow query failed: %s', e)
+            return None
+        cursor.execute('RELEASE SAVEPOINT explain_slow_query')
+        return plan
+    finally:
+        cursor.close()
@@ -0,0 +1,28 @@
+from config import CACHE_SCHEMA_VERSION, HTTP_CACHE_CONTROL
+from fastapi import Request, Response
+
+
+def make_etag(version: str) -> str:
+    """Strong ETag of a response built from the cache version of the data behind it."""
+    return f'"{CACHE_SCHEMA_VERSION}-{version}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison; '*' is not honoured because
+    # the ETag is known before it is known whether the entity exists
+    if_none_match: str | None = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    return etag in {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers['ETag'] = etag
+    if HTTP_CACHE_CONTROL:
+        response.headers['Cache-Control'] = HTTP_CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response: Response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
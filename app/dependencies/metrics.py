@@ -0,0 +1,70 @@
+import os
+import shutil
+import time
+
+from config import PROMETHEUS_MULTIPROC_DIR
+from database.slow_queries import request_scope
+from prometheus_client import REGISTRY, CollectorRegistry, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Duration of HTTP requests by route name, method and status code',
+    ['route', 'method', 'status']
+)
+
+
+class RequestMetricsMiddleware:
+    """Records every HTTP request in HTTP_REQUEST_DURATION under the name of its route.
+
+    The route is looked up after the request was handled, when the router has
+    stored it in the scope; requests that match no route are labelled 'unmatched'.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started: float = time.perf_counter()
+        status: int = 500
+        token = request_scope.set(scope)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_scope.reset(token)
+            route = scope.get('route')
+            HTTP_REQUEST_DURATION.labels(
+                getattr(route, 'name', 'unmatched'),
+                scope['method'],
+                str(status)
+            ).observe(time.perf_counter() - started)
+
+
+def reset_multiprocess_metrics() -> None:
+    """Empties PROMETHEUS_MULTIPROC_DIR; called once before the workers start."""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format, summed over all workers in multiprocess mode."""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(REGISTRY)
+
+    registry: CollectorRegistry = CollectorRegistry()
+    MultiProcessCollector(registry, PROMETHEUS_MULTIPROC_DIR)
+    return generate_latest(registry)
@@ -0,0 +1,52 @@
+import base64
+import datetime
+import uuid
+from typing import NamedTuple
+
+from config import MAX_PAGE_SIZE, PAGE_SIZE
+from fastapi import HTTPException, Query, Response
+
+Cursor = tuple[datetime.datetime, uuid.UUID]
+
+
+class Page(NamedTuple):
+    limit: int
+    after: Cursor | None
+
+
+def encode_cursor(created_at: datetime.datetime, item_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{item_id}'.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.datetime.fromisoformat(created_at), uuid.UUID(item_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail='invalid cursor') from None
+
+
+def pagination(
+        limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = None
+) -> Page:
+    return Page(limit, decode_cursor(cursor) if cursor else None)
+
+
+def page_key(page: Page) -> str:
+    """Identifies the page in the cache key of a list entry."""
+    return f'{page.limit}:{encode_cursor(*page.after) if page.after else ""}'
+
+
+def split_page(rows: list, page: Page) -> tuple[list, str | None]:
+    """Cuts rows fetched with page.limit + 1 to the page and builds the cursor of the next one."""
+    if len(rows) <= page.limit:
+        return rows, None
+
+    last_row = rows[page.limit - 1]
+    return rows[:page.limit], encode_cursor(last_row.created_at, last_row.id)
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
@@ -0,0 +1,49 @@
+import uuid
+from typing import NamedTuple
+
+from database.db import DBSession
+from database.models import Dish, Menu, Submenu
+from fastapi import HTTPException
+from repositories import AsyncMenuORMRepository, MenuORMRepository, make_orm_repository
+
+
+class ResolvedPath(NamedTuple):
+    menu: Menu | None
+    submenu: Submenu | None
+    dish: Dish | None
+
+
+class PathResolver:
+    """Loads the /menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id} chain with one query.
+
+    The loaded rows stay in the request session, so services looking them
+    up by primary key afterwards do not hit the database again.
+    """
+
+    def __init__(self, session: DBSession) -> None:
+        self._menu_repository: AsyncMenuORMRepository = make_orm_repository(
+            session, MenuORMRepository, AsyncMenuORMRepository
+        )
+
+    async def resolve(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID | None = None,
+            dish_id: uuid.UUID | None = None
+    ) -> ResolvedPath:
+        return ResolvedPath(*await self._menu_repository.get_path(menu_id, submenu_id, dish_id))
+
+    async def require(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID | None = None,
+            dish_id: uuid.UUID | None = None
+    ) -> ResolvedPath:
+        path: ResolvedPath = await self.resolve(menu_id, submenu_id, dish_id)
+        if not path.menu:
+            raise HTTPException(status_code=404, detail='menu not found')
+        if submenu_id and not path.submenu:
+            raise HTTPException(status_code=404, detail='submenu not found')
+        if dish_id and not path.dish:
+            raise HTTPException(status_code=404, detail='dish not found')
+        return path
@@ -0,0 +1,200 @@
+import cProfile
+import datetime
+import hashlib
+import hmac
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from config import PROFILING_DIR, PROFILING_MAX_FILES, PROFILING_SECRET
+from fastapi import Header, HTTPException
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_TOKEN_HEADER: bytes = b'x-profile-token'
+# the internal endpoints take the token as a credential, requests to them are not profiled for it
+INTERNAL_PATH: str = '/api/v1/internal/'
+
+# requests armed through the internal endpoint, in this worker only
+profiling_requests: dict[str, int | str] = {'remaining': 0, 'path': ''}
+_profiling_lock: threading.Lock = threading.Lock()
+
+
+def sign_profile_token(expires: int, secret: str) -> str:
+    """Token for the X-Profile-Token header, valid until the ``expires`` unix time."""
+    signature: str = hmac.new(secret.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f'{expires}.{signature}'
+
+
+def verify_profile_token(token: str, secret: str) -> bool:
+    expires, _, signature = token.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign_profile_token(int(expires), secret), token)
+
+
+def require_profile_token(x_profile_token: str | None = Header(default=None)) -> None:
+    """Guards the internal endpoints; they do not exist while PROFILING_SECRET is unset."""
+    if not PROFILING_SECRET:
+        raise HTTPException(status_code=404, detail='Not Found')
+    if x_profile_token is None or not verify_profile_token(x_profile_token, PROFILING_SECRET):
+        raise HTTPException(status_code=403, detail='invalid profile token')
+
+
+def arm_profiling(requests: int, path: str = '') -> dict:
+    """Profiles the next ``requests`` requests of this worker whose path starts with ``path``."""
+    with _profiling_lock:
+        profiling_requests.update(remaining=requests, path=path)
+        return dict(profiling_requests)
+
+
+class RequestProfile:
+    """cProfile of one request, across the event loop and the threadpool.
+
+    cProfile only sees the thread that enabled it, so every blocking
+    repository call the request sends to the threadpool is profiled
+    separately through ``runcall`` and merged into the stats at the end.
+    """
+
+    def __init__(self) -> None:
+        self.id: str = uuid.uuid4().hex
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self._thread_profiles: list[cProfile.Profile] = []
+
+    def runcall(self, function: Callable, *args, **kwargs) -> Any:
+        profile: cProfile.Profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            self._thread_profiles.append(profile)
+
+    def stats(self) -> pstats.Stats:
+        stats: pstats.Stats = pstats.Stats(self.profile)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        return stats
+
+
+# profile of the request handled in this task, read by the ThreadpoolRepository
+active_profile: ContextVar[RequestProfile | None] = ContextVar('active_profile', default=None)
+# cProfile hooks the thread it runs in, so one request per worker is profiled at a time
+_busy: threading.Lock = threading.Lock()
+
+
+class ProfilingMiddleware:
+    """Runs requests that asked for it under cProfile and saves the stats to PROFILING_DIR.
+
+    A request is profiled when its X-Profile-Token header carries a valid
+    token signed with PROFILING_SECRET, or when profiling was armed for its
+    path. Its response then carries the X-Profile-Id to fetch the stats
+    with. Other requests only pay for the header lookup, and not even that
+    while PROFILING_SECRET is unset. The event loop thread is shared, so
+    coroutines of concurrent requests show up in the profile too.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self._requested(scope) or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile: RequestProfile = RequestProfile()
+        token = active_profile.set(profile)
+        status: int = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                MutableHeaders(scope=message)['X-Profile-Id'] = profile.id
+            await send(message)
+
+        started: float = time.perf_counter()
+        profile.profile.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.profile.disable()
+            active_profile.reset(token)
+            _busy.release()
+            save_profile(profile, {
+                'id': profile.id,
+                'method': scope['method'],
+                'path': scope['path'],
+                'status': status,
+                'seconds': round(time.perf_counter() - started, 6),
+                'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            })
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        if profiling_requests['remaining'] and scope['path'].startswith(profiling_requests['path']):
+            with _profiling_lock:
+                if profiling_requests['remaining'] > 0:
+                    profiling_requests['remaining'] -= 1
+                    return True
+        if PROFILING_SECRET and not scope['path'].startswith(INTERNAL_PATH):
+            for name, value in scope['headers']:
+                if name == PROFILE_TOKEN_HEADER:
+                    return verify_profile_token(value.decode('latin-1'), PROFILING_SECRET)
+        return False
+
+
+def profile_path(profile_id: str, extension: str) -> str:
+    return os.path.join(PROFILING_DIR, f'{profile_id}.{extension}')
+
+
+def find_profile(profile_id: str) -> str | None:
+    """Path of the stats of a saved profile, None if there is no such profile."""
+    if not profile_id.isalnum():
+        return None
+    path: str = profile_path(profile_id, 'prof')
+    return path if os.path.exists(path) else None
+
+
+def save_profile(profile: RequestProfile, meta: dict) -> None:
+    """Writes the stats, loadable with pstats or snakeviz, next to their metadata, then drops the oldest profiles."""
+    os.makedirs(PROFILING_DIR, exist_ok=True)
+    profile.stats().dump_stats(profile_path(profile.id, 'prof'))
+    with open(profile_path(profile.id, 'json'), 'w') as meta_file:
+        json.dump(meta, meta_file)
+
+    for outdated in list_profiles()[PROFILING_MAX_FILES:]:
+        for extension in ('prof', 'json'):
+            try:
+                os.remove(profile_path(outdated['id'], extension))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> list[dict]:
+    """Metadata of the saved profiles of all workers, the newest first."""
+    if not os.path.isdir(PROFILING_DIR):
+        return []
+    profiles: list[dict] = []
+    for name in os.listdir(PROFILING_DIR):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(PROFILING_DIR, name)) as meta_file:
+                    profiles.append(json.load(meta_file))
+            except (OSError, ValueError):
+                continue
+    return sorted(profiles, key=lambda meta: meta['created'], reverse=True)
+
+
+def read_profile_stats(profile_id: str, sort: str, limit: int) -> str | None:
+    """The ``limit`` most expensive functions of a saved profile as pstats text, None if there is no such profile."""
+    path: str | None = find_profile(profile_id)
+    if path is None:
+        return None
+    output: io.StringIO = io.StringIO()
+    pstats.Stats(path, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
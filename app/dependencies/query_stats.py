@@ -0,0 +1,57 @@
+import logging
+
+from config import DB_QUERY_DEBUG
+from database.query_metrics import QueryStatistics, query_statistics
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger('app.queries')
+
+
+class QueryStatisticsMiddleware:
+    """Counts the SQL statements and their total duration per HTTP request.
+
+    Both are sent as the X-DB-Queries and X-DB-Time (milliseconds) headers
+    and logged once the response is complete. With DB_QUERY_DEBUG, the log
+    also lists every statement and the ones that ran more than once.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        statistics: QueryStatistics = QueryStatistics(capture=DB_QUERY_DEBUG)
+        token = query_statistics.set(statistics)
+        status: int = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers: MutableHeaders = MutableHeaders(scope=message)
+                headers['X-DB-Queries'] = str(statistics.queries)
+                headers['X-DB-Time'] = f'{statistics.seconds * 1000:.3f}'
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            query_statistics.reset(token)
+            log_statistics(scope, status, statistics)
+
+
+def log_statistics(scope: Scope, status: int, statistics: QueryStatistics) -> None:
+    logger.info(
+        '%s %s %d queries=%d db_time=%.3fms',
+        scope['method'], scope['path'], status, statistics.queries, statistics.seconds * 1000
+    )
+    if statistics.statements is None:
+        return
+    for statement, seconds in statistics.statements:
+        logger.info('  %.3fms %s', seconds * 1000, ' '.join(statement.split()))
+    for statement, count in statistics.repeated():
+        logger.warning('  repeated %d times: %s', count, ' '.join(statement.split()))
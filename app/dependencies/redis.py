@@ -1,9 +1,151 @@
+import os
+
 import redis
-from config import REDIS_PORT, REDIS_SERVER
+from config import (
+    ASYNC_MODE,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_PORT,
+    REDIS_SERVER,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+)
+from redis import asyncio as aioredis
+from repositories.redis_repository.local_cache import (
+    InvalidationSubscriber,
+    cache_statistics,
+    local_cache,
+)
+from repositories.redis_repository.single_flight import stampede_counters
+
+RedisClient = redis.Redis | aioredis.Redis
+
+socket_connects: dict[str, int] = {'total': 0}
+
+
+class CountingConnection(redis.Connection):
+    def on_connect(self) -> None:
+        socket_connects['total'] += 1
+        super().on_connect()
+
+
+class AsyncCountingConnection(aioredis.Connection):
+    async def on_connect(self) -> None:
+        socket_connects['total'] += 1
+        await super().on_connect()
+
+
+redis_pool: redis.BlockingConnectionPool | None = None
+async_redis_pool: aioredis.BlockingConnectionPool | None = None
+invalidation_subscriber: InvalidationSubscriber | None = None
+
+
+def _pool_settings() -> dict:
+    return {
+        'host': REDIS_SERVER,
+        'port': REDIS_PORT,
+        'max_connections': REDIS_MAX_CONNECTIONS,
+        'timeout': REDIS_POOL_TIMEOUT,
+        'socket_timeout': REDIS_SOCKET_TIMEOUT,
+        'socket_connect_timeout': REDIS_SOCKET_CONNECT_TIMEOUT,
+        'socket_keepalive': True,
+        'health_check_interval': REDIS_HEALTH_CHECK_INTERVAL,
+    }
+
+
+def get_redis_pool() -> redis.BlockingConnectionPool:
+    global redis_pool
+    if redis_pool is None:
+        redis_pool = redis.BlockingConnectionPool(connection_class=CountingConnection, **_pool_settings())
+    return redis_pool
+
 
+def get_async_redis_pool() -> aioredis.BlockingConnectionPool:
+    global async_redis_pool
+    if async_redis_pool is None:
+        async_redis_pool = aioredis.BlockingConnectionPool(
+            connection_class=AsyncCountingConnection,
+            **_pool_settings()
+        )
+    return async_redis_pool
 
-def cache() -> redis.Redis:
-    return redis.Redis(
-        host=REDIS_SERVER,
-        port=REDIS_PORT,
+
+def open_redis_pool() -> None:
+    if ASYNC_MODE:
+        get_async_redis_pool()
+    else:
+        get_redis_pool()
+
+
+async def close_redis_pool() -> None:
+    global redis_pool, async_redis_pool
+    if async_redis_pool is not None:
+        await async_redis_pool.disconnect()
+        async_redis_pool = None
+    if redis_pool is not None:
+        redis_pool.disconnect()
+        redis_pool = None
+
+
+def open_invalidation_subscriber() -> None:
+    global invalidation_subscriber
+    if not local_cache.enabled or invalidation_subscriber is not None:
+        return
+
+    subscriber: InvalidationSubscriber = InvalidationSubscriber(
+        redis.Redis(host=REDIS_SERVER, port=REDIS_PORT, socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT),
+        local_cache
     )
+    try:
+        subscriber.start()
+    except redis.RedisError as e:
+        # the local tier then relies on CACHE_LOCAL_TTL alone for changes made by other workers
+        print(e)
+        return
+    invalidation_subscriber = subscriber
+
+
+def close_invalidation_subscriber() -> None:
+    global invalidation_subscriber
+    if invalidation_subscriber is not None:
+        invalidation_subscriber.stop()
+        invalidation_subscriber = None
+
+
+def get_cache_statistics() -> dict:
+    return {
+        'pid': os.getpid(),
+        'tiers': cache_statistics.report(),
+        'local': local_cache.report() | {'subscribed': invalidation_subscriber is not None},
+        'stampede': dict(stampede_counters),
+    }
+
+
+def get_redis_pool_statistics() -> dict:
+    pool_statistics: dict = {
+        'pid': os.getpid(),
+        'async_mode': ASYNC_MODE,
+        'max_connections': REDIS_MAX_CONNECTIONS,
+        'socket_connects': socket_connects['total'],
+    }
+    if async_redis_pool is not None:
+        in_use: int = len(async_redis_pool._in_use_connections)
+        idle: int = len(async_redis_pool._available_connections)
+    elif redis_pool is not None:
+        idle = sum(1 for connection in redis_pool.pool.queue if connection is not None)
+        in_use = len(redis_pool._connections) - idle
+    else:
+        in_use = idle = 0
+    pool_statistics.update({
+        'created': in_use + idle,
+        'in_use': in_use,
+        'idle': idle,
+    })
+    return pool_statistics
+
+
+async def cache() -> RedisClient:
+    if ASYNC_MODE:
+        return aioredis.Redis(connection_pool=get_async_redis_pool())
+    return redis.Redis(connection_pool=get_redis_pool())
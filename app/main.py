@@ -1,19 +1,52 @@
+import copy
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
 import uvicorn
-from config import PORT
+from commands.upgrade_schema import upgrade_schema
+from commands.warm_cache import start_warm_up
+from config import CACHE_WARMUP_ON_STARTUP, DB_QUERY_STATS, PORT, WORKERS
 from database.db import Base, engine
+from dependencies.metrics import RequestMetricsMiddleware, reset_multiprocess_metrics
+from dependencies.profiling import ProfilingMiddleware
+from dependencies.query_stats import QueryStatisticsMiddleware
+from dependencies.redis import (
+    close_invalidation_subscriber,
+    close_redis_pool,
+    open_invalidation_subscriber,
+    open_redis_pool,
+)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers.dish_router import dish_router
+from routers.internal_router import internal_router
 from routers.menu_router import menu_router
+from routers.metrics_router import metrics_router
 from routers.submenu_router import submenu_router
 
 Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    upgrade_schema(connection)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    open_redis_pool()
+    open_invalidation_subscriber()
+    if CACHE_WARMUP_ON_STARTUP:
+        start_warm_up()
+    yield
+    close_invalidation_subscriber()
+    await close_redis_pool()
+
+
 app = FastAPI(
     title='Restaurant API',
     description='API for restaurant menu',
     version='1.0.0',
     openapi_url='/api/v1/openapi.json',
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
 
@@ -29,10 +62,20 @@ app.add_middleware(
     allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'],
     allow_headers=['*'],
 )
+app.add_middleware(RequestMetricsMiddleware)
+if DB_QUERY_STATS:
+    app.add_middleware(QueryStatisticsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 app.include_router(menu_router, prefix='/api/v1')
 app.include_router(submenu_router, prefix='/api/v1')
 app.include_router(dish_router, prefix='/api/v1')
+app.include_router(internal_router, prefix='/api/v1')
+app.include_router(metrics_router)
 
 if __name__ == '__main__':
-    uvicorn.run('main:app', host='0.0.0.0', port=PORT or 8080, reload=True, workers=3)
+    reset_multiprocess_metrics()
+    # uvicorn configures only its own loggers; the app.* loggers share its console handler
+    log_config: dict = copy.deepcopy(uvicorn.config.LOGGING_CONFIG)
+    log_config['loggers']['app'] = {'handlers': ['default'], 'level': 'INFO', 'propagate': False}
+    uvicorn.run('main:app', host='0.0.0.0', port=PORT or 8080, reload=True, workers=WORKERS, log_config=log_config)
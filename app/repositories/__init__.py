@@ -1,4 +1,13 @@
+from repositories.orm_repositories.async_dish_repository import AsyncDishORMRepository
+from repositories.orm_repositories.async_menu_repository import AsyncMenuORMRepository
+from repositories.orm_repositories.async_submenu_repository import (
+    AsyncSubmenuORMRepository,
+)
+from repositories.orm_repositories.dish_repository import DishORMRepository
 from repositories.orm_repositories.menu_repository import MenuORMRepository
 from repositories.orm_repositories.submenu_repository import SubmenuORMRepository
-from repositories.orm_repositories.dish_repository import DishORMRepository
+from repositories.redis_repository.async_redis_cache_repository import (
+    AsyncRedisCacheRepository,
+)
 from repositories.redis_repository.redis_cache_repository import RedisCacheRepository
+from repositories.repository_factory import make_cache_repository, make_orm_repository
@@ -0,0 +1,94 @@
+import datetime
+import uuid
+
+from database.models import Dish, dishes_count_updates
+from repositories.orm_repositories.pagination import paginate
+from repositories.repositories_interface import IAsyncRepository
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncDishORMRepository(IAsyncRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_all(
+            self,
+            submenu_id: uuid.UUID,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[Dish]:
+        try:
+            return list(await self.session.scalars(
+                paginate(select(Dish).where(Dish.submenu_id == submenu_id), Dish, limit, after)
+            ))
+        except Exception as e:
+            print(e)
+            return []
+
+    async def get_by_id(self, dish_id: uuid.UUID) -> Dish | None:
+        try:
+            return await self.session.get(Dish, dish_id)
+        except Exception as e:
+            print(e)
+            return None
+
+    async def get_by_title(self, title: str) -> Dish | None:
+        try:
+            return await self.session.scalar(select(Dish).where(Dish.title == title))
+        except Exception as e:
+            print(e)
+            return None
+
+    async def create(self, data: dict, submenu_id: uuid.UUID) -> Dish | None:
+        try:
+            dish = Dish(**data, submenu_id=submenu_id)
+            self.session.add(dish)
+            await self.session.commit()
+            await self.session.refresh(dish)
+            return dish
+        except Exception as e:
+            print(e)
+            return None
+
+    async def create_many(self, data: list[dict], submenu_id: uuid.UUID) -> list[Row] | None:
+        try:
+            inserted_dishes = await self.session.execute(
+                insert(Dish)
+                .on_conflict_do_nothing(index_elements=[Dish.title])
+                .returning(Dish.id, Dish.title, Dish.description, Dish.price),
+                [dish | {'submenu_id': submenu_id} for dish in data]
+            )
+            dishes: list[Row] = inserted_dishes.all()
+            if dishes:
+                for statement in dishes_count_updates(submenu_id, len(dishes)):
+                    await self.session.execute(statement)
+            await self.session.commit()
+            return dishes
+        except Exception as e:
+            print(e)
+            return None
+
+    async def update(self, dish_id: uuid.UUID, data: dict) -> Dish | None:
+        try:
+            dish = await self.session.get(Dish, dish_id)
+            dish.title = data['title']
+            dish.description = data['description']
+            dish.price = data['price']
+            await self.session.commit()
+            await self.session.refresh(dish)
+            return dish
+        except Exception as e:
+            print(e)
+            return None
+
+    async def delete(self, dish_id: uuid.UUID) -> Dish | None:
+        try:
+            dish = await self.session.get(Dish, dish_id)
+            await self.session.delete(dish)
+            await self.session.commit()
+            return dish
+        except Exception as e:
+            print(e)
+            return None
@@ -0,0 +1,97 @@
+import datetime
+import uuid
+
+from database.models import Dish, Menu, Submenu
+from repositories.orm_repositories.menu_repository import build_path_query
+from repositories.orm_repositories.pagination import paginate
+from repositories.repositories_interface import IAsyncRepository
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+
+class AsyncMenuORMRepository(IAsyncRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_all(
+            self,
+            item_id: uuid.UUID | None,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[Menu]:
+        try:
+            return list(await self.session.scalars(paginate(select(Menu), Menu, limit, after)))
+        except Exception as e:
+            print(e)
+            return []
+
+    async def get_by_id(self, menu_id: uuid.UUID) -> Menu | None:
+        try:
+            return await self.session.get(Menu, menu_id)
+        except Exception as e:
+            print(e)
+            return None
+
+    async def get_tree(self) -> list[Menu]:
+        try:
+            menus = await self.session.scalars(
+                select(Menu).options(joinedload(Menu.submenus).joinedload(Submenu.dishes))
+            )
+            return list(menus.unique())
+        except Exception as e:
+            print(e)
+            return []
+
+    async def get_path(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID | None = None,
+            dish_id: uuid.UUID | None = None
+    ) -> tuple[Menu | None, Submenu | None, Dish | None]:
+        try:
+            path = await self.session.execute(build_path_query(menu_id, submenu_id, dish_id))
+            return path.first() or (None, None, None)
+        except Exception as e:
+            print(e)
+            return None, None, None
+
+    async def get_by_title(self, title: str) -> Menu | None:
+        try:
+            return await self.session.scalar(select(Menu).where(Menu.title == title))
+        except Exception as e:
+            print(e)
+            return None
+
+    async def create(self, data: dict, item_id: uuid.UUID | None) -> Menu | None:
+        try:
+            menu = Menu(**data)
+            self.session.add(menu)
+            await self.session.commit()
+            await self.session.refresh(menu)
+            return menu
+        except Exception as e:
+            print(e)
+            return None
+
+    async def update(self, menu_id: uuid.UUID, data: dict) -> Menu | None:
+        try:
+            menu = await self.session.get(Menu, menu_id)
+            menu.title = data['title']
+            menu.description = data['description']
+            await self.session.commit()
+            await self.session.refresh(menu)
+            return menu
+        except Exception as e:
+            print(e)
+            return None
+
+    async def delete(self, menu_id: uuid.UUID) -> Menu | None:
+        try:
+            menu = await self.session.get(Menu, menu_id)
+            await self.session.delete(menu)
+            await self.session.commit()
+            return menu
+        except Exception as e:
+            print(e)
+            return None
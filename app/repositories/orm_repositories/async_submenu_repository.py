@@ -0,0 +1,93 @@
+import datetime
+import uuid
+
+from database.models import Dish, Submenu, submenus_count_update
+from repositories.orm_repositories.pagination import paginate
+from repositories.repositories_interface import IAsyncRepository
+from sqlalchemy import Row, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncSubmenuORMRepository(IAsyncRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_all(
+            self,
+            menu_id: uuid.UUID,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[Submenu]:
+        try:
+            return list(await self.session.scalars(
+                paginate(select(Submenu).where(Submenu.menu_id == menu_id), Submenu, limit, after)
+            ))
+        except Exception as e:
+            print(e)
+            return []
+
+    async def get_by_id(self, submenu_id: uuid.UUID) -> Submenu | None:
+        try:
+            return await self.session.get(Submenu, submenu_id)
+        except Exception as e:
+            print(e)
+            return None
+
+    async def get_by_title(self, title: str) -> Submenu | None:
+        try:
+            return await self.session.scalar(select(Submenu).where(Submenu.title == title))
+        except Exception as e:
+            print(e)
+            return None
+
+    async def create(self, data: dict, menu_id: uuid.UUID) -> Submenu | None:
+        try:
+            submenu = Submenu(**data, menu_id=menu_id)
+            self.session.add(submenu)
+            await self.session.commit()
+            await self.session.refresh(submenu)
+            return submenu
+        except Exception as e:
+            print(e)
+            return None
+
+    async def create_many(self, data: list[dict], menu_id: uuid.UUID) -> list[Row] | None:
+        try:
+            inserted_submenus = await self.session.execute(
+                insert(Submenu)
+                .on_conflict_do_nothing(index_elements=[Submenu.title])
+                .returning(Submenu.id, Submenu.title, Submenu.description),
+                [submenu | {'menu_id': menu_id} for submenu in data]
+            )
+            submenus: list[Row] = inserted_submenus.all()
+            if submenus:
+                await self.session.execute(submenus_count_update(menu_id, len(submenus)))
+            await self.session.commit()
+            return submenus
+        except Exception as e:
+            print(e)
+            return None
+
+    async def update(self, submenu_id: uuid.UUID, data: dict) -> Submenu | None:
+        try:
+            submenu = await self.session.get(Submenu, submenu_id)
+            submenu.title = data['title']
+            submenu.description = data['description']
+            await self.session.commit()
+            await self.session.refresh(submenu)
+            return submenu
+        except Exception as e:
+            print(e)
+            return None
+
+    async def delete(self, submenu_id: uuid.UUID) -> Submenu | None:
+        try:
+            submenu = await self.session.get(Submenu, submenu_id)
+            await self.session.execute(delete(Dish).where(Dish.submenu_id == submenu_id))
+            await self.session.delete(submenu)
+            await self.session.commit()
+            return submenu
+        except Exception as e:
+            print(e)
+            return None
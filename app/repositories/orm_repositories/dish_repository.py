@@ -1,24 +1,34 @@
+import datetime
 import uuid
 
-from database.models import Dish
+from database.models import Dish, dishes_count_updates
+from repositories.orm_repositories.pagination import paginate
 from repositories.repositories_interface import IRepository
+from sqlalchemy import Row
+from sqlalchemy.dialects.postgresql import insert
 
 
 class DishORMRepository(IRepository):
     def __init__(self, session=None) -> None:
         self.session = session
 
-    def get_all(self, submenu_id: uuid.UUID) -> list[Dish]:
+    def get_all(
+            self,
+            submenu_id: uuid.UUID,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[Dish]:
         try:
-            return (self.session.query(Dish)
-                    .filter(Dish.submenu_id == submenu_id).all())
+            return paginate(
+                self.session.query(Dish).filter(Dish.submenu_id == submenu_id), Dish, limit, after
+            ).all()
         except Exception as e:
             print(e)
             return []
 
     def get_by_id(self, dish_id: uuid.UUID) -> Dish | None:
         try:
-            return self.session.query(Dish).filter(Dish.id == dish_id).first()
+            return self.session.get(Dish, dish_id)
         except Exception as e:
             print(e)
             return None
@@ -41,9 +51,26 @@ class DishORMRepository(IRepository):
             print(e)
             return None
 
+    def create_many(self, data: list[dict], submenu_id: uuid.UUID) -> list[Row] | None:
+        try:
+            dishes: list[Row] = self.session.execute(
+                insert(Dish)
+                .on_conflict_do_nothing(index_elements=[Dish.title])
+                .returning(Dish.id, Dish.title, Dish.description, Dish.price),
+                [dish | {'submenu_id': submenu_id} for dish in data]
+            ).all()
+            if dishes:
+                for statement in dishes_count_updates(submenu_id, len(dishes)):
+                    self.session.execute(statement)
+            self.session.commit()
+            return dishes
+        except Exception as e:
+            print(e)
+            return None
+
     def update(self, dish_id: uuid.UUID, data: dict) -> Dish | None:
         try:
-            dish = self.session.query(Dish).filter(Dish.id == dish_id).first()
+            dish = self.session.get(Dish, dish_id)
             dish.title = data['title']
             dish.description = data['description']
             dish.price = data['price']
@@ -56,7 +83,7 @@ class DishORMRepository(IRepository):
 
     def delete(self, dish_id: uuid.UUID) -> Dish | None:
         try:
-            dish = self.session.query(Dish).filter(Dish.id == dish_id).first()
+            dish = self.session.get(Dish, dish_id)
             self.session.delete(dish)
             self.session.commit()
             return dish
@@ -1,28 +1,80 @@
+import datetime
 import uuid
 
-from database.models import Menu
+from database.models import Dish, Menu, Submenu
+from repositories.orm_repositories.pagination import paginate
 from repositories.repositories_interface import IRepository
+from sqlalchemy import Select, and_, false, select
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
 
 
+def build_path_query(
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID | None,
+        dish_id: uuid.UUID | None
+) -> Select:
+    return (
+        select(Menu, Submenu, Dish)
+        .select_from(Menu)
+        .outerjoin(
+            Submenu,
+            and_(Submenu.id == submenu_id, Submenu.menu_id == Menu.id) if submenu_id else false()
+        )
+        .outerjoin(
+            Dish,
+            and_(Dish.id == dish_id, Dish.submenu_id == Submenu.id) if submenu_id and dish_id else false()
+        )
+        .where(Menu.id == menu_id)
+    )
+
+
 class MenuORMRepository(IRepository):
     def __init__(self, session: Session) -> None:
         self.session = session
 
-    def get_all(self, item_id: uuid.UUID | None) -> list[type[Menu]]:
+    def get_all(
+            self,
+            item_id: uuid.UUID | None,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[type[Menu]]:
         try:
-            return self.session.query(Menu).all()
+            return paginate(self.session.query(Menu), Menu, limit, after).all()
         except Exception as e:
             print(e)
             return []
 
     def get_by_id(self, menu_id: uuid.UUID) -> Menu | None:
         try:
-            return self.session.query(Menu).filter(Menu.id == menu_id).first()
+            return self.session.get(Menu, menu_id)
         except Exception as e:
             print(e)
             return None
 
+    def get_tree(self) -> list[Menu]:
+        try:
+            return list(
+                self.session.scalars(
+                    select(Menu).options(joinedload(Menu.submenus).joinedload(Submenu.dishes))
+                ).unique()
+            )
+        except Exception as e:
+            print(e)
+            return []
+
+    def get_path(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID | None = None,
+            dish_id: uuid.UUID | None = None
+    ) -> tuple[Menu | None, Submenu | None, Dish | None]:
+        try:
+            return self.session.execute(build_path_query(menu_id, submenu_id, dish_id)).first() or (None, None, None)
+        except Exception as e:
+            print(e)
+            return None, None, None
+
     def get_by_title(self, title: str) -> Menu | None:
         try:
             return self.session.query(Menu).filter(Menu.title == title).first()
@@ -43,7 +95,7 @@ class MenuORMRepository(IRepository):
 
     def update(self, menu_id: uuid.UUID, data: dict) -> Menu | None:
         try:
-            menu = self.session.query(Menu).filter(Menu.id == menu_id).first()
+            menu = self.session.get(Menu, menu_id)
             menu.title = data['title']
             menu.description = data['description']
             self.session.commit()
@@ -55,7 +107,7 @@ class MenuORMRepository(IRepository):
 
     def delete(self, menu_id: uuid.UUID) -> Menu | None:
         try:
-            menu = self.session.query(Menu).filter(Menu.id == menu_id).first()
+            menu = self.session.get(Menu, menu_id)
             self.session.delete(menu)
             self.session.commit()
             return menu
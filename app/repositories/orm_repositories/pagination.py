@@ -0,0 +1,18 @@
+import datetime
+import uuid
+
+from database.models import Dish, Menu, Submenu
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Query
+
+
+def paginate(
+        query: Query | Select,
+        model: type[Menu] | type[Submenu] | type[Dish],
+        limit: int | None,
+        after: tuple[datetime.datetime, uuid.UUID] | None
+) -> Query | Select:
+    if after:
+        query = query.where(tuple_(model.created_at, model.id) > after)
+    query = query.order_by(model.created_at, model.id)
+    return query.limit(limit) if limit else query
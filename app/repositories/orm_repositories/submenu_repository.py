@@ -1,25 +1,34 @@
+import datetime
 import uuid
 
-from database.models import Submenu
+from database.models import Dish, Submenu, submenus_count_update
+from repositories.orm_repositories.pagination import paginate
 from repositories.repositories_interface import IRepository
+from sqlalchemy import Row, delete
+from sqlalchemy.dialects.postgresql import insert
 
 
 class SubmenuORMRepository(IRepository):
     def __init__(self, session=None) -> None:
         self.session = session
 
-    def get_all(self, menu_id: uuid.UUID) -> list[Submenu]:
+    def get_all(
+            self,
+            menu_id: uuid.UUID,
+            limit: int | None = None,
+            after: tuple[datetime.datetime, uuid.UUID] | None = None
+    ) -> list[Submenu]:
         try:
-            return (self.session.query(Submenu)
-                    .filter(Submenu.menu_id == menu_id).all())
+            return paginate(
+                self.session.query(Submenu).filter(Submenu.menu_id == menu_id), Submenu, limit, after
+            ).all()
         except Exception as e:
             print(e)
             return []
 
     def get_by_id(self, submenu_id: uuid.UUID) -> Submenu | None:
         try:
-            return (self.session.query(Submenu).
-                    filter(Submenu.id == submenu_id).first())
+            return self.session.get(Submenu, submenu_id)
         except Exception as e:
             print(e)
             return None
@@ -43,10 +52,25 @@ class SubmenuORMRepository(IRepository):
             print(e)
             return None
 
+    def create_many(self, data: list[dict], menu_id: uuid.UUID) -> list[Row] | None:
+        try:
+            submenus: list[Row] = self.session.execute(
+                insert(Submenu)
+                .on_conflict_do_nothing(index_elements=[Submenu.title])
+                .returning(Submenu.id, Submenu.title, Submenu.description),
+                [submenu | {'menu_id': menu_id} for submenu in data]
+            ).all()
+            if submenus:
+                self.session.execute(submenus_count_update(menu_id, len(submenus)))
+            self.session.commit()
+            return submenus
+        except Exception as e:
+            print(e)
+            return None
+
     def update(self, submenu_id: uuid.UUID, data: dict) -> Submenu | None:
         try:
-            submenu = (self.session.query(Submenu).
-                       filter(Submenu.id == submenu_id).first())
+            submenu = self.session.get(Submenu, submenu_id)
             submenu.title = data['title']
             submenu.description = data['description']
             self.session.commit()
@@ -58,12 +82,8 @@ class SubmenuORMRepository(IRepository):
 
     def delete(self, submenu_id: uuid.UUID) -> Submenu | None:
         try:
-            submenu = (self.session.query(Submenu).
-                       filter(Submenu.id == submenu_id).first())
-
-            for dish in submenu.dishes:
-                self.session.delete(dish)
-
+            submenu = self.session.get(Submenu, submenu_id)
+            self.session.execute(delete(Dish).where(Dish.submenu_id == submenu_id))
             self.session.delete(submenu)
             self.session.commit()
             return submenu
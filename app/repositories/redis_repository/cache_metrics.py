@@ -0,0 +1,105 @@
+import functools
+import inspect
+import time
+from typing import Callable
+
+import redis
+from prometheus_client import Counter, Histogram
+from repositories.redis_repository.tags import GENERATION_PREFIX, TAG_PREFIX
+
+# label values of the key prefix, 'menu_tree' before 'menu_' since it shares the prefix
+KEY_PREFIXES: tuple[str, ...] = (
+    'menu_tree', 'menu_', 'submenu_', 'dish_', 'list:', 'lock:', TAG_PREFIX, GENERATION_PREFIX
+)
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0
+)
+
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total',
+    'Cache lookups by tier, key prefix and result',
+    ['tier', 'prefix', 'result']
+)
+CACHE_BYTES = Counter(
+    'cache_bytes_total',
+    'Encoded bytes read from and written to Redis by key prefix',
+    ['prefix', 'direction']
+)
+CACHE_ERRORS = Counter(
+    'cache_errors_total',
+    'Redis errors raised by cache repository operations',
+    ['operation', 'prefix']
+)
+CACHE_DURATION = Histogram(
+    'cache_operation_duration_seconds',
+    'Duration of cache repository operations that reach Redis',
+    ['operation'],
+    buckets=DURATION_BUCKETS
+)
+
+
+def key_prefix(key: str) -> str:
+    for prefix in KEY_PREFIXES:
+        if key.startswith(prefix):
+            return prefix
+    return 'other'
+
+
+@functools.lru_cache(maxsize=None)
+def lookup_counter(tier: str, prefix: str, result: str) -> Counter:
+    # labels() validates and locks on every call; the few label combinations are resolved once
+    return CACHE_LOOKUPS.labels(tier, prefix, result)
+
+
+@functools.lru_cache(maxsize=None)
+def _bytes_counter(prefix: str, direction: str) -> Counter:
+    return CACHE_BYTES.labels(prefix, direction)
+
+
+def count_bytes(direction: str, key: str, payload: bytes) -> None:
+    _bytes_counter(key_prefix(key), direction).inc(len(payload))
+
+
+def _first_key(args: tuple) -> str:
+    if not args:
+        return ''
+    keys = args[0]
+    if isinstance(keys, str):
+        return keys
+    return next(iter(keys), '') if isinstance(keys, (list, tuple, dict)) else ''
+
+
+def observe_cache(operation: str) -> Callable:
+    """Times a cache repository method and counts the Redis errors it raises, by its first key."""
+
+    def decorator(method: Callable) -> Callable:
+        duration: Histogram = CACHE_DURATION.labels(operation)
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def observed_async(self, *args, **kwargs):
+                started: float = time.perf_counter()
+                try:
+                    return await method(self, *args, **kwargs)
+                except redis.RedisError:
+                    CACHE_ERRORS.labels(operation, key_prefix(_first_key(args))).inc()
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - started)
+
+            return observed_async
+
+        @functools.wraps(method)
+        def observed(self, *args, **kwargs):
+            started: float = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            except redis.RedisError:
+                CACHE_ERRORS.labels(operation, key_prefix(_first_key(args))).inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started)
+
+        return observed
+
+    return decorator
@@ -0,0 +1,98 @@
+import pickle
+import struct
+from abc import ABC, abstractmethod
+
+import orjson
+from config import CACHE_CODEC, CACHE_SCHEMA_VERSION
+
+try:
+    import msgpack
+except ImportError:  # optional, only required for CACHE_CODEC=msgpack
+    msgpack = None
+
+# codec id and schema version in front of every entry
+HEADER: struct.Struct = struct.Struct('!BH')
+
+
+class Codec(ABC):
+    codec_id: int
+    name: str
+
+    @abstractmethod
+    def encode(self, value: object) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, payload: bytes | memoryview) -> object:
+        raise NotImplementedError
+
+
+class OrjsonCodec(Codec):
+    codec_id: int = 1
+    name: str = 'orjson'
+
+    def encode(self, value: object) -> bytes:
+        # asyncpg returns its own uuid.UUID subclass, which orjson does not serialize natively
+        return orjson.dumps(value, default=str)
+
+    def decode(self, payload: bytes | memoryview) -> object:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec(Codec):
+    codec_id: int = 2
+    name: str = 'msgpack'
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError('CACHE_CODEC=msgpack requires the msgpack package')
+
+    def encode(self, value: object) -> bytes:
+        return msgpack.packb(value, default=str)
+
+    def decode(self, payload: bytes | memoryview) -> object:
+        return msgpack.unpackb(payload)
+
+
+class PickleCodec(Codec):
+    codec_id: int = 3
+    name: str = 'pickle'
+
+    def encode(self, value: object) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload: bytes | memoryview) -> object:
+        return pickle.loads(payload)
+
+
+CODECS: dict[str, type[Codec]] = {codec.name: codec for codec in (OrjsonCodec, MsgpackCodec, PickleCodec)}
+
+
+class VersionedCodec:
+    """Frames entries with the codec id and schema version.
+
+    Entries written by another codec or an older schema version decode to
+    None, so callers treat them as cache misses and overwrite them.
+    """
+
+    def __init__(self, codec: Codec, version: int = CACHE_SCHEMA_VERSION) -> None:
+        self.codec = codec
+        self.version = version
+        self._header: bytes = HEADER.pack(codec.codec_id, version)
+
+    def dumps(self, value: object) -> bytes:
+        return self._header + self.codec.encode(value)
+
+    def loads(self, entry: bytes) -> object | None:
+        if not entry.startswith(self._header):
+            return None
+        return self.codec.decode(memoryview(entry)[HEADER.size:])
+
+
+def get_codec(name: str = CACHE_CODEC, version: int = CACHE_SCHEMA_VERSION) -> VersionedCodec:
+    if name not in CODECS:
+        raise ValueError(f'unknown cache codec {name!r}, expected one of {", ".join(CODECS)}')
+    return VersionedCodec(CODECS[name](), version)
+
+
+cache_codec: VersionedCodec = get_codec()
@@ -0,0 +1,59 @@
+import random
+
+from config import (
+    CACHE_SLIDING_TTL,
+    CACHE_TTL_DEFAULT,
+    CACHE_TTL_DISH,
+    CACHE_TTL_JITTER,
+    CACHE_TTL_LIST,
+    CACHE_TTL_MENU,
+    CACHE_TTL_SUBMENU,
+    CACHE_TTL_TREE,
+)
+
+# matched in order, so the exact 'menu_tree' key wins over the 'menu_' prefix
+CACHE_TTLS: dict[str, int] = {
+    'menu_tree': CACHE_TTL_TREE,
+    'list:': CACHE_TTL_LIST,
+    'menu_': CACHE_TTL_MENU,
+    'submenu_': CACHE_TTL_SUBMENU,
+    'dish_': CACHE_TTL_DISH,
+}
+
+
+class ExpirationPolicy:
+    def __init__(
+            self,
+            ttls: dict[str, int],
+            default_ttl: int = CACHE_TTL_DEFAULT,
+            jitter: float = CACHE_TTL_JITTER,
+            sliding: bool = CACHE_SLIDING_TTL
+    ) -> None:
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.jitter = jitter
+        self.sliding = sliding
+
+    def ttl(self, key: str) -> int | None:
+        base_ttl: int = next(
+            (ttl for prefix, ttl in self.ttls.items() if key.startswith(prefix)),
+            self.default_ttl
+        )
+        if base_ttl <= 0:
+            return None
+        return max(1, round(base_ttl * random.uniform(1 - self.jitter, 1 + self.jitter)))
+
+    @property
+    def max_ttl(self) -> int | None:
+        """Upper bound of every TTL handed out, None if some entries never expire.
+
+        Tag sets get this TTL on every write, so they outlive all their members.
+        With sliding expiration a read can extend an entry indefinitely, hence None.
+        """
+        base_ttls: list[int] = [*self.ttls.values(), self.default_ttl]
+        if self.sliding or min(base_ttls) <= 0:
+            return None
+        return max(1, round(max(base_ttls) * (1 + self.jitter)))
+
+
+cache_expiration: ExpirationPolicy = ExpirationPolicy(CACHE_TTLS)
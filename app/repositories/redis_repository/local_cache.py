@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from config import CACHE_INVALIDATION_CHANNEL, CACHE_LOCAL_MAX_SIZE, CACHE_LOCAL_TTL
+from repositories.redis_repository.cache_metrics import key_prefix, lookup_counter
+
+
+class CacheStatistics:
+    """Hit and miss counters per cache tier.
+
+    The counters of this worker back /internal/cache; every lookup is also
+    counted in cache_lookups_total by key prefix for /metrics.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, hits: int, misses: int, prefix: str = 'other') -> None:
+        if hits:
+            lookup_counter(tier, prefix, 'hit').inc(hits)
+        if misses:
+            lookup_counter(tier, prefix, 'miss').inc(misses)
+        with self._lock:
+            counters: dict[str, int] = self._counters.setdefault(tier, {'hits': 0, 'misses': 0})
+            counters['hits'] += hits
+            counters['misses'] += misses
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                tier: counters | {
+                    'hit_ratio': round(counters['hits'] / max(counters['hits'] + counters['misses'], 1), 4)
+                }
+                for tier, counters in self._counters.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class LocalCache:
+    """Bounded LRU of decoded cache entries, private to the worker process.
+
+    Entries are handed out as is, so callers must not mutate them. Every
+    invalidation bumps ``generation``; a value read from Redis is only
+    stored when no invalidation happened since the read started, so a
+    concurrent delete cannot be overwritten by the value it replaced.
+    Entries remember the ``version`` they were read under, and a read
+    asking for another version misses even before the invalidation
+    message of the write that changed the version has arrived.
+    """
+
+    def __init__(
+            self,
+            max_size: int = CACHE_LOCAL_MAX_SIZE,
+            ttl: float = CACHE_LOCAL_TTL,
+            statistics: CacheStatistics | None = None
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.statistics = statistics or CacheStatistics()
+        self.generation: int = 0
+        self._entries: OrderedDict[str, tuple[float, str | None, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, version: str | None = None) -> object | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry: tuple[float, str | None, object] | None = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None and version is not None and entry[1] != version:
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        self.statistics.record('local', entry is not None, entry is None, key_prefix(key))
+        return entry[2] if entry is not None else None
+
+    def set(self, key: str, value: object, generation: int | None = None, version: str | None = None) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def report(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+        }
+
+
+class InvalidationSubscriber:
+    """Drops keys deleted by any worker from the local cache of this one.
+
+    Listens on CACHE_INVALIDATION_CHANNEL in a daemon thread. Messages sent
+    while the subscription is down are lost, so the local cache is cleared
+    whenever the connection fails.
+    """
+
+    def __init__(
+            self,
+            redis_client: redis.Redis,
+            local: LocalCache,
+            channel: str = CACHE_INVALIDATION_CHANNEL
+    ) -> None:
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        self._local = local
+        self._channel = channel
+        self._thread = None
+
+    def start(self) -> None:
+        self._pubsub.subscribe(**{self._channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(
+            sleep_time=1,
+            daemon=True,
+            exception_handler=self._on_error
+        )
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._pubsub.close()
+
+    def _on_message(self, message: dict) -> None:
+        # one message per invalidation, carrying the space separated keys
+        self._local.invalidate(*message['data'].decode().split())
+
+    def _on_error(self, exception: Exception, pubsub: redis.client.PubSub, thread: threading.Thread) -> None:
+        print(exception)
+        self._local.clear()
+        time.sleep(1)
+
+
+cache_statistics: CacheStatistics = CacheStatistics()
+local_cache: LocalCache = LocalCache(statistics=cache_statistics)
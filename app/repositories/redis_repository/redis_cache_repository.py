@@ -1,19 +1,218 @@
-import pickle
+import secrets
 
 import redis
+from config import CACHE_INVALIDATION_CHANNEL, CACHE_LOCK_TIMEOUT, CACHE_WRITE_THROUGH
+from repositories.redis_repository.cache_metrics import (
+    count_bytes,
+    key_prefix,
+    observe_cache,
+)
+from repositories.redis_repository.codecs import VersionedCodec, cache_codec
+from repositories.redis_repository.expiration import ExpirationPolicy, cache_expiration
+from repositories.redis_repository.local_cache import LocalCache, local_cache
+from repositories.redis_repository.tags import (
+    EPOCH_KEY,
+    add_tags,
+    generation_key,
+    tag_key,
+)
 
 
 class RedisCacheRepository:
-    def __init__(self, redis_client: redis.Redis) -> None:
+    def __init__(
+            self,
+            redis_client: redis.Redis,
+            codec: VersionedCodec = cache_codec,
+            expiration: ExpirationPolicy = cache_expiration,
+            local: LocalCache = local_cache
+    ) -> None:
         self._redis_client = redis_client
+        self._codec = codec
+        self._expiration = expiration
+        self._local = local
 
-    def set(self, key: str, value: object) -> None:
-        self._redis_client.set(key, pickle.dumps(value))
+    @observe_cache('set')
+    def set(self, key: str, value: object, tags: tuple[str, ...] = (), version: str | None = None) -> None:
+        payload: bytes = self._codec.dumps(value)
+        count_bytes('write', key, payload)
+        with self._redis_client.pipeline(transaction=False) as pipeline:
+            pipeline.set(key, payload, ex=self._expiration.ttl(key))
+            add_tags(pipeline, [key], tags, self._expiration.max_ttl)
+            pipeline.execute()
+        self._local.set(key, value, version=version)
 
-    def get(self, key: str) -> object | None:
-        if (cached_value := self._redis_client.get(key)) is not None:
-            return pickle.loads(cached_value)
-        return None
+    def get(self, key: str, version: str | None = None) -> object | None:
+        if (value := self._local.get(key, version)) is not None:
+            return value
+        return self._read(key, version)
+
+    @observe_cache('get')
+    def _read(self, key: str, version: str | None) -> object | None:
+        generation: int = self._local.generation
+        if self._expiration.sliding:
+            cached_value: bytes | None = self._redis_client.getex(key, ex=self._expiration.ttl(key))
+        else:
+            cached_value = self._redis_client.get(key)
+
+        if cached_value is not None:
+            count_bytes('read', key, cached_value)
+        value: object | None = self._codec.loads(cached_value) if cached_value is not None else None
+        self._local.statistics.record('redis', value is not None, value is None, key_prefix(key))
+        if value is not None:
+            self._local.set(key, value, generation, version)
+        return value
+
+    @observe_cache('set_many')
+    def set_many(self, values: dict[str, object], tags: tuple[str, ...] = ()) -> None:
+        if not values:
+            return
+        with self._redis_client.pipeline(transaction=False) as pipeline:
+            for key, value in values.items():
+                payload: bytes = self._codec.dumps(value)
+                count_bytes('write', key, payload)
+                pipeline.set(key, payload, ex=self._expiration.ttl(key))
+            add_tags(pipeline, list(values), tags, self._expiration.max_ttl)
+            pipeline.execute()
+        for key, value in values.items():
+            self._local.set(key, value)
+
+    @observe_cache('set_tagged')
+    def set_tagged(self, entries: list[tuple[str, object, tuple[str, ...]]]) -> None:
+        """Writes (key, value, tags) entries to Redis in one pipeline, bypassing the local tier."""
+        if not entries:
+            return
+        with self._redis_client.pipeline(transaction=False) as pipeline:
+            for key, value, tags in entries:
+                payload: bytes = self._codec.dumps(value)
+                count_bytes('write', key, payload)
+                pipeline.set(key, payload, ex=self._expiration.ttl(key))
+                add_tags(pipeline, [key], tags, self._expiration.max_ttl)
+            pipeline.execute()
+
+    @observe_cache('acquire_lock')
+    def acquire_lock(self, key: str) -> bool:
+        return bool(self._redis_client.set(f'lock:{key}', 1, nx=True, px=int(CACHE_LOCK_TIMEOUT * 1000)))
+
+    @observe_cache('release_lock')
+    def release_lock(self, key: str) -> None:
+        # a holder that outlived CACHE_LOCK_TIMEOUT may drop the lock of the next one,
+        # which at worst lets one more request rebuild the key
+        self._redis_client.delete(f'lock:{key}')
 
     def delete(self, key: str) -> None:
-        self._redis_client.delete(key)
+        self.invalidate([key])
+
+    @observe_cache('get_version')
+    def get_version(self, *names: str) -> str:
+        """Joins the generations of ``names`` behind the epoch of the counters.
+
+        The epoch is drawn again whenever the counters were lost with a flush or
+        restart, so restarted counters never repeat a version handed out before.
+        """
+        epoch: bytes | None
+        generations: list[bytes | None]
+        epoch, *generations = self._redis_client.mget([EPOCH_KEY, *(generation_key(name) for name in names)])
+        if epoch is None:
+            self._redis_client.set(EPOCH_KEY, secrets.token_hex(4), nx=True)
+            epoch = self._redis_client.get(EPOCH_KEY)
+        return '-'.join([epoch.decode(), *(str(int(generation or 0)) for generation in generations)])
+
+    @observe_cache('invalidate')
+    def invalidate(
+            self,
+            keys: list[str],
+            tags: tuple[str, ...] = (),
+            generations: tuple[str, ...] = ()
+    ) -> None:
+        """Deletes ``keys`` and every key tagged with ``tags`` in two round trips.
+
+        The tag sets are read and dropped in one transaction, so keys tagged
+        afterwards land in a fresh set instead of being lost. ``generations``
+        are incremented, which orphans every list entry built from them.
+        """
+        tagged: list[str] = []
+        retired_generations: list[str] = []
+        if tags:
+            with self._redis_client.pipeline(transaction=True) as pipeline:
+                for tag in tags:
+                    pipeline.smembers(tag_key(tag))
+                pipeline.delete(*[tag_key(tag) for tag in tags])
+                tagged_keys: list[set[bytes]] = pipeline.execute()[:-1]
+            tagged = [key.decode() for members in tagged_keys for key in members]
+            tagged = [key for key in dict.fromkeys(tagged) if key not in keys]
+            keys = [*dict.fromkeys(keys), *tagged]
+            # tags are only invalidated when their parents are deleted, so the generations of the
+            # parents and their children are no longer needed once the last list entry expired;
+            # the explicit keys may be live parents, whose counters must never restart
+            retired_generations = list(dict.fromkeys([*tags, *tagged]))
+
+        with self._redis_client.pipeline(transaction=False) as pipeline:
+            # tagged keys may be tags themselves, e.g. submenu_{id} of a deleted menu; the tag sets
+            # of the explicit keys stay, since those are live parents of a created or deleted child
+            pipeline.unlink(*keys, *[tag_key(key) for key in tagged])
+            for name in generations:
+                pipeline.incr(generation_key(name))
+            if (generation_ttl := self._expiration.max_ttl) is not None:
+                for name in retired_generations:
+                    pipeline.expire(generation_key(name), generation_ttl)
+            pipeline.publish(CACHE_INVALIDATION_CHANNEL, ' '.join(keys))
+            pipeline.execute()
+        self._local.invalidate(*keys)
+
+    @observe_cache('write_through')
+    def write_through(
+            self,
+            values: dict[str, object],
+            tags: tuple[str, ...] = (),
+            counters: dict[str, dict[str, int]] | None = None,
+            keys: list[str] | None = None,
+            generations: tuple[str, ...] = ()
+    ) -> None:
+        """Stores the ``values`` of a write and adds ``counters`` to the cached entries of its parents.
+
+        ``keys`` are deleted and ``generations`` incremented in the same transaction,
+        so no reader sees a new generation next to an old entry. The parents are
+        watched and the transaction is retried when another client changed them in
+        between; parents that are not cached are left to the next read. Without
+        CACHE_WRITE_THROUGH all of them are invalidated instead.
+        """
+        counters = counters or {}
+        keys = keys or []
+        if not CACHE_WRITE_THROUGH:
+            self.invalidate([*values, *counters, *keys], generations=generations)
+            return
+
+        written_keys: list[str] = [*values, *counters, *keys]
+        with self._redis_client.pipeline(transaction=True) as pipeline:
+            while True:
+                try:
+                    cached_parents: list[bytes | None] = []
+                    if counters:
+                        pipeline.watch(*counters)
+                        cached_parents = pipeline.mget(list(counters))
+                    pipeline.multi()
+                    for key, cached_parent in zip(counters, cached_parents):
+                        parent: dict | None = self._codec.loads(cached_parent) if cached_parent is not None else None
+                        if parent is None:
+                            continue
+                        for field, delta in counters[key].items():
+                            parent[field] += delta
+                        pipeline.set(key, self._codec.dumps(parent), keepttl=True)
+                    for key, value in values.items():
+                        payload: bytes = self._codec.dumps(value)
+                        count_bytes('write', key, payload)
+                        pipeline.set(key, payload, ex=self._expiration.ttl(key))
+                    add_tags(pipeline, list(values), tags, self._expiration.max_ttl)
+                    if keys:
+                        pipeline.unlink(*keys)
+                    for name in generations:
+                        pipeline.incr(generation_key(name))
+                    pipeline.publish(CACHE_INVALIDATION_CHANNEL, ' '.join(written_keys))
+                    pipeline.execute()
+                    break
+                except redis.WatchError:
+                    continue
+
+        self._local.invalidate(*written_keys)
+        for key, value in values.items():
+            self._local.set(key, value)
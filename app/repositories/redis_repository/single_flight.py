@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from config import CACHE_LOCK_MAX_WAIT, CACHE_LOCK_POLL_INTERVAL
+
+stampede_counters: dict[str, int] = {
+    'rebuilds': 0,
+    'waits': 0,
+    'served_after_wait': 0,
+    'wait_timeouts': 0,
+}
+
+
+async def load_once(
+        cache_repository: Any,
+        key: str,
+        load: Callable[[], Awaitable[object | None]],
+        tags: tuple[str, ...] = (),
+        version: str | None = None
+) -> object | None:
+    """Returns the cached value of ``key``, rebuilding it in one request at a time.
+
+    On a miss the request holding lock:{key} calls ``load`` and caches the
+    result, the others poll the key until it appears. A waiter gives up
+    after CACHE_LOCK_MAX_WAIT and calls ``load`` itself, so a slow or
+    crashed lock holder delays requests but never fails them. ``version``
+    is handed to the cache repository, see LocalCache.
+    """
+    if (value := await cache_repository.get(key, version)) is not None:
+        return value
+
+    deadline: float = time.monotonic() + CACHE_LOCK_MAX_WAIT
+    waited: bool = False
+    while not await cache_repository.acquire_lock(key):
+        if not waited:
+            waited = True
+            stampede_counters['waits'] += 1
+        if time.monotonic() >= deadline:
+            stampede_counters['wait_timeouts'] += 1
+            return await load()
+
+        await asyncio.sleep(CACHE_LOCK_POLL_INTERVAL)
+        if (value := await cache_repository.get(key, version)) is not None:
+            stampede_counters['served_after_wait'] += 1
+            return value
+
+    try:
+        # the previous holder may have stored the value between our last poll and the lock
+        if (value := await cache_repository.get(key, version)) is not None:
+            return value
+
+        stampede_counters['rebuilds'] += 1
+        value = await load()
+        if value is not None:
+            await cache_repository.set(key, value, tags=tags, version=version)
+        return value
+    finally:
+        await cache_repository.release_lock(key)
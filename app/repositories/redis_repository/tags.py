@@ -0,0 +1,25 @@
+from redis.asyncio.client import Pipeline as AsyncPipeline
+from redis.client import Pipeline
+
+# cache keys are tagged with the cache keys of their parents, e.g. dish_{id} with menu_{id} and submenu_{id}
+TAG_PREFIX: str = 'tag:'
+# list entries embed the generation of their parent (menus, menu_{id} or submenu_{id}), bumped by every write
+GENERATION_PREFIX: str = 'gen:'
+# random token stored next to the generations, replaced when they are lost
+EPOCH_KEY: str = f'{GENERATION_PREFIX}epoch'
+
+
+def tag_key(tag: str) -> str:
+    return f'{TAG_PREFIX}{tag}'
+
+
+def generation_key(name: str) -> str:
+    return f'{GENERATION_PREFIX}{name}'
+
+
+def add_tags(pipeline: Pipeline | AsyncPipeline, keys: list[str], tags: tuple[str, ...], ttl: int | None) -> None:
+    """Queues the SADD (and EXPIRE) commands recording ``keys`` under every tag."""
+    for tag in tags:
+        pipeline.sadd(tag_key(tag), *keys)
+        if ttl is not None:
+            pipeline.expire(tag_key(tag), ttl)
@@ -22,3 +22,25 @@ class IRepository(ABC):
     @abstractmethod
     def delete(self, item_id: uuid.UUID) -> dict:
         raise NotImplementedError
+
+
+class IAsyncRepository(ABC):
+    @abstractmethod
+    async def get_all(self, item_id: uuid.UUID | None) -> list[dict] | dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, item_id: uuid.UUID) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, data: dict, item_id: uuid.UUID | None) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, item_id: uuid.UUID | None, data: dict) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, item_id: uuid.UUID) -> dict:
+        raise NotImplementedError
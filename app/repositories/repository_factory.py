@@ -0,0 +1,94 @@
+import inspect
+import time
+from typing import Any, Callable
+
+import redis
+from database.query_metrics import DB_REPOSITORY_DURATION, repository_method
+from dependencies.profiling import active_profile
+from redis import asyncio as aioredis
+from repositories.redis_repository.async_redis_cache_repository import (
+    AsyncRedisCacheRepository,
+)
+from repositories.redis_repository.redis_cache_repository import RedisCacheRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+
+class ThreadpoolRepository:
+    """Awaitable facade over a blocking repository.
+
+    Every method call is run on the Starlette threadpool, so the async
+    services can drive the psycopg2 / sync redis repositories unchanged.
+    """
+
+    def __init__(self, repository: object) -> None:
+        self._repository = repository
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repository, name)
+        if not callable(attribute):
+            return attribute
+
+        async def run_blocking(*args, **kwargs) -> Any:
+            if (profile := active_profile.get()) is not None:
+                return await run_in_threadpool(profile.runcall, attribute, *args, **kwargs)
+            return await run_in_threadpool(attribute, *args, **kwargs)
+
+        return run_blocking
+
+
+class InstrumentedRepository:
+    """Times every method call of an ORM repository.
+
+    The call is recorded in DB_REPOSITORY_DURATION, and the SQL statements it
+    runs are labelled with the repository and method in DB_QUERY_DURATION.
+    """
+
+    def __init__(self, repository: object) -> None:
+        self._repository = repository
+        self._name: str = type(repository).__name__
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repository, name)
+        if not callable(attribute):
+            return attribute
+
+        if inspect.iscoroutinefunction(attribute):
+            async def run_observed_async(*args, **kwargs) -> Any:
+                token = repository_method.set((self._name, name))
+                started: float = time.perf_counter()
+                try:
+                    return await attribute(*args, **kwargs)
+                finally:
+                    DB_REPOSITORY_DURATION.labels(self._name, name).observe(time.perf_counter() - started)
+                    repository_method.reset(token)
+
+            return run_observed_async
+
+        def run_observed(*args, **kwargs) -> Any:
+            token = repository_method.set((self._name, name))
+            started: float = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                DB_REPOSITORY_DURATION.labels(self._name, name).observe(time.perf_counter() - started)
+                repository_method.reset(token)
+
+        return run_observed
+
+
+def make_orm_repository(
+        session: AsyncSession | Session,
+        repository: Callable,
+        async_repository: Callable
+) -> Any:
+    if isinstance(session, AsyncSession):
+        return InstrumentedRepository(async_repository(session))
+    return ThreadpoolRepository(InstrumentedRepository(repository(session)))
+
+
+def make_cache_repository(redis_client: aioredis.Redis | redis.Redis) -> Any:
+    if isinstance(redis_client, aioredis.Redis):
+        return AsyncRedisCacheRepository(redis_client)
+    return ThreadpoolRepository(RedisCacheRepository(redis_client))
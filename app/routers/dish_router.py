@@ -1,14 +1,15 @@
 import uuid
 
-from database.db import get_session
+from database.db import DBSession, get_db_session
 from database.models import Dish
-from dependencies.redis import cache
-from fastapi import APIRouter, Depends, HTTPException
-from schemas.dish_schemas import DishScheme, DishSchemeCreate
+from dependencies.etag import is_not_modified, make_etag, not_modified, set_etag
+from dependencies.pagination import Page, pagination, set_next_cursor
+from dependencies.path_resolver import PathResolver, ResolvedPath
+from dependencies.redis import RedisClient, cache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from schemas.dish_schemas import DishBulkScheme, DishScheme, DishSchemeCreate
 from services.dish_service import DishService
-from services.menu_service import MenuService
 from services.submenu_service import SubmenuService
-from sqlalchemy.orm import Session
 
 dish_router = APIRouter(prefix='/menus', tags=['Dish'])
 
@@ -20,26 +21,44 @@ dish_router = APIRouter(prefix='/menus', tags=['Dish'])
     name='create_dish',
     status_code=201,
 )
-def create_dish(
+async def create_dish(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
         dish: DishSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Dish:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
-    submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists(submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
+    await PathResolver(session).require(menu_id, submenu_id)
 
     dish_service = DishService(session, redis_client)
-    if dish_service.is_dish_exists(dish.title):
+    if await dish_service.is_dish_exists(dish.title):
         raise HTTPException(status_code=400, detail='dish exists')
 
-    return dish_service.create_dish(submenu_id, dish.model_dump())
+    return await dish_service.create_dish(menu_id, submenu_id, dish.model_dump())
+
+
+@dish_router.post(
+    '/{menu_id}/submenus/{submenu_id}/dishes/bulk',
+    response_model=DishBulkScheme,
+    responses={400: {'detail': 'dishes not created'}, 404: {'detail': 'menu or submenu not found'}},
+    name='create_dishes',
+    status_code=201,
+)
+async def create_dishes(
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        dishes: list[DishSchemeCreate],
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> DishBulkScheme:
+    await PathResolver(session).require(menu_id, submenu_id)
+
+    dish_service = DishService(session, redis_client)
+    created_dishes = await dish_service.create_dishes(menu_id, submenu_id, [dish.model_dump() for dish in dishes])
+    if created_dishes is None:
+        raise HTTPException(status_code=400, detail='dishes not created')
+
+    return created_dishes
 
 
 @dish_router.get(
@@ -49,26 +68,27 @@ def create_dish(
     name='read_dish',
     status_code=200,
 )
-def read_dish(
+async def read_dish(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
         dish_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> DishScheme:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
-    submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
-
+        request: Request,
+        response: Response,
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> DishScheme | Response:
     dish_service = DishService(session, redis_client)
-    if not dish_service.is_dish_exists_in_submenu(submenu_id, dish_id):
-        raise HTTPException(status_code=404, detail='dish not found')
+    version: str = await dish_service.get_dishes_version(menu_id, submenu_id)
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    if not (dish := await dish_service.get_cached_dish(menu_id, submenu_id, dish_id, version)):
+        path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id, dish_id)
+        dish = await dish_service.get_dish(menu_id, path.dish, version)
 
-    return dish_service.get_dish_by_id(dish_id)
+    set_etag(response, etag)
+    return dish
 
 
 @dish_router.get(
@@ -78,23 +98,35 @@ def read_dish(
     name='read_dishes',
     status_code=200
 )
-def read_dishes(
+async def read_dishes(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> list[DishScheme]:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
-    submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        # raise HTTPException(status_code=404, detail="submenu not found")
-        return []
-
+        request: Request,
+        response: Response,
+        page: Page = Depends(pagination),
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> list[DishScheme] | Response:
     dish_service = DishService(session, redis_client)
-    return dish_service.get_all_dishes(submenu_id)
+    version: str = await dish_service.get_dishes_version(menu_id, submenu_id)
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # the cached submenu entry answers whether the submenu belongs to the menu
+    if not await SubmenuService(session, redis_client).get_submenu_by_id(menu_id, submenu_id):
+        path: ResolvedPath = await PathResolver(session).resolve(menu_id, submenu_id)
+        if not path.menu:
+            raise HTTPException(status_code=404, detail='menu not found')
+
+        if not path.submenu:
+            # raise HTTPException(status_code=404, detail="submenu not found")
+            return []
+
+    dishes, next_cursor = await dish_service.get_all_dishes(menu_id, submenu_id, page, version)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return dishes
 
 
 @dish_router.patch(
@@ -104,27 +136,18 @@ def read_dishes(
     name='update_dish',
     status_code=200
 )
-def update_dish(
+async def update_dish(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
         dish_id: uuid.UUID,
         updated_dish: DishSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Dish:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
-    submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
+    path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id, dish_id)
 
     dish_service = DishService(session, redis_client)
-    if not dish_service.is_dish_exists_in_submenu(submenu_id, dish_id):
-        raise HTTPException(status_code=404, detail='dish not found')
-
-    return dish_service.update_dish(dish_id, updated_dish.model_dump())
+    return await dish_service.update_dish(menu_id, path.dish, updated_dish.model_dump())
 
 
 @dish_router.delete(
@@ -134,23 +157,14 @@ def update_dish(
     name='delete_dish',
     status_code=200
 )
-def delete_dish(
+async def delete_dish(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
         dish_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Dish:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
-    submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
+    path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id, dish_id)
 
     dish_service = DishService(session, redis_client)
-    if not dish_service.is_dish_exists_in_submenu(submenu_id, dish_id):
-        raise HTTPException(status_code=404, detail='dish not found')
-
-    return dish_service.delete_dish(dish_id)
+    return await dish_service.delete_dish(menu_id, path.dish)
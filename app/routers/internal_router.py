@@ -0,0 +1,119 @@
+from typing import Literal
+
+from commands.warm_cache import start_warm_up, warm_up_status
+from database.db import get_db_pool_statistics
+from dependencies.profiling import (
+    arm_profiling,
+    find_profile,
+    list_profiles,
+    read_profile_stats,
+    require_profile_token,
+)
+from dependencies.redis import get_cache_statistics, get_redis_pool_statistics
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+internal_router = APIRouter(prefix='/internal', tags=['Internal'], include_in_schema=False)
+
+
+@internal_router.get(
+    '/db-pool',
+    status_code=200,
+    name='read_db_pool_stats'
+)
+async def read_db_pool_stats() -> dict:
+    return get_db_pool_statistics()
+
+
+@internal_router.get(
+    '/redis-pool',
+    status_code=200,
+    name='read_redis_pool_stats'
+)
+async def read_redis_pool_stats() -> dict:
+    return get_redis_pool_statistics()
+
+
+@internal_router.get(
+    '/cache',
+    status_code=200,
+    name='read_cache_stats'
+)
+async def read_cache_stats() -> dict:
+    return get_cache_statistics()
+
+
+@internal_router.get(
+    '/cache/warm-up',
+    status_code=200,
+    name='read_warm_up_status'
+)
+async def read_warm_up_status() -> dict:
+    return dict(warm_up_status)
+
+
+@internal_router.post(
+    '/cache/warm-up',
+    status_code=202,
+    name='warm_up_cache',
+    dependencies=[Depends(require_profile_token)]
+)
+def warm_up_cache() -> dict:
+    if not start_warm_up():
+        raise HTTPException(status_code=409, detail='warm-up running')
+    return dict(warm_up_status)
+
+
+@internal_router.post(
+    '/profiling',
+    status_code=202,
+    name='arm_profiling',
+    dependencies=[Depends(require_profile_token)]
+)
+async def arm_request_profiling(
+        requests: int = Query(default=1, ge=0, le=100),
+        path: str = Query(default='/api/v1/menus')
+) -> dict:
+    return arm_profiling(requests, path)
+
+
+@internal_router.get(
+    '/profiles',
+    status_code=200,
+    name='read_profiles',
+    dependencies=[Depends(require_profile_token)]
+)
+async def read_profiles() -> list[dict]:
+    return list_profiles()
+
+
+@internal_router.get(
+    '/profiles/{profile_id}',
+    status_code=200,
+    response_class=PlainTextResponse,
+    name='read_profile',
+    dependencies=[Depends(require_profile_token)]
+)
+async def read_profile(
+        profile_id: str,
+        sort: Literal['cumulative', 'tottime', 'ncalls'] = 'cumulative',
+        limit: int = Query(default=40, ge=1, le=500)
+) -> str:
+    stats: str | None = read_profile_stats(profile_id, sort, limit)
+    if stats is None:
+        raise HTTPException(status_code=404, detail='profile not found')
+    return stats
+
+
+@internal_router.get(
+    '/profiles/{profile_id}/download',
+    status_code=200,
+    response_class=FileResponse,
+    name='download_profile',
+    dependencies=[Depends(require_profile_token)]
+)
+async def download_profile(profile_id: str) -> FileResponse:
+    path: str | None = find_profile(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail='profile not found')
+    return FileResponse(path, filename=f'{profile_id}.prof')
@@ -1,12 +1,18 @@
 import uuid
 
-from database.db import get_session
+from database.db import DBSession, get_db_session
 from database.models import Menu
-from dependencies.redis import cache
-from fastapi import APIRouter, Depends, HTTPException
-from schemas.menu_schemas import MenuScheme, MenuSchemeCreate, MenuWithDetailsScheme
+from dependencies.etag import is_not_modified, make_etag, not_modified, set_etag
+from dependencies.pagination import Page, pagination, set_next_cursor
+from dependencies.redis import RedisClient, cache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from schemas.menu_schemas import (
+    MenuScheme,
+    MenuSchemeCreate,
+    MenuTreeScheme,
+    MenuWithDetailsScheme,
+)
 from services.menu_service import MenuService
-from sqlalchemy.orm import Session
 
 menu_router = APIRouter(prefix='/menus', tags=['Menu'])
 
@@ -18,15 +24,37 @@ menu_router = APIRouter(prefix='/menus', tags=['Menu'])
     status_code=201,
     name='create_menu'
 )
-def create_menu(
+async def create_menu(
         menu: MenuSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Menu:
     menu_service = MenuService(session, redis_client)
-    if menu_service.is_menu_exists(menu.title):
+    if await menu_service.is_menu_exists(menu.title):
         raise HTTPException(status_code=400, detail='menu exists')
-    return menu_service.create_menu(menu.model_dump())
+    return await menu_service.create_menu(menu.model_dump())
+
+
+@menu_router.get(
+    '/tree',
+    response_model=list[MenuTreeScheme],
+    status_code=200,
+    name='read_menu_tree'
+)
+async def read_menu_tree(
+        request: Request,
+        response: Response,
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> list[MenuTreeScheme] | Response:
+    menu_service = MenuService(session, redis_client)
+    version: str = await menu_service.get_tree_version()
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return await menu_service.get_menu_tree(version)
 
 
 @menu_router.get(
@@ -36,16 +64,24 @@ def create_menu(
     status_code=200,
     name='read_menu'
 )
-def read_menu(
+async def read_menu(
         menu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> MenuWithDetailsScheme:
+        request: Request,
+        response: Response,
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> MenuWithDetailsScheme | Response:
     menu_service = MenuService(session, redis_client)
-    menu = menu_service.get_menu_by_id(menu_id)
+    version: str = await menu_service.get_menus_version()
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    menu = await menu_service.get_menu_by_id(menu_id, version)
     if not menu:
         raise HTTPException(status_code=404, detail='menu not found')
 
+    set_etag(response, etag)
     return menu
 
 
@@ -55,12 +91,23 @@ def read_menu(
     status_code=200,
     name='read_menus'
 )
-def read_menus(
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> list[MenuWithDetailsScheme]:
+async def read_menus(
+        request: Request,
+        response: Response,
+        page: Page = Depends(pagination),
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> list[MenuWithDetailsScheme] | Response:
     menu_service = MenuService(session, redis_client)
-    return menu_service.get_all_menus()
+    version: str = await menu_service.get_menus_version()
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    menus, next_cursor = await menu_service.get_all_menus(page, version)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return menus
 
 
 @menu_router.patch(
@@ -70,14 +117,14 @@ def read_menus(
     status_code=200,
     name='update_menu'
 )
-def update_menu(
+async def update_menu(
         menu_id: uuid.UUID,
         updated_menu: MenuSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Menu:
     menu_service = MenuService(session, redis_client)
-    menu = menu_service.update_menu(menu_id, updated_menu.model_dump())
+    menu = await menu_service.update_menu(menu_id, updated_menu.model_dump())
     if not menu:
         raise HTTPException(status_code=404, detail='menu not found')
 
@@ -91,13 +138,13 @@ def update_menu(
     status_code=200,
     name='delete_menu'
 )
-def delete_menu(
+async def delete_menu(
         menu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Menu:
     menu_service = MenuService(session, redis_client)
-    menu = menu_service.delete_menu(menu_id)
+    menu = await menu_service.delete_menu(menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail='menu not found')
 
@@ -0,0 +1,14 @@
+from dependencies.metrics import render_metrics
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+metrics_router = APIRouter(tags=['Metrics'], include_in_schema=False)
+
+
+@metrics_router.get(
+    '/metrics',
+    status_code=200,
+    name='read_metrics'
+)
+def read_metrics() -> Response:
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,17 +1,19 @@
 import uuid
 
-from database.db import get_session
+from database.db import DBSession, get_db_session
 from database.models import Submenu
-from dependencies.redis import cache
-from fastapi import APIRouter, Depends, HTTPException
+from dependencies.etag import is_not_modified, make_etag, not_modified, set_etag
+from dependencies.pagination import Page, pagination, set_next_cursor
+from dependencies.path_resolver import PathResolver, ResolvedPath
+from dependencies.redis import RedisClient, cache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from schemas.submenu_schemas import (
+    SubmenuBulkScheme,
     SubmenuScheme,
     SubmenuSchemeCreate,
     SubmenuWithDishCountScheme,
 )
-from services.menu_service import MenuService
 from services.submenu_service import SubmenuService
-from sqlalchemy.orm import Session
 
 submenu_router = APIRouter(prefix='/menus', tags=['Submenu'])
 
@@ -23,21 +25,42 @@ submenu_router = APIRouter(prefix='/menus', tags=['Submenu'])
     name='create_submenu',
     status_code=201
 )
-def create_submenu(
+async def create_submenu(
         menu_id: uuid.UUID,
         submenu: SubmenuSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache),
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache),
 ) -> Submenu:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
+    await PathResolver(session).require(menu_id)
 
     submenu_service = SubmenuService(session, redis_client)
-    if submenu_service.is_submenu_exists(submenu.title):
+    if await submenu_service.is_submenu_exists(submenu.title):
         raise HTTPException(status_code=400, detail='submenu exists')
 
-    return submenu_service.create_submenu(menu_id, submenu.model_dump())
+    return await submenu_service.create_submenu(menu_id, submenu.model_dump())
+
+
+@submenu_router.post(
+    '/{menu_id}/submenus/bulk',
+    response_model=SubmenuBulkScheme,
+    responses={400: {'detail': 'submenus not created'}, 404: {'detail': 'menu not found'}},
+    name='create_submenus',
+    status_code=201
+)
+async def create_submenus(
+        menu_id: uuid.UUID,
+        submenus: list[SubmenuSchemeCreate],
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache),
+) -> SubmenuBulkScheme:
+    await PathResolver(session).require(menu_id)
+
+    submenu_service = SubmenuService(session, redis_client)
+    created_submenus = await submenu_service.create_submenus(menu_id, [submenu.model_dump() for submenu in submenus])
+    if created_submenus is None:
+        raise HTTPException(status_code=400, detail='submenus not created')
+
+    return created_submenus
 
 
 @submenu_router.get(
@@ -47,24 +70,26 @@ def create_submenu(
     name='read_submenu',
     status_code=200
 )
-def read_submenu(
+async def read_submenu(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> SubmenuWithDishCountScheme:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
+        request: Request,
+        response: Response,
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> SubmenuWithDishCountScheme | Response:
     submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
+    version: str = await submenu_service.get_submenus_version(menu_id)
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
 
-    submenu = submenu_service.get_submenu_by_id(submenu_id)
-    if not submenu:
-        raise HTTPException(status_code=404, detail='submenu not found')
+    if not (submenu := await submenu_service.get_submenu_by_id(menu_id, submenu_id, version)):
+        # raises the 404 matching the missing part of the path
+        path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id)
+        submenu = await submenu_service.get_submenu(path.submenu)
 
+    set_etag(response, etag)
     return submenu
 
 
@@ -75,17 +100,27 @@ def read_submenu(
     name='read_submenus',
     status_code=200
 )
-def read_submenus(
+async def read_submenus(
         menu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
-) -> list[SubmenuWithDishCountScheme]:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
-
+        request: Request,
+        response: Response,
+        page: Page = Depends(pagination),
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
+) -> list[SubmenuWithDishCountScheme] | Response:
     submenu_service = SubmenuService(session, redis_client)
-    return submenu_service.get_all_submenus(menu_id)
+    version: str = await submenu_service.get_submenus_version(menu_id)
+    etag: str = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    submenus, next_cursor = await submenu_service.get_all_submenus(menu_id, page, version)
+    if not submenus:
+        # an empty page does not tell a menu without submenus from a missing menu
+        await PathResolver(session).require(menu_id)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return submenus
 
 
 @submenu_router.patch(
@@ -95,22 +130,17 @@ def read_submenus(
     name='update_submenu',
     status_code=200
 )
-def update_submenu(
+async def update_submenu(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
         updated_submenu: SubmenuSchemeCreate,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Submenu:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
+    path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id)
 
     submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
-
-    return submenu_service.update_submenu(submenu_id, updated_submenu.model_dump())
+    return await submenu_service.update_submenu(path.submenu, updated_submenu.model_dump())
 
 
 @submenu_router.delete(
@@ -120,18 +150,13 @@ def update_submenu(
     name='delete_submenu',
     status_code=200
 )
-def delete_submenu(
+async def delete_submenu(
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
-        session: Session = Depends(get_session),
-        redis_client: cache = Depends(cache)
+        session: DBSession = Depends(get_db_session),
+        redis_client: RedisClient = Depends(cache)
 ) -> Submenu:
-    menu_service = MenuService(session, redis_client)
-    if not menu_service.is_menu_exists(menu_id):
-        raise HTTPException(status_code=404, detail='menu not found')
+    path: ResolvedPath = await PathResolver(session).require(menu_id, submenu_id)
 
     submenu_service = SubmenuService(session, redis_client)
-    if not submenu_service.is_submenu_exists_in_menu(menu_id, submenu_id):
-        raise HTTPException(status_code=404, detail='submenu not found')
-
-    return submenu_service.delete_submenu(submenu_id)
+    return await submenu_service.delete_submenu(path.submenu)
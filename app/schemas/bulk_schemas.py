@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class BulkConflictScheme(BaseModel):
+    index: int
+    title: str
+    detail: str
@@ -1,6 +1,7 @@
 import uuid
 
 from pydantic import BaseModel, ConfigDict
+from schemas.bulk_schemas import BulkConflictScheme
 
 
 class DishSchemeCreate(BaseModel):
@@ -15,3 +16,8 @@ class DishScheme(DishSchemeCreate):
 
     class Config:
         orm_mode: bool = True
+
+
+class DishBulkScheme(BaseModel):
+    created: list[DishScheme]
+    conflicts: list[BulkConflictScheme]
@@ -1,6 +1,7 @@
 import uuid
 
 from pydantic import BaseModel
+from schemas.submenu_schemas import SubmenuTreeScheme
 
 
 class MenuSchemeCreate(BaseModel):
@@ -21,3 +22,7 @@ class MenuWithDetailsScheme(BaseModel):
     description: str
     submenus_count: int
     dishes_count: int
+
+
+class MenuTreeScheme(MenuWithDetailsScheme):
+    submenus: list[SubmenuTreeScheme]
@@ -1,6 +1,8 @@
 import uuid
 
 from pydantic import BaseModel, ConfigDict
+from schemas.bulk_schemas import BulkConflictScheme
+from schemas.dish_schemas import DishScheme
 
 
 class SubmenuSchemeCreate(BaseModel):
@@ -21,3 +23,12 @@ class SubmenuWithDishCountScheme(BaseModel):
     title: str
     description: str
     dishes_count: int
+
+
+class SubmenuBulkScheme(BaseModel):
+    created: list[SubmenuScheme]
+    conflicts: list[BulkConflictScheme]
+
+
+class SubmenuTreeScheme(SubmenuWithDishCountScheme):
+    dishes: list[DishScheme]
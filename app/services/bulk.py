@@ -0,0 +1,15 @@
+from schemas.bulk_schemas import BulkConflictScheme
+from sqlalchemy import Row
+
+
+def match_created(items: list[dict], created: list[Row], detail: str) -> tuple[list[Row], list[BulkConflictScheme]]:
+    """Orders inserted rows like the request items; items without a row lost on the unique title."""
+    created_by_title: dict[str, Row] = {row.title: row for row in created}
+    rows: list[Row] = []
+    conflicts: list[BulkConflictScheme] = []
+    for index, item in enumerate(items):
+        if row := created_by_title.pop(item['title'], None):
+            rows.append(row)
+        else:
+            conflicts.append(BulkConflictScheme(index=index, title=item['title'], detail=detail))
+    return rows, conflicts
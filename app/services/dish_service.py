@@ -1,83 +1,175 @@
-import pickle
 import uuid
 
-import redis
+from database.db import DBSession
 from database.models import Dish
-from repositories import DishORMRepository, RedisCacheRepository
-from schemas.dish_schemas import DishScheme
-from sqlalchemy.orm import Session
+from dependencies.pagination import Page, page_key, split_page
+from dependencies.redis import RedisClient
+from repositories import (
+    AsyncDishORMRepository,
+    AsyncRedisCacheRepository,
+    DishORMRepository,
+    make_cache_repository,
+    make_orm_repository,
+)
+from repositories.redis_repository.single_flight import load_once
+from schemas.bulk_schemas import BulkConflictScheme
+from schemas.dish_schemas import DishBulkScheme, DishScheme
+from services.bulk import match_created
+from sqlalchemy import Row
 
 
 class DishService:
     def __init__(
             self,
-            session: Session,
-            redis_client: redis.Redis,
+            session: DBSession,
+            redis_client: RedisClient,
             repository=DishORMRepository,
-            cache_repository=RedisCacheRepository
+            async_repository=AsyncDishORMRepository
     ) -> None:
-        self._dish_repository: DishORMRepository = repository(session)
-        self._cache_repository: RedisCacheRepository = cache_repository(redis_client)
+        self._dish_repository: AsyncDishORMRepository = make_orm_repository(session, repository, async_repository)
+        self._cache_repository: AsyncRedisCacheRepository = make_cache_repository(redis_client)
 
-    def is_dish_exists(self, unic_field: str | uuid.UUID) -> bool:
+    async def is_dish_exists(self, unic_field: str | uuid.UUID) -> bool:
         if isinstance(unic_field, uuid.UUID):
-            return self._dish_repository.get_by_id(unic_field) is not None
-        return self._dish_repository.get_by_title(unic_field) is not None
+            return await self._dish_repository.get_by_id(unic_field) is not None
+        return await self._dish_repository.get_by_title(unic_field) is not None
 
-    def is_dish_exists_in_submenu(self, submenu_id: uuid.UUID, dish_id: uuid.UUID) -> bool:
-        dish: Dish = self._dish_repository.get_by_id(dish_id)
-        return dish.submenu_id == submenu_id if dish else False
+    async def get_dishes_version(self, menu_id: uuid.UUID, submenu_id: uuid.UUID) -> str:
+        """Changes with every write that alters a dish of the submenu or their list, and when the menu is deleted."""
+        return await self._cache_repository.get_version(f'menu_{menu_id}', f'submenu_{submenu_id}')
 
-    def get_all_dishes(self, submenu_id: uuid.UUID) -> list[DishScheme]:
-        dishes_list: list = []
-        dishes: list[Dish] = self._dish_repository.get_all(submenu_id)
-
-        for dish in dishes:
-            dish_scheme: DishScheme | None = self.get_dish_by_id(dish.id)
-            if not dish_scheme:
-                continue
+    async def get_all_dishes(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID,
+            page: Page,
+            version: str
+    ) -> tuple[list[DishScheme], str | None]:
+        async def load_dishes() -> dict:
+            dishes: list[Dish]
+            next_cursor: str | None
+            dishes, next_cursor = split_page(
+                await self._dish_repository.get_all(submenu_id, limit=page.limit + 1, after=page.after), page
+            )
+            dish_schemes: dict[str, DishScheme] = {f'dish_{dish.id}': self._to_scheme(dish) for dish in dishes}
+            # the loaded rows also warm the detail entries of the dishes
+            await self._cache_repository.set_many(
+                {
+                    key: dish_scheme.model_dump() | {'menu_id': str(menu_id), 'submenu_id': str(submenu_id)}
+                    for key, dish_scheme in dish_schemes.items()
+                },
+                tags=(f'menu_{menu_id}', f'submenu_{submenu_id}')
+            )
+            return {
+                'items': [dish_scheme.model_dump() for dish_scheme in dish_schemes.values()],
+                'next_cursor': next_cursor
+            }
 
-            dishes_list.append(dish_scheme)
-        return dishes_list
+        dishes: dict = await load_once(
+            self._cache_repository,
+            f'list:submenu_{submenu_id}:{version}:{page_key(page)}',
+            load_dishes
+        )
+        return [DishScheme(**dish) for dish in dishes['items']], dishes['next_cursor']
 
-    def get_dish_by_id(self, dish_id: uuid.UUID) -> DishScheme | None:
-        cached_submenu: object | None
-        if cached_submenu := self._cache_repository.get(f'menu_{dish_id}'):
-            return DishScheme(**pickle.loads(cached_submenu))
+    async def get_cached_dish(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID,
+            dish_id: uuid.UUID,
+            version: str | None = None
+    ) -> DishScheme | None:
+        cached_dish: dict | None = await self._cache_repository.get(f'dish_{dish_id}', version)
+        if not cached_dish:
+            return None
 
-        dish: Dish = self._dish_repository.get_by_id(dish_id)
-        if not dish:
+        if cached_dish.get('menu_id') != str(menu_id) or cached_dish.get('submenu_id') != str(submenu_id):
             return None
+        return DishScheme(**cached_dish)
 
-        dish_scheme: DishScheme = DishScheme(
+    async def get_dish(self, menu_id: uuid.UUID, dish: Dish, version: str | None = None) -> DishScheme:
+        dish_scheme: DishScheme = self._to_scheme(dish)
+        await self._cache_repository.set(
+            f'dish_{dish.id}',
+            dish_scheme.model_dump() | {'menu_id': str(menu_id), 'submenu_id': str(dish.submenu_id)},
+            tags=(f'menu_{menu_id}', f'submenu_{dish.submenu_id}'),
+            version=version
+        )
+        return dish_scheme
+
+    @classmethod
+    def _to_entry(cls, menu_id: uuid.UUID, submenu_id: uuid.UUID, dish: Dish | Row) -> dict:
+        return cls._to_scheme(dish).model_dump() | {'menu_id': str(menu_id), 'submenu_id': str(submenu_id)}
+
+    @staticmethod
+    def _to_scheme(dish: Dish | Row) -> DishScheme:
+        return DishScheme(
             id=dish.id,
             title=dish.title,
             description=dish.description,
             price=f'{float(dish.price):.2f}'
         )
-        self._cache_repository.set(f'dish_{dish_id}', pickle.dumps(dish_scheme))
-        return dish_scheme
 
-    def create_dish(self, submenu_id: uuid.UUID, data: dict) -> Dish | None:
-        dish: Dish = self._dish_repository.create(data, submenu_id)
+    async def create_dish(self, menu_id: uuid.UUID, submenu_id: uuid.UUID, data: dict) -> Dish | None:
+        dish: Dish | None = await self._dish_repository.create(data, submenu_id)
         if dish:
-            menu_id: uuid.UUID = dish.submenu.menu_id
-            self._cache_repository.delete(f'menu_{menu_id}')
-            self._cache_repository.delete(f'submenu_{submenu_id}')
+            await self._cache_repository.write_through(
+                {f'dish_{dish.id}': self._to_entry(menu_id, submenu_id, dish)},
+                tags=(f'menu_{menu_id}', f'submenu_{submenu_id}'),
+                counters={f'menu_{menu_id}': {'dishes_count': 1}, f'submenu_{submenu_id}': {'dishes_count': 1}},
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus', f'menu_{menu_id}', f'submenu_{submenu_id}')
+            )
         return dish
 
-    def update_dish(self, dish_id: uuid.UUID, data: dict) -> Dish | None:
-        dish: Dish = self._dish_repository.update(dish_id, data)
-        if dish:
-            self._cache_repository.delete(f'dish_{dish_id}')
-        return dish
+    async def create_dishes(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID,
+            data: list[dict]
+    ) -> DishBulkScheme | None:
+        if not data:
+            return DishBulkScheme(created=[], conflicts=[])
 
-    def delete_dish(self, dish_id: uuid.UUID) -> Dish | None:
-        menu_id: uuid.UUID = self._dish_repository.get_by_id(dish_id).submenu.menu_id
-        submenu_id: uuid.UUID = self._dish_repository.get_by_id(dish_id).submenu_id
-        dish: Dish = self._dish_repository.delete(dish_id)
-        if dish:
-            self._cache_repository.delete(f'menu_{menu_id}')
-            self._cache_repository.delete(f'submenu_{submenu_id}')
-            self._cache_repository.delete(f'dish_{dish_id}')
-        return dish
+        created_dishes: list[Row] | None = await self._dish_repository.create_many(data, submenu_id)
+        if created_dishes is None:
+            return None
+
+        if created_dishes:
+            await self._cache_repository.write_through(
+                {f'dish_{dish.id}': self._to_entry(menu_id, submenu_id, dish) for dish in created_dishes},
+                tags=(f'menu_{menu_id}', f'submenu_{submenu_id}'),
+                counters={
+                    f'menu_{menu_id}': {'dishes_count': len(created_dishes)},
+                    f'submenu_{submenu_id}': {'dishes_count': len(created_dishes)}
+                },
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus', f'menu_{menu_id}', f'submenu_{submenu_id}')
+            )
+
+        dishes: list[Row]
+        conflicts: list[BulkConflictScheme]
+        dishes, conflicts = match_created(data, created_dishes, 'dish exists')
+        return DishBulkScheme(created=[DishScheme.model_validate(dish) for dish in dishes], conflicts=conflicts)
+
+    async def update_dish(self, menu_id: uuid.UUID, dish: Dish, data: dict) -> Dish | None:
+        updated_dish: Dish | None = await self._dish_repository.update(dish.id, data)
+        if updated_dish:
+            await self._cache_repository.write_through(
+                {f'dish_{dish.id}': self._to_entry(menu_id, updated_dish.submenu_id, updated_dish)},
+                tags=(f'menu_{menu_id}', f'submenu_{updated_dish.submenu_id}'),
+                keys=['menu_tree'],
+                generations=('menu_tree', f'submenu_{updated_dish.submenu_id}')
+            )
+        return updated_dish
+
+    async def delete_dish(self, menu_id: uuid.UUID, dish: Dish) -> Dish | None:
+        dish_id: uuid.UUID = dish.id
+        submenu_id: uuid.UUID = dish.submenu_id
+        deleted_dish: Dish | None = await self._dish_repository.delete(dish_id)
+        if deleted_dish:
+            await self._cache_repository.invalidate(
+                [f'menu_{menu_id}', f'submenu_{submenu_id}', f'dish_{dish_id}', 'menu_tree'],
+                generations=('menu_tree', 'menus', f'menu_{menu_id}', f'submenu_{submenu_id}')
+            )
+        return deleted_dish
@@ -1,108 +1,147 @@
-import pickle
 import uuid
 
-import redis
-from database.models import Dish, Menu, Submenu
-from repositories import MenuORMRepository, RedisCacheRepository
-from schemas.menu_schemas import MenuWithDetailsScheme
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from database.db import DBSession
+from database.models import Menu
+from dependencies.pagination import Page, page_key, split_page
+from dependencies.redis import RedisClient
+from repositories import (
+    AsyncMenuORMRepository,
+    AsyncRedisCacheRepository,
+    MenuORMRepository,
+    make_cache_repository,
+    make_orm_repository,
+)
+from repositories.redis_repository.single_flight import load_once
+from schemas.dish_schemas import DishScheme
+from schemas.menu_schemas import MenuTreeScheme, MenuWithDetailsScheme
+from schemas.submenu_schemas import SubmenuTreeScheme
 
 
 class MenuService:
     def __init__(
             self,
-            session: Session,
-            redis_client: redis.Redis,
+            session: DBSession,
+            redis_client: RedisClient,
             repository=MenuORMRepository,
-            cache_repository=RedisCacheRepository
+            async_repository=AsyncMenuORMRepository
     ) -> None:
-        self._menu_repository: MenuORMRepository = repository(session)
-        self._cache_repository: RedisCacheRepository = cache_repository(redis_client)
-
-    def _get_menu_details(self, menu_id: uuid.UUID) -> tuple[Menu, int, int] | None:
-        try:
-            menu_details: tuple[Menu, int, int] = (
-                self._menu_repository.session.query(
-                    Menu,
-                    func.count(func.distinct(Submenu.id)),
-                    func.count(Dish.id)
-                )
-                .outerjoin(Submenu, Submenu.menu_id == Menu.id)
-                .outerjoin(Dish, Dish.submenu_id == Submenu.id)
-                .filter(Menu.id == menu_id)
-                .group_by(Menu.id)
-                .first()
-            )
-            return menu_details
-        except Exception as e:
-            print(e)
-            return None
+        self._menu_repository: AsyncMenuORMRepository = make_orm_repository(session, repository, async_repository)
+        self._cache_repository: AsyncRedisCacheRepository = make_cache_repository(redis_client)
 
-    def is_menu_exists(self, unic_field: str | uuid.UUID) -> bool:
+    async def is_menu_exists(self, unic_field: str | uuid.UUID) -> bool:
         if isinstance(unic_field, uuid.UUID):
-            return self._menu_repository.get_by_id(unic_field) is not None
-        return self._menu_repository.get_by_title(unic_field) is not None
+            return await self._menu_repository.get_by_id(unic_field) is not None
+        return await self._menu_repository.get_by_title(unic_field) is not None
+
+    async def get_menus_version(self) -> str:
+        """Changes with every write that alters a menu or the list of menus."""
+        return await self._cache_repository.get_version('menus')
+
+    async def get_tree_version(self) -> str:
+        return await self._cache_repository.get_version('menu_tree')
+
+    async def get_all_menus(self, page: Page, version: str) -> tuple[list[MenuWithDetailsScheme], str | None]:
+        async def load_menus() -> dict:
+            menus: list[Menu]
+            next_cursor: str | None
+            menus, next_cursor = split_page(
+                await self._menu_repository.get_all(item_id=None, limit=page.limit + 1, after=page.after), page
+            )
+            return {'items': [self._to_scheme(menu).model_dump() for menu in menus], 'next_cursor': next_cursor}
 
-    def get_all_menus(self) -> list[MenuWithDetailsScheme]:
-        menus_with_details: list = []
-        menus: list[Menu] = self._menu_repository.get_all(item_id=None)
-        for menu in menus:
-            menu_details: MenuWithDetailsScheme = self.get_menu_by_id(menu.id)
-            if not menu_details:
-                continue
+        menus: dict = await load_once(self._cache_repository, f'list:menus:{version}:{page_key(page)}', load_menus)
+        return [MenuWithDetailsScheme(**menu) for menu in menus['items']], menus['next_cursor']
 
-            menus_with_details.append(menu_details)
-        return menus_with_details
+    async def get_menu_by_id(self, menu_id: uuid.UUID, version: str | None = None) -> MenuWithDetailsScheme | None:
+        async def load_menu() -> dict | None:
+            menu: Menu | None = await self._menu_repository.get_by_id(menu_id)
+            return self._to_scheme(menu).model_dump() if menu else None
 
-    def get_menu_by_id(self, menu_id: uuid.UUID) -> MenuWithDetailsScheme | None:
-        cached_menu: object | None
+        menu: object | None = await load_once(self._cache_repository, f'menu_{menu_id}', load_menu, version=version)
+        return MenuWithDetailsScheme(**menu) if menu else None
 
-        if cached_menu := self._cache_repository.get(f'menu_{menu_id}'):
-            return MenuWithDetailsScheme(**pickle.loads(cached_menu))
+    async def get_menu_tree(self, version: str | None = None) -> list[MenuTreeScheme]:
+        cached_tree: object | None
 
-        menu_details: tuple[Menu, int, int] | None = self._get_menu_details(menu_id)
-        if not menu_details:
-            return None
+        if (cached_tree := await self._cache_repository.get('menu_tree', version)) is not None:
+            return [MenuTreeScheme(**menu) for menu in cached_tree]
 
-        menu, submenu_count, dish_count = menu_details
-        menu_with_details: MenuWithDetailsScheme = MenuWithDetailsScheme(
+        menu_tree: list[MenuTreeScheme] = [
+            self._to_tree_scheme(menu) for menu in await self._menu_repository.get_tree()
+        ]
+        await self._cache_repository.set(
+            'menu_tree',
+            [menu.model_dump() for menu in menu_tree],
+            version=version
+        )
+        return menu_tree
+
+    @staticmethod
+    def _to_tree_scheme(menu: Menu) -> MenuTreeScheme:
+        submenus: list[SubmenuTreeScheme] = [
+            SubmenuTreeScheme(
+                id=submenu.id,
+                title=submenu.title,
+                description=submenu.description,
+                dishes_count=len(submenu.dishes),
+                dishes=[
+                    DishScheme(
+                        id=dish.id,
+                        title=dish.title,
+                        description=dish.description,
+                        price=f'{float(dish.price):.2f}'
+                    )
+                    for dish in submenu.dishes
+                ]
+            )
+            for submenu in menu.submenus
+        ]
+        return MenuTreeScheme(
             id=menu.id,
             title=menu.title,
             description=menu.description,
-            submenus_count=submenu_count,
-            dishes_count=dish_count
+            submenus_count=len(submenus),
+            dishes_count=sum(submenu.dishes_count for submenu in submenus),
+            submenus=submenus
         )
-        self._cache_repository.set(
-            f'menu_{menu_id}',
-            pickle.dumps(menu_with_details.model_dump())
+
+    @staticmethod
+    def _to_scheme(menu: Menu) -> MenuWithDetailsScheme:
+        return MenuWithDetailsScheme(
+            id=menu.id,
+            title=menu.title,
+            description=menu.description,
+            submenus_count=menu.submenus_count,
+            dishes_count=menu.dishes_count
         )
-        return menu_with_details
 
-    def create_menu(self, menu_data: dict) -> Menu | None:
-        new_menu: Menu = self._menu_repository.create(menu_data, item_id=None)
+    async def create_menu(self, menu_data: dict) -> Menu | None:
+        new_menu: Menu = await self._menu_repository.create(menu_data, item_id=None)
+        if new_menu:
+            await self._cache_repository.write_through(
+                {f'menu_{new_menu.id}': self._to_scheme(new_menu).model_dump()},
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus')
+            )
         return new_menu if new_menu else None
 
-    def update_menu(self, menu_id: uuid.UUID, new_menu_data: dict) -> Menu | None:
-        updated_menu: Menu | None = self._menu_repository.update(menu_id, new_menu_data)
+    async def update_menu(self, menu_id: uuid.UUID, new_menu_data: dict) -> Menu | None:
+        updated_menu: Menu | None = await self._menu_repository.update(menu_id, new_menu_data)
         if updated_menu:
-            self._cache_repository.delete(f'menu_{menu_id}')
+            await self._cache_repository.write_through(
+                {f'menu_{menu_id}': self._to_scheme(updated_menu).model_dump()},
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus')
+            )
         return updated_menu if updated_menu else None
 
-    def delete_menu(self, menu_id: uuid.UUID) -> Menu:
-        submenus: list[Submenu] = self._menu_repository.get_by_id(menu_id).submenus
-        dishes: list = []
-        for submenu in submenus:
-            dishes.extend(submenu.dishes)
-
-        deleted_menu: Menu = self._menu_repository.delete(menu_id)
+    async def delete_menu(self, menu_id: uuid.UUID) -> Menu | None:
+        deleted_menu: Menu = await self._menu_repository.delete(menu_id)
         if deleted_menu:
-            self._cache_repository.delete(f'menu_{menu_id}')
-
-            for submenu in submenus:
-                self._cache_repository.delete(f'submenu_{submenu.id}')
-
-            for dish in dishes:
-                self._cache_repository.delete(f'dish_{dish.id}')
-
+            # submenus and dishes of the menu are tagged with its key
+            await self._cache_repository.invalidate(
+                [f'menu_{menu_id}', 'menu_tree'],
+                tags=(f'menu_{menu_id}',),
+                generations=('menu_tree', 'menus', f'menu_{menu_id}')
+            )
         return deleted_menu if deleted_menu else None
@@ -1,110 +1,186 @@
-import pickle
 import uuid
 
-import redis
-from database.models import Dish, Submenu
-from repositories import RedisCacheRepository, SubmenuORMRepository
-from schemas.submenu_schemas import SubmenuWithDishCountScheme
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from database.db import DBSession
+from database.models import Submenu
+from dependencies.pagination import Page, page_key, split_page
+from dependencies.redis import RedisClient
+from repositories import (
+    AsyncRedisCacheRepository,
+    AsyncSubmenuORMRepository,
+    SubmenuORMRepository,
+    make_cache_repository,
+    make_orm_repository,
+)
+from repositories.redis_repository.single_flight import load_once
+from schemas.bulk_schemas import BulkConflictScheme
+from schemas.submenu_schemas import (
+    SubmenuBulkScheme,
+    SubmenuScheme,
+    SubmenuWithDishCountScheme,
+)
+from services.bulk import match_created
+from sqlalchemy import Row
 
 
 class SubmenuService:
     def __init__(
             self,
-            session: Session,
-            redis_client: redis.Redis,
+            session: DBSession,
+            redis_client: RedisClient,
             repository=SubmenuORMRepository,
-            cache_repository=RedisCacheRepository
+            async_repository=AsyncSubmenuORMRepository
     ) -> None:
-        self._submenu_repository: SubmenuORMRepository = repository(session)
-        self._cache_repository: RedisCacheRepository = cache_repository(redis_client)
-
-    def _get_submenu_details(self, submenu_id: uuid.UUID) -> tuple[Submenu, int] | None:
-        try:
-            submenu_details: tuple[Submenu, int] = (
-                self._submenu_repository.session.
-                query(Submenu, func.count(func.distinct(Dish.id)))
-                .outerjoin(Dish, Dish.submenu_id == Submenu.id)
-                .group_by(Submenu)
-                .filter(Submenu.id == submenu_id)
-                .first()
-            )
-            return submenu_details
-        except Exception as e:
-            print(e)
-            return None
-
-    def is_submenu_exists_in_menu(self, menu_id: uuid.UUID, submenu_id: uuid.UUID) -> bool:
-        submenu: Submenu | None = self._submenu_repository.get_by_id(submenu_id)
-        return submenu.menu_id == menu_id if submenu else False
+        self._submenu_repository: AsyncSubmenuORMRepository = make_orm_repository(
+            session, repository, async_repository
+        )
+        self._cache_repository: AsyncRedisCacheRepository = make_cache_repository(redis_client)
 
-    def is_submenu_exists(self, unic_field: str | uuid.UUID) -> bool:
+    async def is_submenu_exists(self, unic_field: str | uuid.UUID) -> bool:
         if isinstance(unic_field, uuid.UUID):
-            return self._submenu_repository.get_by_id(unic_field) is not None
-        return self._submenu_repository.get_by_title(unic_field) is not None
-
-    def get_all_submenus(self, menu_id: uuid.UUID) -> list[SubmenuWithDishCountScheme]:
-
-        submenus_with_details: list = []
-        submenus: list[Submenu] = self._submenu_repository.get_all(menu_id)
-
-        for submenu in submenus:
-            submenu_details: SubmenuWithDishCountScheme = self.get_submenu_by_id(submenu.id)
-            if not submenu_details:
-                continue
-
-            submenus_with_details.append(submenu_details)
-
-        return submenus_with_details
+            return await self._submenu_repository.get_by_id(unic_field) is not None
+        return await self._submenu_repository.get_by_title(unic_field) is not None
 
-    def get_submenu_by_id(self, submenu_id: uuid.UUID) -> SubmenuWithDishCountScheme | None:
-        cached_submenu: object | None
+    async def get_submenus_version(self, menu_id: uuid.UUID) -> str:
+        """Changes with every write that alters a submenu of the menu or their list."""
+        return await self._cache_repository.get_version(f'menu_{menu_id}')
 
-        if cached_submenu := self._cache_repository.get(f'menu_{submenu_id}'):
-            return SubmenuWithDishCountScheme(**pickle.loads(cached_submenu))
-
-        submenu_details: tuple[Submenu, int] | None = self._get_submenu_details(submenu_id)
+    async def get_all_submenus(
+            self,
+            menu_id: uuid.UUID,
+            page: Page,
+            version: str
+    ) -> tuple[list[SubmenuWithDishCountScheme], str | None]:
+        async def load_submenus() -> dict:
+            submenus: list[Submenu]
+            next_cursor: str | None
+            submenus, next_cursor = split_page(
+                await self._submenu_repository.get_all(menu_id, limit=page.limit + 1, after=page.after), page
+            )
+            return {
+                'items': [self._to_scheme(submenu).model_dump() for submenu in submenus],
+                'next_cursor': next_cursor
+            }
+
+        submenus: dict = await load_once(
+            self._cache_repository,
+            f'list:menu_{menu_id}:{version}:{page_key(page)}',
+            load_submenus
+        )
+        return [SubmenuWithDishCountScheme(**submenu) for submenu in submenus['items']], submenus['next_cursor']
 
-        if not submenu_details:
+    async def get_submenu_by_id(
+            self,
+            menu_id: uuid.UUID,
+            submenu_id: uuid.UUID,
+            version: str | None = None
+    ) -> SubmenuWithDishCountScheme | None:
+        async def load_submenu() -> dict | None:
+            submenu: Submenu | None = await self._submenu_repository.get_by_id(submenu_id)
+            if not submenu or submenu.menu_id != menu_id:
+                return None
+            return self._to_scheme(submenu).model_dump() | {'menu_id': str(submenu.menu_id)}
+
+        submenu: dict | None = await load_once(
+            self._cache_repository,
+            f'submenu_{submenu_id}',
+            load_submenu,
+            tags=(f'menu_{menu_id}',),
+            version=version
+        )
+        if not submenu or submenu.get('menu_id') != str(menu_id):
             return None
+        return SubmenuWithDishCountScheme(**submenu)
+
+    async def get_submenu(self, submenu: Submenu) -> SubmenuWithDishCountScheme:
+        submenu_with_detail: SubmenuWithDishCountScheme = self._to_scheme(submenu)
+        await self._cache_repository.set(
+            f'submenu_{submenu.id}',
+            submenu_with_detail.model_dump() | {'menu_id': str(submenu.menu_id)},
+            tags=(f'menu_{submenu.menu_id}',)
+        )
+        return submenu_with_detail
 
-        submenu, dish_count = submenu_details
-        submenu_with_detail = SubmenuWithDishCountScheme(
+    @staticmethod
+    def _to_scheme(submenu: Submenu) -> SubmenuWithDishCountScheme:
+        return SubmenuWithDishCountScheme(
             id=submenu.id,
             title=submenu.title,
             description=submenu.description,
-            dishes_count=dish_count
-        )
-        self._cache_repository.set(
-            f'submenu_{submenu_id}',
-            pickle.dumps(submenu_with_detail.model_dump())
+            dishes_count=submenu.dishes_count
         )
-        return submenu_with_detail
 
-    def create_submenu(self, menu_id: uuid.UUID, data: dict) -> Submenu | None:
-        submenu: Submenu | None = self._submenu_repository.create(data, menu_id)
+    async def create_submenu(self, menu_id: uuid.UUID, data: dict) -> Submenu | None:
+        submenu: Submenu | None = await self._submenu_repository.create(data, menu_id)
         if submenu:
-            self._cache_repository.delete(f'menu_{menu_id}')
+            await self._cache_repository.write_through(
+                {f'submenu_{submenu.id}': self._to_scheme(submenu).model_dump() | {'menu_id': str(menu_id)}},
+                tags=(f'menu_{menu_id}',),
+                counters={f'menu_{menu_id}': {'submenus_count': 1}},
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus', f'menu_{menu_id}')
+            )
 
         return submenu
 
-    def update_submenu(self, submenu_id: uuid.UUID, data: dict) -> Submenu | None:
-        updated_submenu: Submenu | None = self._submenu_repository.update(submenu_id, data)
+    async def create_submenus(self, menu_id: uuid.UUID, data: list[dict]) -> SubmenuBulkScheme | None:
+        if not data:
+            return SubmenuBulkScheme(created=[], conflicts=[])
+
+        created_submenus: list[Row] | None = await self._submenu_repository.create_many(data, menu_id)
+        if created_submenus is None:
+            return None
+
+        if created_submenus:
+            await self._cache_repository.write_through(
+                {
+                    f'submenu_{submenu.id}': SubmenuWithDishCountScheme(
+                        id=submenu.id,
+                        title=submenu.title,
+                        description=submenu.description,
+                        dishes_count=0
+                    ).model_dump() | {'menu_id': str(menu_id)}
+                    for submenu in created_submenus
+                },
+                tags=(f'menu_{menu_id}',),
+                counters={f'menu_{menu_id}': {'submenus_count': len(created_submenus)}},
+                keys=['menu_tree'],
+                generations=('menu_tree', 'menus', f'menu_{menu_id}')
+            )
+
+        submenus: list[Row]
+        conflicts: list[BulkConflictScheme]
+        submenus, conflicts = match_created(data, created_submenus, 'submenu exists')
+        return SubmenuBulkScheme(
+            created=[SubmenuScheme.model_validate(submenu) for submenu in submenus],
+            conflicts=conflicts
+        )
+
+    async def update_submenu(self, submenu: Submenu, data: dict) -> Submenu | None:
+        updated_submenu: Submenu | None = await self._submenu_repository.update(submenu.id, data)
         if updated_submenu:
-            self._cache_repository.delete(f'submenu_{submenu_id}')
+            await self._cache_repository.write_through(
+                {
+                    f'submenu_{submenu.id}': self._to_scheme(updated_submenu).model_dump() | {
+                        'menu_id': str(updated_submenu.menu_id)
+                    }
+                },
+                tags=(f'menu_{updated_submenu.menu_id}',),
+                keys=['menu_tree'],
+                generations=('menu_tree', f'menu_{updated_submenu.menu_id}')
+            )
 
         return updated_submenu
 
-    def delete_submenu(self, submenu_id: uuid.UUID) -> Submenu | None:
-
-        menu_id: uuid.UUID = self._submenu_repository.get_by_id(submenu_id).menu_id
-        dishes: list[Dish] = self._submenu_repository.get_by_id(submenu_id).dishes
-        deleted_submenu: Submenu | None = self._submenu_repository.delete(submenu_id)
+    async def delete_submenu(self, submenu: Submenu) -> Submenu | None:
+        submenu_id: uuid.UUID = submenu.id
+        menu_id: uuid.UUID = submenu.menu_id
+        deleted_submenu: Submenu | None = await self._submenu_repository.delete(submenu_id)
         if deleted_submenu:
-            self._cache_repository.delete(f'menu_{menu_id}')
-
-            for dish in dishes:
-                self._cache_repository.delete(f'dish_{dish.id}')
+            # dishes of the submenu are tagged with its key
+            await self._cache_repository.invalidate(
+                [f'menu_{menu_id}', f'submenu_{submenu_id}', 'menu_tree'],
+                tags=(f'submenu_{submenu_id}',),
+                generations=('menu_tree', 'menus', f'menu_{menu_id}', f'submenu_{submenu_id}')
+            )
 
         return deleted_submenu
@@ -1,14 +1,30 @@
+from contextlib import contextmanager
 from enum import Enum
-from typing import Callable, Generator
+from typing import AsyncGenerator, Callable, Generator, Iterable
 
 import pytest
-from config import POSTGRES_URL
-from database.db import Base, get_session
+import redis
+from config import (
+    ASYNC_MODE,
+    POSTGRES_ASYNC_URL,
+    POSTGRES_URL,
+    REDIS_PORT,
+    REDIS_SERVER,
+)
+from database.db import Base, get_async_session, get_session
 from database.models import Dish, Menu, Submenu
+from dependencies.redis import RedisClient, cache
 from fastapi.testclient import TestClient
 from main import app
-from sqlalchemy import create_engine
+from redis import asyncio as aioredis
+from redis import connection as redis_connection
+from redis.asyncio import connection as aioredis_connection
+from repositories.redis_repository.local_cache import local_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 engine_test = create_engine(POSTGRES_URL)
 session_factory = sessionmaker(
@@ -17,6 +33,15 @@ session_factory = sessionmaker(
     bind=engine_test
 )
 
+# TestClient runs every request on a fresh event loop, so asyncpg
+# connections must not outlive the request that opened them
+async_engine_test = create_async_engine(POSTGRES_ASYNC_URL, poolclass=NullPool)
+async_session_factory = async_sessionmaker(
+    bind=async_engine_test,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base.metadata.create_all(bind=engine_test)
 
 
@@ -25,7 +50,24 @@ def override_get_session() -> Generator[Session, None, None]:
         yield session
 
 
+async def override_get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as session:
+        yield session
+
+
+async def override_cache() -> AsyncGenerator[RedisClient, None]:
+    # same reason as the NullPool engine: a redis.asyncio client per request
+    redis_client: aioredis.Redis = aioredis.Redis(host=REDIS_SERVER, port=REDIS_PORT)
+    try:
+        yield redis_client
+    finally:
+        await redis_client.aclose()
+
+
 app.dependency_overrides[get_session] = override_get_session
+app.dependency_overrides[get_async_session] = override_get_async_session
+if ASYNC_MODE:
+    app.dependency_overrides[cache] = override_cache
 
 
 client: TestClient = TestClient(app)
@@ -63,6 +105,10 @@ def clear_db(get_db: Generator[Session, None, None]) -> Generator[Session, None,
     db.query(Menu).delete()
     db.commit()
     db.close()
+    # the rows were deleted behind the services, so none of the cached lists may be reused
+    with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+        redis_client.flushdb()
+    local_cache.clear()
 
 
 class EntityType(Enum):
@@ -79,3 +125,82 @@ def create_test_entity(model: EntityType, **data: str) -> Menu | Submenu | Dish:
     session.commit()
     session.refresh(entity)
     return entity
+
+
+# sent by redis-py itself to set up connections and check their health
+REDIS_SETUP_COMMANDS: frozenset[str] = frozenset({'AUTH', 'CLIENT', 'HELLO', 'PING', 'SELECT'})
+
+
+class RoundTripCounter:
+    """SQL statements, Redis commands and Redis round trips issued while counting."""
+
+    def __init__(self) -> None:
+        self.queries: int = 0
+        self.redis_commands: int = 0
+        self.redis_round_trips: int = 0
+
+    def count_query(self, *args) -> None:
+        self.queries += 1
+
+    def count_redis(self, commands: Iterable[tuple]) -> None:
+        names: list[str] = [str(command[0]).split()[0].upper() for command in commands]
+        names = [name for name in names if name not in REDIS_SETUP_COMMANDS]
+        if names:
+            self.redis_commands += len(names)
+            self.redis_round_trips += 1
+
+
+@pytest.fixture
+def count_round_trips(monkeypatch: pytest.MonkeyPatch) -> Callable:
+    """Context manager counting the database and Redis traffic of the requests made inside it.
+
+    Single Redis commands go through send_command, pipelines and transactions
+    through pack_commands, in the sync and the asyncio client alike.
+    """
+    counters: list[RoundTripCounter] = []
+
+    def count_redis(commands: Iterable[tuple]) -> None:
+        for counter in counters:
+            counter.count_redis(commands)
+
+    send_command: Callable = redis_connection.AbstractConnection.send_command
+    async_send_command: Callable = aioredis_connection.AbstractConnection.send_command
+    pack_commands: Callable = redis_connection.AbstractConnection.pack_commands
+    async_pack_commands: Callable = aioredis_connection.AbstractConnection.pack_commands
+
+    def counted_send_command(self, *args, **kwargs) -> None:
+        count_redis([args])
+        send_command(self, *args, **kwargs)
+
+    async def async_counted_send_command(self, *args, **kwargs) -> None:
+        count_redis([args])
+        await async_send_command(self, *args, **kwargs)
+
+    # the asyncio pipeline passes its commands as a generator
+    def counted_pack_commands(self, commands: Iterable[tuple]) -> list[bytes]:
+        commands = list(commands)
+        count_redis(commands)
+        return pack_commands(self, commands)
+
+    def async_counted_pack_commands(self, commands: Iterable[tuple]) -> list[bytes]:
+        commands = list(commands)
+        count_redis(commands)
+        return async_pack_commands(self, commands)
+
+    monkeypatch.setattr(redis_connection.AbstractConnection, 'send_command', counted_send_command)
+    monkeypatch.setattr(aioredis_connection.AbstractConnection, 'send_command', async_counted_send_command)
+    monkeypatch.setattr(redis_connection.AbstractConnection, 'pack_commands', counted_pack_commands)
+    monkeypatch.setattr(aioredis_connection.AbstractConnection, 'pack_commands', async_counted_pack_commands)
+
+    @contextmanager
+    def counting() -> Generator[RoundTripCounter, None, None]:
+        counter: RoundTripCounter = RoundTripCounter()
+        counters.append(counter)
+        event.listen(Engine, 'after_cursor_execute', counter.count_query)
+        try:
+            yield counter
+        finally:
+            event.remove(Engine, 'after_cursor_execute', counter.count_query)
+            counters.remove(counter)
+
+    return counting
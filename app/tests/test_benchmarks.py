@@ -0,0 +1,40 @@
+from benchmarks.compare import compare
+from benchmarks.workload import LatencyRecorder, percentile
+
+
+def make_result(rps: float, p99_ms: float, requests: int = 1000) -> dict:
+    stats: dict = {'requests': requests, 'rps': rps, 'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': p99_ms}
+    return {'routes': {'read_menu': stats}, 'total': stats}
+
+
+class TestBenchmarks:
+    def test_percentile(self) -> None:
+        values: list[float] = [float(value) for value in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 50) == 0.0
+
+    def test_latency_report(self) -> None:
+        recorder: LatencyRecorder = LatencyRecorder()
+        recorder.record('read_menu', 0.002, ok=True)
+        recorder.record('read_menu', 0.004, ok=False)
+        recorder.record('read_dish', 0.001, ok=True)
+        report: dict = recorder.report(elapsed=2.0)
+        assert report['routes']['read_menu']['requests'] == 2
+        assert report['routes']['read_menu']['errors'] == 1
+        assert report['routes']['read_menu']['p99_ms'] == 4.0
+        assert report['total']['rps'] == 1.5
+
+    def test_compare_flags_regressions(self) -> None:
+        rows: list[dict] = compare(make_result(100, 10.0), make_result(80, 12.0), threshold=0.1)
+        assert rows[0]['regressions'] == ['rps', 'p99_ms']
+
+    def test_compare_tolerates_threshold(self) -> None:
+        rows: list[dict] = compare(make_result(100, 10.0), make_result(95, 10.5), threshold=0.1)
+        assert not any(row['regressions'] for row in rows)
+
+    def test_compare_ignores_small_samples(self) -> None:
+        rows: list[dict] = compare(
+            make_result(100, 10.0, requests=5), make_result(50, 20.0, requests=5), threshold=0.1, min_requests=100
+        )
+        assert not any(row['regressions'] for row in rows)
@@ -0,0 +1,34 @@
+import uuid
+
+import pytest
+from repositories.redis_repository.codecs import (
+    OrjsonCodec,
+    PickleCodec,
+    VersionedCodec,
+    get_codec,
+)
+
+
+class TestCodecs:
+    @pytest.mark.parametrize('name', ['orjson', 'pickle'])
+    def test_round_trip(self, name: str) -> None:
+        codec: VersionedCodec = get_codec(name)
+        value: dict = {'id': str(uuid.uuid4()), 'title': 'menu1', 'dishes_count': 2}
+        assert codec.loads(codec.dumps(value)) == value
+
+    def test_uuid_is_encoded_as_string(self) -> None:
+        codec: VersionedCodec = get_codec('orjson')
+        menu_id: uuid.UUID = uuid.uuid4()
+        assert codec.loads(codec.dumps({'id': menu_id})) == {'id': str(menu_id)}
+
+    def test_stale_schema_version_is_rejected(self) -> None:
+        entry: bytes = VersionedCodec(OrjsonCodec(), version=1).dumps({'title': 'menu1'})
+        assert VersionedCodec(OrjsonCodec(), version=2).loads(entry) is None
+
+    def test_other_codec_is_rejected(self) -> None:
+        entry: bytes = VersionedCodec(PickleCodec(), version=1).dumps({'title': 'menu1'})
+        assert VersionedCodec(OrjsonCodec(), version=1).loads(entry) is None
+
+    def test_unknown_codec(self) -> None:
+        with pytest.raises(ValueError):
+            get_codec('xml')
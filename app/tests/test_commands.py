@@ -0,0 +1,112 @@
+import redis
+from commands.reconcile_counters import reconcile_counters
+from commands.upgrade_schema import upgrade_schema
+from commands.warm_cache import warm_cache
+from config import REDIS_PORT, REDIS_SERVER
+from database.models import Dish, Menu, Submenu
+from repositories import RedisCacheRepository
+from repositories.redis_repository.tags import tag_key
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+from tests.conftest import EntityType, create_test_entity, engine_test
+
+
+class TestCommands:
+    def test_reconcile_counters(self, get_db: Session) -> None:
+        session = get_db
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        session.execute(update(Menu).values(submenus_count=5, dishes_count=5))
+        session.execute(update(Submenu).values(dishes_count=5))
+        session.commit()
+
+        assert reconcile_counters(session) == (1, 1)
+        assert reconcile_counters(session) == (0, 0)
+
+        session.expire_all()
+        assert session.get(Submenu, submenu.id).dishes_count == 1
+        assert session.get(Menu, menu.id).submenus_count == 1
+        assert session.get(Menu, menu.id).dishes_count == 1
+
+    def test_upgrade_schema(self, get_db: Session) -> None:
+        session = get_db
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        with engine_test.begin() as connection:
+            connection.execute(text('ALTER TABLE menus DROP COLUMN submenus_count, DROP COLUMN dishes_count'))
+            connection.execute(text('ALTER TABLE submenus DROP COLUMN dishes_count'))
+
+        with engine_test.begin() as connection:
+            assert upgrade_schema(connection) == ['menus.submenus_count', 'menus.dishes_count', 'submenus.dishes_count']
+        with engine_test.begin() as connection:
+            assert upgrade_schema(connection) == []
+
+        session.expire_all()
+        assert session.get(Submenu, submenu.id).dishes_count == 1
+        assert session.get(Menu, menu.id).submenus_count == 1
+        assert session.get(Menu, menu.id).dishes_count == 1
+
+    def test_warm_cache(self, get_db: Session) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        dishes: list[Dish] = [
+            create_test_entity(
+                EntityType.DISH,
+                title=f'dish{number}',
+                description=f'description dish{number}',
+                price='100.00',
+                submenu_id=submenu.id
+            )
+            for number in range(3)
+        ]
+
+        with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+            report: dict = warm_cache(get_db, RedisCacheRepository(redis_client), batch_size=2)
+            assert (report['menus'], report['submenus'], report['dishes']) == (1, 1, 3)
+            assert report['batches'] == 4
+
+            assert redis_client.exists(f'menu_{menu.id}', f'submenu_{submenu.id}') == 2
+            assert redis_client.exists(*[f'dish_{dish.id}' for dish in dishes]) == 3
+            assert len(redis_client.smembers(tag_key(f'menu_{menu.id}'))) == 4
+            assert len(redis_client.smembers(tag_key(f'submenu_{submenu.id}'))) == 3
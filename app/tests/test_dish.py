@@ -1,7 +1,14 @@
 from typing import Callable, Generator
 
 import pytest
+import redis
+from config import REDIS_PORT, REDIS_SERVER
 from database.models import Dish, Menu, Submenu
+from repositories.redis_repository import (
+    async_redis_cache_repository,
+    redis_cache_repository,
+)
+from repositories.redis_repository.codecs import cache_codec
 from sqlalchemy.orm import Session
 from tests.conftest import EntityType, client, create_test_entity
 
@@ -39,6 +46,11 @@ class TestDish:
         session.query(Menu).delete()
         session.commit()
 
+    @pytest.fixture
+    def write_through(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(redis_cache_repository, 'CACHE_WRITE_THROUGH', True)
+        monkeypatch.setattr(async_redis_cache_repository, 'CACHE_WRITE_THROUGH', True)
+
     def test_read_empty_dishes(self, get_reverse: Callable) -> None:
         menu: Menu = create_test_entity(
             EntityType.MENU,
@@ -131,6 +143,28 @@ class TestDish:
         assert response.status_code == 404
         assert response.json()['detail'] == 'dish not found'
 
+    def test_read_cached_dish_with_foreign_menu_id(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish, *_ = prepare_test_data
+        other_menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu2',
+            description='description menu2'
+        )
+        response = client.get(
+            url=get_reverse('read_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        )
+        assert response.status_code == 200
+
+        response = client.get(
+            url=get_reverse('read_dish', menu_id=other_menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        )
+        assert response.status_code == 404
+        assert response.json()['detail'] == 'submenu not found'
+
     def test_read_dish_with_not_uuid_id(
             self,
             get_reverse: Callable,
@@ -160,6 +194,125 @@ class TestDish:
         assert response.json()[1]['description'] == dish2.description
         assert response.json()[1]['price'] == dish2.price
 
+    def test_read_dishes_not_modified(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish_1, dish_2 = prepare_test_data
+        url: str = get_reverse('read_dishes', menu_id=menu.id, submenu_id=submenu.id)
+        etag: str = client.get(url=url).headers['ETag']
+        assert client.get(url=url, headers={'If-None-Match': f'W/{etag}'}).status_code == 304
+
+        client.patch(
+            url=get_reverse('update_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish_1.id),
+            json={'title': 'updated dish1', 'description': 'updated description dish1', 'price': '150.00'}
+        )
+        response = client.get(url=url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert {dish['title'] for dish in response.json()} == {'updated dish1', 'dish2'}
+
+    def test_read_dishes_paginated(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish1, dish2 = prepare_test_data
+        response = client.get(
+            url=get_reverse('read_dishes', menu_id=menu.id, submenu_id=submenu.id),
+            params={'limit': 1}
+        )
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()] == [str(dish1.id)]
+
+        response = client.get(
+            url=get_reverse('read_dishes', menu_id=menu.id, submenu_id=submenu.id),
+            params={'limit': 1, 'cursor': response.headers['X-Next-Cursor']}
+        )
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()] == [str(dish2.id)]
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_read_dishes_after_update(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish1, dish2 = prepare_test_data
+        client.get(
+            url=get_reverse('read_dishes', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        client.patch(
+            url=get_reverse('update_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish1.id),
+            json={
+                'title': 'updated dish1',
+                'description': 'updated description dish1',
+                'price': '200'
+            }
+        )
+        response = client.get(
+            url=get_reverse('read_dishes', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        assert response.status_code == 200
+        dishes: dict = {item['id']: item for item in response.json()}
+        assert len(dishes) == 2
+        assert dishes[str(dish1.id)]['title'] == 'updated dish1'
+        assert dishes[str(dish1.id)]['price'] == '200.00'
+        assert dishes[str(dish2.id)]['title'] == dish2.title
+
+    def test_create_dish_write_through(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish],
+            write_through: None
+    ) -> None:
+        session, menu, submenu, *_ = prepare_test_data
+        client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        client.get(url=get_reverse('read_submenu', menu_id=menu.id, submenu_id=submenu.id))
+
+        response = client.post(
+            url=get_reverse('create_dish', menu_id=menu.id, submenu_id=submenu.id),
+            json={'title': 'dish3', 'description': 'description dish3', 'price': '300'}
+        )
+        assert response.status_code == 201
+
+        with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+            cached_menu, cached_submenu, cached_dish = (
+                cache_codec.loads(entry) if entry else None
+                for entry in redis_client.mget(
+                    [f'menu_{menu.id}', f'submenu_{submenu.id}', f'dish_{response.json()["id"]}']
+                )
+            )
+        assert cached_menu['dishes_count'] == 3
+        assert cached_submenu['dishes_count'] == 3
+        assert cached_dish['title'] == 'dish3'
+        assert cached_dish['price'] == '300.00'
+
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.json()['dishes_count'] == 3
+
+    def test_update_dish_write_through(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish],
+            write_through: None
+    ) -> None:
+        session, menu, submenu, dish, *_ = prepare_test_data
+        client.patch(
+            url=get_reverse('update_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id),
+            json={'title': 'updated dish1', 'description': 'updated description dish1', 'price': '200'}
+        )
+
+        # the write stored the entry, so the row changed behind the service is not read
+        session.query(Dish).filter(Dish.id == dish.id).update({'title': 'changed behind'})
+        session.commit()
+        response = client.get(
+            url=get_reverse('read_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        )
+        assert response.status_code == 200
+        assert response.json()['title'] == 'updated dish1'
+        assert response.json()['price'] == '200.00'
+
     def test_update_dish(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]) -> None:
         session, menu, submenu, dish, *_ = prepare_test_data
         dish_data: dict = {
@@ -258,3 +411,89 @@ class TestDish:
         )
         assert response.status_code == 200
         assert response.json() == []
+
+    def test_delete_submenu_after_dish_created(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish1, dish2 = prepare_test_data
+        for dish in (dish1, dish2):
+            client.get(url=get_reverse('read_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id))
+
+        response = client.post(
+            url=get_reverse('create_dish', menu_id=menu.id, submenu_id=submenu.id),
+            json={'title': 'dish3', 'description': 'description dish3', 'price': '300'}
+        )
+        assert response.status_code == 201
+
+        response = client.delete(url=get_reverse('delete_submenu', menu_id=menu.id, submenu_id=submenu.id))
+        assert response.status_code == 200
+
+        with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+            assert redis_client.exists(f'dish_{dish1.id}', f'dish_{dish2.id}') == 0
+        for dish in (dish1, dish2):
+            response = client.get(url=get_reverse('read_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id))
+            assert response.status_code == 404
+
+    def test_create_and_delete_dish_update_counts(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish1, dish2 = prepare_test_data
+        client.post(
+            url=get_reverse('create_dish', menu_id=menu.id, submenu_id=submenu.id),
+            json={
+                'title': 'dish3',
+                'description': 'description dish3',
+                'price': '300'
+            }
+        )
+        response = client.get(
+            url=get_reverse('read_submenu', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        assert response.json()['dishes_count'] == 3
+
+        client.delete(
+            url=get_reverse('delete_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish1.id)
+        )
+        response = client.get(
+            url=get_reverse('read_submenu', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        assert response.json()['dishes_count'] == 2
+        response = client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        assert response.json()['dishes_count'] == 2
+
+    def test_create_dishes_bulk(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Menu, Dish, Dish]
+    ) -> None:
+        session, menu, submenu, dish1, dish2 = prepare_test_data
+        response = client.post(
+            url=get_reverse('create_dishes', menu_id=menu.id, submenu_id=submenu.id),
+            json=[
+                {'title': 'dish3', 'description': 'description dish3', 'price': '300'},
+                {'title': dish1.title, 'description': 'description', 'price': '100'},
+                {'title': 'dish4', 'description': 'description dish4', 'price': '400'},
+                {'title': 'dish3', 'description': 'description', 'price': '300'},
+            ]
+        )
+        assert response.status_code == 201
+        assert [dish['title'] for dish in response.json()['created']] == ['dish3', 'dish4']
+        assert response.json()['conflicts'] == [
+            {'index': 1, 'title': dish1.title, 'detail': 'dish exists'},
+            {'index': 3, 'title': 'dish3', 'detail': 'dish exists'},
+        ]
+
+        response = client.get(
+            url=get_reverse('read_submenu', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        assert response.json()['dishes_count'] == 4
+        response = client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        assert response.json()['dishes_count'] == 4
@@ -0,0 +1,35 @@
+from typing import Callable
+
+import pytest
+import redis
+from config import REDIS_PORT, REDIS_SERVER
+from database.models import Menu
+from repositories.redis_repository.expiration import ExpirationPolicy
+from sqlalchemy.orm import Session
+from tests.conftest import EntityType, client, create_test_entity
+
+
+class TestExpiration:
+    @pytest.fixture
+    def expiration(self) -> ExpirationPolicy:
+        return ExpirationPolicy({'menu_tree': 60, 'menu_': 100, 'dish_': 0}, default_ttl=10, jitter=0.1)
+
+    def test_ttl_by_prefix(self, expiration: ExpirationPolicy) -> None:
+        assert 90 <= expiration.ttl('menu_1') <= 110
+        assert 54 <= expiration.ttl('menu_tree') <= 66
+        assert 9 <= expiration.ttl('submenu_1') <= 11
+
+    def test_zero_ttl_disables_expiry(self, expiration: ExpirationPolicy) -> None:
+        assert expiration.ttl('dish_1') is None
+
+    def test_cached_menu_expires(self, get_reverse: Callable, get_db: Session) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        redis_client: redis.Redis = redis.Redis(host=REDIS_SERVER, port=REDIS_PORT)
+        assert redis_client.ttl(f'menu_{menu.id}') > 0
@@ -0,0 +1,115 @@
+import pathlib
+import time
+from typing import Callable
+
+import pytest
+from database.models import Menu
+from dependencies import profiling
+from dependencies.profiling import sign_profile_token, verify_profile_token
+from tests.conftest import EntityType, client, create_test_entity
+
+
+class TestInternal:
+    def test_read_db_pool_stats(self, get_reverse: Callable) -> None:
+        response = client.get(url=get_reverse('read_db_pool_stats'))
+        assert response.status_code == 200
+
+        pool_stats: dict = response.json()['pool']
+        assert {'size', 'checked_out', 'idle', 'overflow', 'wait_time'} <= pool_stats.keys()
+        assert pool_stats['wait_time']['buckets']['+Inf'] == pool_stats['wait_time']['count']
+        assert response.json()['max_connections']['total'] >= pool_stats['size']
+
+    def test_read_redis_pool_stats(self, get_reverse: Callable) -> None:
+        response = client.get(url=get_reverse('read_redis_pool_stats'))
+        assert response.status_code == 200
+
+        pool_stats: dict = response.json()
+        assert pool_stats['created'] == pool_stats['in_use'] + pool_stats['idle']
+        assert pool_stats['created'] <= pool_stats['max_connections']
+
+    def test_warm_up_cache(self, get_reverse: Callable, monkeypatch: pytest.MonkeyPatch) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        monkeypatch.setattr(profiling, 'PROFILING_SECRET', 'secret')
+        response = client.post(url=get_reverse('warm_up_cache'))
+        assert response.status_code == 403
+
+        token: str = sign_profile_token(int(time.time()) + 60, 'secret')
+        response = client.post(url=get_reverse('warm_up_cache'), headers={'X-Profile-Token': token})
+        assert response.status_code == 202
+
+        deadline: float = time.monotonic() + 5
+        while (status := client.get(url=get_reverse('read_warm_up_status')).json())['state'] == 'running':
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert status['state'] == 'done'
+        assert status['menus'] == 1
+
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.status_code == 200
+        assert response.json()['title'] == 'menu1'
+
+    @pytest.fixture
+    def profiling_dir(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+        monkeypatch.setattr(profiling, 'PROFILING_DIR', str(tmp_path))
+        monkeypatch.setattr(profiling, 'PROFILING_SECRET', 'secret')
+        return tmp_path
+
+    @pytest.fixture
+    def profile_token(self, profiling_dir: pathlib.Path) -> dict[str, str]:
+        return {'X-Profile-Token': sign_profile_token(int(time.time()) + 60, 'secret')}
+
+    def test_profiling_requires_token(self, get_reverse: Callable, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(profiling, 'PROFILING_SECRET', None)
+        response = client.get(url=get_reverse('read_profiles'))
+        assert response.status_code == 404
+
+        monkeypatch.setattr(profiling, 'PROFILING_SECRET', 'secret')
+        for headers in ({}, {'X-Profile-Token': sign_profile_token(int(time.time()) + 60, 'other')}):
+            response = client.post(url=get_reverse('arm_profiling'), params={'requests': 1}, headers=headers)
+            assert response.status_code == 403
+        assert profiling.profiling_requests['remaining'] == 0
+
+    def test_profile_armed_request(
+            self,
+            get_reverse: Callable,
+            profiling_dir: pathlib.Path,
+            profile_token: dict[str, str]
+    ) -> None:
+        response = client.post(url=get_reverse('arm_profiling'), params={'requests': 1}, headers=profile_token)
+        assert response.status_code == 202
+
+        response = client.get(url=get_reverse('read_menus'))
+        profile_id: str = response.headers['X-Profile-Id']
+        assert 'X-Profile-Id' not in client.get(url=get_reverse('read_menus')).headers
+
+        profiles: list[dict] = client.get(url=get_reverse('read_profiles'), headers=profile_token).json()
+        assert [(profile['id'], profile['method'], profile['status']) for profile in profiles] == [
+            (profile_id, 'GET', 200)
+        ]
+        response = client.get(url=get_reverse('read_profile', profile_id=profile_id), headers=profile_token)
+        assert response.status_code == 200
+        assert 'function calls' in response.text
+        response = client.get(url=get_reverse('download_profile', profile_id=profile_id), headers=profile_token)
+        assert response.content == (profiling_dir / f'{profile_id}.prof').read_bytes()
+
+    def test_profile_signed_request(self, get_reverse: Callable, profiling_dir: pathlib.Path) -> None:
+        token: str = sign_profile_token(int(time.time()) + 60, 'secret')
+        response = client.get(url=get_reverse('read_menus'), headers={'X-Profile-Token': token})
+        assert 'X-Profile-Id' in response.headers
+
+        for forged in (sign_profile_token(int(time.time()) + 60, 'other'), token.replace('.', '0.', 1)):
+            response = client.get(url=get_reverse('read_menus'), headers={'X-Profile-Token': forged})
+            assert 'X-Profile-Id' not in response.headers
+
+    def test_expired_profile_token(self) -> None:
+        assert verify_profile_token(sign_profile_token(int(time.time()) + 60, 'secret'), 'secret')
+        assert not verify_profile_token(sign_profile_token(int(time.time()) - 1, 'secret'), 'secret')
+        assert not verify_profile_token('invalid', 'secret')
+
+    def test_read_missing_profile(self, get_reverse: Callable, profile_token: dict[str, str]) -> None:
+        response = client.get(url=get_reverse('read_profile', profile_id='0' * 32), headers=profile_token)
+        assert response.status_code == 404
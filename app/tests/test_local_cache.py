@@ -0,0 +1,77 @@
+import time
+from typing import Callable
+
+import redis
+from config import REDIS_PORT, REDIS_SERVER
+from database.models import Menu
+from repositories.redis_repository.local_cache import InvalidationSubscriber, LocalCache
+from repositories.redis_repository.redis_cache_repository import RedisCacheRepository
+from sqlalchemy.orm import Session
+from tests.conftest import EntityType, client, create_test_entity
+
+
+class TestLocalCache:
+    def test_evict_least_recently_used(self) -> None:
+        local: LocalCache = LocalCache(max_size=2, ttl=60)
+        local.set('menu_1', {'title': 'menu1'})
+        local.set('menu_2', {'title': 'menu2'})
+        local.get('menu_1')
+        local.set('menu_3', {'title': 'menu3'})
+
+        assert local.get('menu_1') == {'title': 'menu1'}
+        assert local.get('menu_2') is None
+        assert local.get('menu_3') == {'title': 'menu3'}
+
+    def test_expired_entry_is_miss(self) -> None:
+        local: LocalCache = LocalCache(max_size=2, ttl=0.01)
+        local.set('menu_1', {'title': 'menu1'})
+        time.sleep(0.02)
+
+        assert local.get('menu_1') is None
+        assert local.statistics.report()['local'] == {'hits': 0, 'misses': 1, 'hit_ratio': 0.0}
+
+    def test_skip_value_read_before_invalidation(self) -> None:
+        local: LocalCache = LocalCache(max_size=2, ttl=60)
+        generation: int = local.generation
+        local.invalidate('menu_1')
+        local.set('menu_1', {'title': 'menu1'}, generation)
+
+        assert local.get('menu_1') is None
+
+    def test_invalidate_from_other_worker(self) -> None:
+        local: LocalCache = LocalCache(max_size=2, ttl=60)
+        subscriber: InvalidationSubscriber = InvalidationSubscriber(
+            redis.Redis(host=REDIS_SERVER, port=REDIS_PORT),
+            local
+        )
+        subscriber.start()
+        try:
+            local.set('menu_1', {'title': 'menu1'})
+            other_worker: RedisCacheRepository = RedisCacheRepository(
+                redis.Redis(host=REDIS_SERVER, port=REDIS_PORT),
+                local=LocalCache(max_size=2, ttl=60)
+            )
+            other_worker.delete('menu_1')
+
+            deadline: float = time.monotonic() + 5
+            while local.get('menu_1') is not None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert local.get('menu_1') is None
+        finally:
+            subscriber.stop()
+
+    def test_read_menu_from_local_tier(self, get_reverse: Callable, get_db: Session) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        for _ in range(2):
+            client.get(
+                url=get_reverse('read_menu', menu_id=menu.id)
+            )
+
+        response = client.get(url=get_reverse('read_cache_stats'))
+        assert response.status_code == 200
+        assert response.json()['tiers']['local']['hits'] >= 1
+        assert {'hits', 'misses', 'hit_ratio'} <= response.json()['tiers']['redis'].keys()
@@ -1,7 +1,9 @@
 from typing import Callable, Generator
 
 import pytest
-from database.models import Menu
+import redis
+from config import REDIS_PORT, REDIS_SERVER
+from database.models import Dish, Menu, Submenu
 from sqlalchemy.orm import Session
 from tests.conftest import EntityType, client, create_test_entity
 
@@ -97,6 +99,193 @@ class TestMenu:
         assert response.json()[0]['title'] == 'menu1'
         assert response.json()[0]['description'] == 'description menu1'
 
+    def test_read_menus_cached_until_write(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu]
+    ) -> None:
+        response = client.get(url=get_reverse('read_menus'))
+        assert len(response.json()) == 1
+
+        # a row written behind the services is not seen until the list generation changes
+        create_test_entity(
+            EntityType.MENU,
+            title='menu2',
+            description='description menu2'
+        )
+        response = client.get(url=get_reverse('read_menus'))
+        assert len(response.json()) == 1
+
+        client.post(
+            url=get_reverse('create_menu'),
+            json={'title': 'menu3', 'description': 'description menu3'}
+        )
+        response = client.get(url=get_reverse('read_menus'))
+        assert {menu['title'] for menu in response.json()} == {'menu1', 'menu2', 'menu3'}
+
+    def test_read_menus_with_counts(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu]) -> None:
+        session, menu = prepare_test_data
+        create_test_entity(
+            EntityType.MENU,
+            title='menu2',
+            description='description menu2'
+        )
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        for _ in range(2):
+            response = client.get(
+                url=get_reverse('read_menus')
+            )
+            assert response.status_code == 200
+            menus: dict = {item['title']: item for item in response.json()}
+            assert len(menus) == 2
+            assert menus['menu1']['submenus_count'] == 1
+            assert menus['menu1']['dishes_count'] == 1
+            assert menus['menu2']['submenus_count'] == 0
+            assert menus['menu2']['dishes_count'] == 0
+
+    def test_read_menus_paginated(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu]) -> None:
+        session, menu = prepare_test_data
+        for title in ('menu2', 'menu3'):
+            create_test_entity(
+                EntityType.MENU,
+                title=title,
+                description=f'description {title}'
+            )
+        response = client.get(
+            url=get_reverse('read_menus'),
+            params={'limit': 2}
+        )
+        assert response.status_code == 200
+        assert [item['title'] for item in response.json()] == ['menu1', 'menu2']
+        assert 'X-Next-Cursor' in response.headers
+
+        response = client.get(
+            url=get_reverse('read_menus'),
+            params={'limit': 2, 'cursor': response.headers['X-Next-Cursor']}
+        )
+        assert response.status_code == 200
+        assert [item['title'] for item in response.json()] == ['menu3']
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_read_menus_with_invalid_cursor(self, get_reverse: Callable) -> None:
+        response = client.get(
+            url=get_reverse('read_menus'),
+            params={'cursor': 'invalid'}
+        )
+        assert response.status_code == 422
+        assert response.json()['detail'] == 'invalid cursor'
+
+    def test_read_menu_tree(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu]) -> None:
+        session, menu = prepare_test_data
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        dish: Dish = create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100',
+            submenu_id=submenu.id
+        )
+        response = client.get(
+            url=get_reverse('read_menu_tree')
+        )
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert response.json()[0]['id'] == str(menu.id)
+        assert response.json()[0]['submenus_count'] == 1
+        assert response.json()[0]['dishes_count'] == 1
+        assert response.json()[0]['submenus'][0]['id'] == str(submenu.id)
+        assert response.json()[0]['submenus'][0]['dishes_count'] == 1
+        assert response.json()[0]['submenus'][0]['dishes'][0]['id'] == str(dish.id)
+        assert response.json()[0]['submenus'][0]['dishes'][0]['price'] == '100.00'
+
+    def test_read_menu_tree_after_dish_update(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu]
+    ) -> None:
+        session, menu = prepare_test_data
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        dish: Dish = create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100',
+            submenu_id=submenu.id
+        )
+        client.get(
+            url=get_reverse('read_menu_tree')
+        )
+        client.patch(
+            url=get_reverse('update_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id),
+            json={
+                'title': 'updated dish1',
+                'description': 'updated description dish1',
+                'price': '200'
+            }
+        )
+        response = client.get(
+            url=get_reverse('read_menu_tree')
+        )
+        assert response.status_code == 200
+        assert response.json()[0]['submenus'][0]['dishes'][0]['title'] == 'updated dish1'
+        assert response.json()[0]['submenus'][0]['dishes'][0]['price'] == '200.00'
+
+    def test_read_menu_not_modified(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu]) -> None:
+        session, menu = prepare_test_data
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-cache'
+        etag: str = response.headers['ETag']
+
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id), headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.content == b''
+
+        client.patch(
+            url=get_reverse('update_menu', menu_id=menu.id),
+            json={'title': 'updated menu1', 'description': 'updated description menu1'}
+        )
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id), headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.json()['title'] == 'updated menu1'
+
+    def test_read_menus_etag_after_cache_flush(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu]
+    ) -> None:
+        etag: str = client.get(url=get_reverse('read_menus')).headers['ETag']
+        # restarted generation counters must not repeat the versions handed out before
+        redis.Redis(host=REDIS_SERVER, port=REDIS_PORT).flushdb()
+
+        response = client.get(url=get_reverse('read_menus'), headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
     def test_update_menu(self, get_reverse: Callable, get_db: Session, prepare_test_data: tuple[Session, Menu]) -> None:
         session, menu = prepare_test_data
         menu_data: dict = {
@@ -141,3 +330,62 @@ class TestMenu:
 
         db_menu: Menu | None = session.query(Menu).filter(Menu.id == menu.id).first()
         assert db_menu is None
+
+    def test_delete_menu_with_submenus(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu]) -> None:
+        session, menu = prepare_test_data
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        response = client.delete(
+            url=get_reverse('delete_menu', menu_id=menu.id)
+        )
+        assert response.status_code == 200
+        assert response.json()['id'] == str(menu.id)
+
+        assert session.query(Submenu).filter(Submenu.menu_id == menu.id).first() is None
+        assert session.query(Dish).filter(Dish.submenu_id == submenu.id).first() is None
+
+    def test_delete_menu_invalidates_cached_children(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu]
+    ) -> None:
+        session, menu = prepare_test_data
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu1',
+            description='description submenu1',
+            menu_id=menu.id
+        )
+        dish: Dish = create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        client.get(url=get_reverse('read_submenu', menu_id=menu.id, submenu_id=submenu.id))
+        client.get(url=get_reverse('read_dish', menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id))
+        redis_client: redis.Redis = redis.Redis(host=REDIS_SERVER, port=REDIS_PORT)
+        assert redis_client.exists(f'submenu_{submenu.id}', f'dish_{dish.id}') == 2
+
+        response = client.delete(
+            url=get_reverse('delete_menu', menu_id=menu.id)
+        )
+        assert response.status_code == 200
+        assert redis_client.exists(
+            f'submenu_{submenu.id}',
+            f'dish_{dish.id}',
+            f'tag:menu_{menu.id}',
+            f'tag:submenu_{submenu.id}'
+        ) == 0
@@ -0,0 +1,104 @@
+import logging
+import uuid
+from typing import Callable
+
+import pytest
+from database import query_metrics, slow_queries
+from database.models import Menu
+from database.query_metrics import QueryStatistics
+from database.slow_queries import redact
+from prometheus_client.parser import text_string_to_metric_families
+from tests.conftest import EntityType, client, create_test_entity
+
+
+def read_samples() -> dict[tuple[str, frozenset], float]:
+    response = client.get(url='/metrics')
+    assert response.status_code == 200
+    return {
+        (sample.name, frozenset(sample.labels.items())): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+class TestMetrics:
+    def test_read_metrics(self, get_reverse: Callable) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        before: dict[tuple[str, frozenset], float] = read_samples()
+        client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        after: dict[tuple[str, frozenset], float] = read_samples()
+
+        def increase(name: str, **labels: str) -> float:
+            key: tuple[str, frozenset] = (name, frozenset(labels.items()))
+            return after.get(key, 0) - before.get(key, 0)
+
+        assert increase('http_request_duration_seconds_count', route='read_menu', method='GET', status='200') == 2
+        # the rebuild looks the key up again after taking the lock
+        assert increase('cache_lookups_total', tier='redis', prefix='menu_', result='miss') == 2
+        assert increase('cache_lookups_total', tier='local', prefix='menu_', result='hit') == 1
+        assert increase('cache_bytes_total', prefix='menu_', direction='write') > 0
+        assert sum(
+            value - before.get((name, labels), 0)
+            for (name, labels), value in after.items()
+            if name == 'db_repository_call_duration_seconds_count' and ('method', 'get_by_id') in labels
+        ) == 1
+        assert sum(
+            value - before.get((name, labels), 0)
+            for (name, labels), value in after.items()
+            if name == 'db_query_duration_seconds_count' and ('method', 'get_by_id') in labels
+        ) == 1
+
+    def test_query_statistics_headers(self, get_reverse: Callable) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.headers['X-DB-Queries'] == '1'
+        assert float(response.headers['X-DB-Time']) > 0
+
+        response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.headers['X-DB-Queries'] == '0'
+        assert response.headers['X-DB-Time'] == '0.000'
+
+    def test_repeated_statements(self) -> None:
+        statistics: QueryStatistics = QueryStatistics(capture=True)
+        for statement in ('SELECT menus', 'SELECT dishes', 'SELECT dishes', 'SELECT dishes', 'SELECT menus', 'UPDATE'):
+            statistics.record(statement, 0.001)
+        assert statistics.queries == 6
+        assert statistics.repeated() == [('SELECT dishes', 3), ('SELECT menus', 2)]
+        assert QueryStatistics().repeated() == []
+
+    def test_slow_query_log(
+            self,
+            get_reverse: Callable,
+            caplog: pytest.LogCaptureFixture,
+            monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        menu: Menu = create_test_entity(
+            EntityType.MENU,
+            title='menu1',
+            description='description menu1'
+        )
+        monkeypatch.setattr(query_metrics, 'DB_SLOW_QUERY_THRESHOLD', 1e-9)
+        monkeypatch.setattr(slow_queries, 'DB_SLOW_QUERY_EXPLAIN_RATE', 1.0)
+        with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+            response = client.get(url=get_reverse('read_menu', menu_id=menu.id))
+        assert response.status_code == 200
+
+        messages: list[str] = [record.getMessage() for record in caplog.records]
+        assert any('MenuORMRepository.get_by_id (GET read_menu)' in message for message in messages)
+        assert any('Execution Time' in message for message in messages)
+
+    def test_redacted_parameters(self) -> None:
+        menu_id: uuid.UUID = uuid.uuid4()
+        assert redact({'id': menu_id, 'title': 'menu1', 'limit': 10, 'price': None}) == {
+            'id': menu_id, 'title': '<str of 5>', 'limit': 10, 'price': None
+        }
+        assert redact((menu_id, b'data', object())) == [menu_id, '<bytes of 4>', '<object>']
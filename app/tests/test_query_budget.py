@@ -0,0 +1,114 @@
+from typing import Callable, NamedTuple
+
+import pytest
+import redis
+from config import REDIS_PORT, REDIS_SERVER
+from database.models import Dish, Menu, Submenu
+from repositories.redis_repository.local_cache import local_cache
+from tests.conftest import (
+    EntityType,
+    RoundTripCounter,
+    client,
+    create_test_entity,
+    reverse,
+)
+
+
+class Budget(NamedTuple):
+    queries: int
+    redis_round_trips: int
+    redis_commands: int
+
+
+# (method, JSON body) of every route under test
+REQUESTS: dict[str, tuple[str, object | None]] = {
+    'read_menus': ('GET', None),
+    'read_menu': ('GET', None),
+    'read_menu_tree': ('GET', None),
+    'create_menu': ('POST', {'title': 'menu2', 'description': 'description menu2'}),
+    'update_menu': ('PATCH', {'title': 'menu1 updated', 'description': 'description menu1 updated'}),
+    'delete_menu': ('DELETE', None),
+    'read_submenus': ('GET', None),
+    'read_submenu': ('GET', None),
+    'create_submenu': ('POST', {'title': 'submenu2', 'description': 'description submenu2'}),
+    'create_submenus': ('POST', [{'title': 'submenu2', 'description': 'description submenu2'}]),
+    'update_submenu': ('PATCH', {'title': 'submenu1 updated', 'description': 'description submenu1 updated'}),
+    'delete_submenu': ('DELETE', None),
+    'read_dishes': ('GET', None),
+    'read_dish': ('GET', None),
+    'create_dish': ('POST', {'title': 'dish2', 'description': 'description dish2', 'price': '12.50'}),
+    'create_dishes': ('POST', [{'title': 'dish2', 'description': 'description dish2', 'price': '12.50'}]),
+    'update_dish': ('PATCH', {'title': 'dish1 updated', 'description': 'description dish1 updated', 'price': '14.50'}),
+    'delete_dish': ('DELETE', None),
+}
+# routes requested to fill the cache before a request in the warm state
+READ_ROUTES: tuple[str, ...] = (
+    'read_menus', 'read_menu', 'read_menu_tree', 'read_submenus', 'read_submenu', 'read_dishes', 'read_dish'
+)
+
+# the most a route may cost with an empty cache and after all read routes were requested
+BUDGETS: dict[str, dict[str, Budget]] = {
+    'read_menus': {'cold': Budget(1, 8, 8), 'warm': Budget(0, 1, 1)},
+    'read_menu': {'cold': Budget(1, 8, 8), 'warm': Budget(0, 1, 1)},
+    'read_menu_tree': {'cold': Budget(1, 5, 5), 'warm': Budget(0, 1, 1)},
+    'create_menu': {'cold': Budget(3, 1, 4), 'warm': Budget(3, 1, 4)},
+    'update_menu': {'cold': Budget(3, 1, 4), 'warm': Budget(3, 1, 4)},
+    'delete_menu': {'cold': Budget(2, 2, 11), 'warm': Budget(2, 2, 13)},
+    'read_submenus': {'cold': Budget(1, 8, 8), 'warm': Budget(0, 1, 1)},
+    'read_submenu': {'cold': Budget(1, 8, 10), 'warm': Budget(0, 1, 1)},
+    'create_submenu': {'cold': Budget(5, 1, 5), 'warm': Budget(5, 1, 5)},
+    'create_submenus': {'cold': Budget(3, 1, 5), 'warm': Budget(3, 1, 5)},
+    'update_submenu': {'cold': Budget(3, 1, 4), 'warm': Budget(3, 1, 4)},
+    'delete_submenu': {'cold': Budget(4, 2, 13), 'warm': Budget(4, 2, 14)},
+    'read_dishes': {'cold': Budget(2, 14, 20), 'warm': Budget(0, 1, 1)},
+    'read_dish': {'cold': Budget(1, 5, 9), 'warm': Budget(0, 1, 1)},
+    'create_dish': {'cold': Budget(6, 1, 6), 'warm': Budget(6, 1, 6)},
+    'create_dishes': {'cold': Budget(4, 1, 6), 'warm': Budget(4, 1, 6)},
+    'update_dish': {'cold': Budget(3, 1, 4), 'warm': Budget(3, 1, 4)},
+    'delete_dish': {'cold': Budget(4, 1, 6), 'warm': Budget(4, 1, 6)},
+}
+
+
+class TestQueryBudget:
+    @pytest.fixture
+    def path_params(self) -> dict[str, object]:
+        menu: Menu = create_test_entity(EntityType.MENU, title='menu1', description='description menu1')
+        submenu: Submenu = create_test_entity(
+            EntityType.SUBMENU, title='submenu1', description='description submenu1', menu_id=menu.id
+        )
+        dish: Dish = create_test_entity(
+            EntityType.DISH, title='dish1', description='description dish1', price='13.50', submenu_id=submenu.id
+        )
+        return {'menu_id': menu.id, 'submenu_id': submenu.id, 'dish_id': dish.id}
+
+    @pytest.mark.parametrize('state', ['cold', 'warm'])
+    @pytest.mark.parametrize('route_name', REQUESTS)
+    def test_query_budget(
+            self,
+            route_name: str,
+            state: str,
+            path_params: dict[str, object],
+            count_round_trips: Callable
+    ) -> None:
+        if state == 'warm':
+            for read_route in READ_ROUTES:
+                assert client.get(url=reverse(read_route, **path_params)).status_code == 200
+        else:
+            with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+                redis_client.flushdb()
+            local_cache.clear()
+
+        method, body = REQUESTS[route_name]
+        with count_round_trips() as counter:
+            response = client.request(method, url=reverse(route_name, **path_params), json=body)
+        assert response.status_code < 300
+
+        assert_within_budget(route_name, state, counter)
+
+
+def assert_within_budget(route_name: str, state: str, counter: RoundTripCounter) -> None:
+    budget: Budget = BUDGETS[route_name][state]
+    spent: Budget = Budget(counter.queries, counter.redis_round_trips, counter.redis_commands)
+    assert all(value <= limit for value, limit in zip(spent, budget)), (
+        f'{route_name} ({state} cache) spent {spent}, over its budget of {budget}'
+    )
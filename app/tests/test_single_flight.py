@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+from typing import Callable
+
+from config import REDIS_PORT, REDIS_SERVER
+from redis import asyncio as aioredis
+from repositories.redis_repository.async_redis_cache_repository import (
+    AsyncRedisCacheRepository,
+)
+from repositories.redis_repository.local_cache import LocalCache
+from repositories.redis_repository.single_flight import load_once, stampede_counters
+from tests.conftest import client
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_load_once(self) -> None:
+        loads: list[int] = []
+
+        async def load() -> dict:
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return {'title': 'menu1'}
+
+        async def read_concurrently() -> list[object | None]:
+            # few connections shared by all readers, as in the bounded pool of a worker
+            redis_client: aioredis.Redis = aioredis.Redis(
+                connection_pool=aioredis.BlockingConnectionPool(host=REDIS_SERVER, port=REDIS_PORT, max_connections=4)
+            )
+            cache_repository: AsyncRedisCacheRepository = AsyncRedisCacheRepository(
+                redis_client,
+                local=LocalCache(max_size=0)
+            )
+            try:
+                return await asyncio.gather(
+                    *[load_once(cache_repository, f'menu_{key}', load) for _ in range(10)]
+                )
+            finally:
+                await redis_client.aclose()
+
+        key: uuid.UUID = uuid.uuid4()
+        rebuilds: int = stampede_counters['rebuilds']
+        values: list[object | None] = asyncio.run(read_concurrently())
+
+        assert values == [{'title': 'menu1'}] * 10
+        assert len(loads) == 1
+        assert stampede_counters['rebuilds'] - rebuilds == 1
+
+    def test_read_stampede_counters(self, get_reverse: Callable) -> None:
+        response = client.get(url=get_reverse('read_cache_stats'))
+        assert response.status_code == 200
+        assert {'rebuilds', 'waits', 'served_after_wait', 'wait_timeouts'} <= response.json()['stampede'].keys()
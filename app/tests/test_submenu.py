@@ -1,6 +1,8 @@
 from typing import Callable, Generator
 
 import pytest
+import redis
+from config import REDIS_PORT, REDIS_SERVER
 from database.models import Menu, Submenu
 from sqlalchemy.orm import Session
 from tests.conftest import EntityType, client, create_test_entity
@@ -121,6 +123,52 @@ class TestSubmenu:
         assert response.status_code == 200
         assert len(response.json()) == 1
 
+    def test_read_submenus_with_counts(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu]
+    ) -> None:
+        session, menu, submenu = prepare_test_data
+        create_test_entity(
+            EntityType.SUBMENU,
+            title='submenu2',
+            description='description submenu2',
+            menu_id=menu.id
+        )
+        for title in ('dish1', 'dish2'):
+            create_test_entity(
+                EntityType.DISH,
+                title=title,
+                description=f'description {title}',
+                price='100.00',
+                submenu_id=submenu.id
+            )
+        for _ in range(2):
+            response = client.get(
+                url=get_reverse('read_submenus', menu_id=menu.id)
+            )
+            assert response.status_code == 200
+            submenus: dict = {item['title']: item for item in response.json()}
+            assert len(submenus) == 2
+            assert submenus['submenu1']['dishes_count'] == 2
+            assert submenus['submenu2']['dishes_count'] == 0
+
+    def test_read_submenus_after_dish_created(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu]
+    ) -> None:
+        session, menu, submenu = prepare_test_data
+        response = client.get(url=get_reverse('read_submenus', menu_id=menu.id))
+        assert response.json()[0]['dishes_count'] == 0
+
+        client.post(
+            url=get_reverse('create_dish', menu_id=menu.id, submenu_id=submenu.id),
+            json={'title': 'dish1', 'description': 'description dish1', 'price': '100.00'}
+        )
+        response = client.get(url=get_reverse('read_submenus', menu_id=menu.id))
+        assert response.json()[0]['dishes_count'] == 1
+
     def test_update_submenu(self, get_reverse: Callable, prepare_test_data: tuple[Session, Menu, Submenu]) -> None:
         session, menu, submenu = prepare_test_data
         submenu_data: dict = {
@@ -186,3 +234,70 @@ class TestSubmenu:
 
         db_submenu: Submenu | None = session.query(Submenu).filter(Submenu.id == submenu.id).first()
         assert db_submenu is None
+
+    def test_delete_submenu_keeps_parent_generations(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu]
+    ) -> None:
+        session, menu, submenu = prepare_test_data
+        response = client.delete(
+            url=get_reverse('delete_submenu', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        assert response.status_code == 200
+
+        with redis.Redis(host=REDIS_SERVER, port=REDIS_PORT) as redis_client:
+            assert redis_client.ttl(f'gen:menu_{menu.id}') == -1
+            assert redis_client.ttl('gen:menu_tree') == -1
+            assert redis_client.ttl(f'gen:submenu_{submenu.id}') > 0
+
+    def test_delete_submenu_updates_menu_counts(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu]
+    ) -> None:
+        session, menu, submenu = prepare_test_data
+        create_test_entity(
+            EntityType.DISH,
+            title='dish1',
+            description='description dish1',
+            price='100.00',
+            submenu_id=submenu.id
+        )
+        response = client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        assert response.json()['submenus_count'] == 1
+        assert response.json()['dishes_count'] == 1
+
+        client.delete(
+            url=get_reverse('delete_submenu', menu_id=menu.id, submenu_id=submenu.id)
+        )
+        response = client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        assert response.status_code == 200
+        assert response.json()['submenus_count'] == 0
+        assert response.json()['dishes_count'] == 0
+
+    def test_create_submenus_bulk(
+            self,
+            get_reverse: Callable,
+            prepare_test_data: tuple[Session, Menu, Submenu]
+    ) -> None:
+        session, menu, submenu = prepare_test_data
+        response = client.post(
+            url=get_reverse('create_submenus', menu_id=menu.id),
+            json=[
+                {'title': 'submenu2', 'description': 'description submenu2'},
+                {'title': submenu.title, 'description': 'description'},
+            ]
+        )
+        assert response.status_code == 201
+        assert [submenu['title'] for submenu in response.json()['created']] == ['submenu2']
+        assert response.json()['conflicts'] == [{'index': 1, 'title': submenu.title, 'detail': 'submenu exists'}]
+
+        response = client.get(
+            url=get_reverse('read_menu', menu_id=menu.id)
+        )
+        assert response.json()['submenus_count'] == 2
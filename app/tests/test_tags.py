@@ -0,0 +1,38 @@
+import uuid
+
+import redis
+from config import REDIS_PORT, REDIS_SERVER
+from repositories.redis_repository.expiration import ExpirationPolicy
+from repositories.redis_repository.local_cache import LocalCache
+from repositories.redis_repository.redis_cache_repository import RedisCacheRepository
+
+
+class TestTags:
+    def test_invalidate_tagged_keys(self) -> None:
+        redis_client: redis.Redis = redis.Redis(host=REDIS_SERVER, port=REDIS_PORT)
+        cache_repository: RedisCacheRepository = RedisCacheRepository(redis_client, local=LocalCache(max_size=0))
+        menu_id: uuid.UUID = uuid.uuid4()
+        dish_keys: list[str] = [f'dish_{uuid.uuid4()}' for _ in range(1000)]
+        cache_repository.set_many({key: {'title': key} for key in dish_keys}, tags=(f'menu_{menu_id}',))
+        assert redis_client.scard(f'tag:menu_{menu_id}') == 1000
+
+        cache_repository.invalidate([f'menu_{menu_id}'], tags=(f'menu_{menu_id}',))
+        assert redis_client.exists(*dish_keys, f'tag:menu_{menu_id}') == 0
+
+    def test_tags_outlive_members(self) -> None:
+        expiration: ExpirationPolicy = ExpirationPolicy({'dish_': 100}, default_ttl=200, jitter=0.1)
+        assert expiration.max_ttl == 220
+
+        redis_client: redis.Redis = redis.Redis(host=REDIS_SERVER, port=REDIS_PORT)
+        cache_repository: RedisCacheRepository = RedisCacheRepository(
+            redis_client,
+            expiration=expiration,
+            local=LocalCache(max_size=0)
+        )
+        submenu_id: uuid.UUID = uuid.uuid4()
+        cache_repository.set(f'dish_{uuid.uuid4()}', {'title': 'dish1'}, tags=(f'submenu_{submenu_id}',))
+        assert 200 < redis_client.ttl(f'tag:submenu_{submenu_id}') <= 220
+
+    def test_sliding_tags_never_expire(self) -> None:
+        expiration: ExpirationPolicy = ExpirationPolicy({'dish_': 100}, jitter=0.1, sliding=True)
+        assert expiration.max_ttl is None